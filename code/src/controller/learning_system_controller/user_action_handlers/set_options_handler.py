@@ -16,6 +16,12 @@ class SetOptionsHandler(BaseUserActionHandler):
         AgentOptions.value_iteration_optimised: (
             ExplorationStrategyOptions.not_applicable
         ),
+        AgentOptions.policy_iteration: (
+            ExplorationStrategyOptions.not_applicable
+        ),
+        AgentOptions.prioritized_sweeping: (
+            ExplorationStrategyOptions.not_applicable
+        ),
     }
 
     def handle_action(self, user_action: UserActionMessage) -> HandleResult:
@@ -1,21 +1,41 @@
 import sys
 
-from PySide6.QtWidgets import QApplication
-
-from .controller.hyper_parameter_controller.controller import (
-    HyperParameterController,
-)
-from .controller.learning_system_controller.controller import (
-    LearningSystemController,
-)
-from .view.view_root_v2 import ReinforcementLearningApp
-
 
 def main():
     """Start the application.
 
-    The main entry point into the application.
+    The main entry point into the application. The GUI is imported here
+    rather than with this module, so importing the model never loads it.
     """
+    from PySide6.QtWidgets import QApplication  # noqa: WPS433
+
+    from .controller.hyper_parameter_controller.controller import (  # noqa: WPS433, E501
+        HyperParameterController,
+    )
+    from .controller.learning_system_controller.controller import (  # noqa: WPS433, E501
+        LearningSystemController,
+    )
+    from .model.agents.value_iteration.agent import (  # noqa: WPS433
+        ValueIterationAgent,
+    )
+    from .model.agents.value_iteration.distribution_cache import (  # noqa: WPS433, E501
+        DistributionCache,
+    )
+    from .model.hyperparameters.random_search.random_search import (  # noqa: WPS433, E501
+        RandomSearch,
+    )
+    from .model.hyperparameters.report_generation.report_generator import (  # noqa: WPS433, E501
+        HyperParameterReportGenerator,
+    )
+    from .model.hyperparameters.result_store import (  # noqa: WPS433
+        ResultStore,
+    )
+    from .view.view_root_v2 import ReinforcementLearningApp  # noqa: WPS433
+
+    ValueIterationAgent.distribution_cache = DistributionCache()
+    result_store = ResultStore()
+    RandomSearch.result_store = result_store
+    HyperParameterReportGenerator.result_store = result_store
     with LearningSystemController() as main_controller:
         with HyperParameterController() as report_controller:
             qt = QApplication(sys.argv)
@@ -1,3 +1,7 @@
+from typing import Any
+
+import numpy as np
+
 from src.model.hyperparameters.base_parameter_strategy import (
     BaseHyperParameterStrategy,
 )
@@ -5,6 +9,11 @@ from src.model.transition_information import TransitionInformation
 
 from ..dynamics.actions import Action
 
+action_values_type = np.ndarray[Any, np.dtype[np.float64]]
+# many states or the action in each, actions are given by their value
+state_batch_type = np.ndarray[Any, np.dtype[np.int64]]
+action_batch_type = np.ndarray[Any, np.dtype[np.int64]]
+
 
 class BaseAgent(object):
     """Provides the common base for different learning agents."""
@@ -90,6 +99,77 @@ class BaseAgent(object):
         self.__throw_not_implemented()
         return 0
 
+    def get_action_values(self, state: int) -> action_values_type:
+        """Get the agents interpretation of every actions value in a state.
+
+        Agents that store their values in arrays should override this to avoid
+        evaluating each action separately.
+
+        Args:
+            state (int): the state to perform the actions in
+
+        Returns:
+            action_values_type: the value of each action, indexed by the
+            action's value.
+        """
+        return np.array(
+            [self.get_state_action_value(state, action) for action in Action],
+            dtype=np.float64,
+        )
+
+    def evaluate_policy_batch(
+        self, states: state_batch_type
+    ) -> action_batch_type:
+        """Decide on the action this agent would take in each state.
+
+        Agents should override this to decide on every action at once.
+
+        Args:
+            states (state_batch_type): the states the agent is acting in.
+
+        Returns:
+            action_batch_type: the value of the action to take in each state.
+        """
+        return np.array(
+            [self.evaluate_policy(int(state)).value for state in states],
+            dtype=np.int64,
+        )
+
+    def get_state_values(self, states: state_batch_type) -> action_values_type:
+        """Get the agents interpretation of the value of each state.
+
+        Agents should override this to evaluate every state at once.
+
+        Args:
+            states (state_batch_type): the states to evaluate.
+
+        Returns:
+            action_values_type: the value of each state.
+        """
+        return np.array(
+            [self.get_state_value(int(state)) for state in states],
+            dtype=np.float64,
+        )
+
+    def get_state_action_values(
+        self, states: state_batch_type
+    ) -> action_values_type:
+        """Get the agents interpretation of every actions value in each state.
+
+        Agents should override this to evaluate every state at once.
+
+        Args:
+            states (state_batch_type): the states to perform the actions in.
+
+        Returns:
+            action_values_type: a row of action values for each state, indexed
+            by the action's value.
+        """
+        action_values = np.empty((len(states), len(Action)), dtype=np.float64)
+        for row, state in enumerate(states):
+            action_values[row] = self.get_action_values(int(state))
+        return action_values
+
     def __throw_not_implemented(self):
         raise NotImplementedError(
             "This method must be overridden by concrete agent"
@@ -1,6 +1,3 @@
-from collections import defaultdict
-from typing import Dict, List
-
 from src.model.agents.q_learning.exploration_strategies.mf_bpi import (
     MFBPIStrategy,
 )
@@ -11,7 +8,12 @@ from src.model.hyperparameters.base_parameter_strategy import (
 from src.model.transition_information import TransitionInformation
 
 from ...dynamics.actions import Action
-from ..base_agent import BaseAgent
+from ..base_agent import (
+    BaseAgent,
+    action_batch_type,
+    action_values_type,
+    state_batch_type,
+)
 from .exploration_strategies.base_strategy import BaseExplorationStrategy
 from .exploration_strategies.epsilon_greedy_strategy import (
     EpsilonGreedyStrategy,
@@ -20,6 +22,8 @@ from .exploration_strategies.options import ExplorationStrategyOptions
 from .exploration_strategies.upper_confidence_bound import (
     UpperConfidenceBoundStrategy,
 )
+from .replay_buffer import ReplayBuffer
+from .state_action_table import StateActionTable
 
 
 class QLearningAgent(BaseAgent):
@@ -45,7 +49,7 @@ class QLearningAgent(BaseAgent):
         """
         super().__init__(hyper_parameters, max_state_count)
 
-        self.max_queue_length = hyper_parameters.get_integer_value(
+        max_queue_length = hyper_parameters.get_integer_value(
             HyperParameter.replay_queue_length
         )
         self.learning_rate = hyper_parameters.get_value(
@@ -57,8 +61,8 @@ class QLearningAgent(BaseAgent):
         initial_optimism = hyper_parameters.get_value(
             HyperParameter.initial_optimism
         )
-        self.queue: List[TransitionInformation] = []
-        self.table: Dict[int, float] = defaultdict(lambda: initial_optimism)
+        self.replay_buffer = ReplayBuffer(max_queue_length)
+        self.table = StateActionTable(max_state_count, initial_optimism)
         self.strategy = self.set_exploration_strategy(strategy)
 
     def set_exploration_strategy(
@@ -98,7 +102,18 @@ class QLearningAgent(BaseAgent):
         Returns:
             float: the expected value for this state and action
         """
-        return self.table[state * self.action_count + action.value]
+        return float(self.table.row(state)[action])
+
+    def get_action_values(self, state: int) -> action_values_type:
+        """Get the agents interpretation of every actions value in a state.
+
+        Args:
+            state (int): the state to perform the actions in
+
+        Returns:
+            action_values_type: a view of this state's row in the value table.
+        """
+        return self.table.row(state)
 
     def get_state_value(self, state: int) -> float:
         """Get the agents interpretation of the value of this state.
@@ -109,12 +124,7 @@ class QLearningAgent(BaseAgent):
         Returns:
             float: the agents interpretation of the value of this state
         """
-        table = self.table
-        action_count = self.action_count
-        state_index = state * action_count
-        return max(
-            table[state_index + offset] for offset in range(action_count)
-        )
+        return float(self.table.row(state).max())
 
     def evaluate_policy(self, state: int) -> Action:
         """Decide on the action this agent would take in a given state.
@@ -127,6 +137,43 @@ class QLearningAgent(BaseAgent):
         """
         return self.strategy.select_action(state)
 
+    def get_state_action_values(
+        self, states: state_batch_type
+    ) -> action_values_type:
+        """Get the agents interpretation of every actions value in each state.
+
+        Args:
+            states (state_batch_type): the states to perform the actions in.
+
+        Returns:
+            action_values_type: a copy of each state's row in the value table.
+        """
+        return self.table.rows(states)
+
+    def get_state_values(self, states: state_batch_type) -> action_values_type:
+        """Get the agents interpretation of the value of each state.
+
+        Args:
+            states (state_batch_type): the states to evaluate.
+
+        Returns:
+            action_values_type: the value of each state.
+        """
+        return self.table.rows(states).max(1)
+
+    def evaluate_policy_batch(
+        self, states: state_batch_type
+    ) -> action_batch_type:
+        """Decide on the action this agent would take in each state.
+
+        Args:
+            states (state_batch_type): the states the agent is acting in.
+
+        Returns:
+            action_batch_type: the value of the action to take in each state.
+        """
+        return self.strategy.select_actions(states)
+
     def record_transition(self, transition: TransitionInformation) -> None:
         """Provide the agent with the information from a transition.
 
@@ -136,29 +183,8 @@ class QLearningAgent(BaseAgent):
         """
         self.strategy.record_transition(transition)
 
-        table = self.table
-        learning_rate = self.learning_rate
-        queue = self.queue
-        table = self.table
-        discount_rate = self.discount_rate
-        action_count = self.action_count
-
-        queue.insert(0, transition)
-        if len(queue) > self.max_queue_length:
-            queue.pop()
-
-        for obs in queue:
-            new_state_index = obs.new_state * action_count
-            new_state_value = max(
-                table[new_state_index + index] for index in range(action_count)
-            )
-
-            observed_value = obs.reward + discount_rate * new_state_value
-            index = (
-                obs.previous_state * action_count + obs.previous_action.value
-            )
-
-            existing_value = table[index]
-            table[index] = existing_value + learning_rate * (
-                observed_value - existing_value
-            )
+        table = self.table.ensure_capacity(
+            max(transition.previous_state, transition.new_state)
+        )
+        self.replay_buffer.push(transition)
+        self.replay_buffer.replay(table, self.learning_rate, self.discount_rate)
@@ -1,4 +1,10 @@
-from src.model.agents.base_agent import BaseAgent
+import numpy as np
+
+from src.model.agents.base_agent import (
+    BaseAgent,
+    action_batch_type,
+    state_batch_type,
+)
 from src.model.dynamics.actions import Action
 from src.model.transition_information import TransitionInformation
 
@@ -30,6 +36,24 @@ class BaseExplorationStrategy(object):
         self.__throw_not_implemented()
         return Action.up
 
+    def select_actions(self, states: state_batch_type) -> action_batch_type:
+        """Select the action in many states based upon this strategy.
+
+        Strategies should override this to select every action at once.
+
+        Args:
+            states (state_batch_type): the states where the actions will be
+                performed.
+
+        Returns:
+            action_batch_type: the value of the action to perform in each
+            state.
+        """
+        return np.array(
+            [self.select_action(int(state)).value for state in states],
+            dtype=np.int64,
+        )
+
     def record_transition(self, transition: TransitionInformation) -> None:
         """Provide the strategy with the information from a transition.
 
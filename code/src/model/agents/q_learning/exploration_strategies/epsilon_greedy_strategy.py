@@ -3,7 +3,11 @@ from typing import Any
 
 import numpy as np
 
-from src.model.agents.base_agent import BaseAgent
+from src.model.agents.base_agent import (
+    BaseAgent,
+    action_batch_type,
+    state_batch_type,
+)
 from src.model.agents.q_learning.exploration_strategies.base_strategy import (
     BaseExplorationStrategy,
 )
@@ -52,12 +56,23 @@ class EpsilonGreedyStrategy(BaseExplorationStrategy):
         if random() < self.exploration_ratio:
             return choice(list(Action))
 
-        state_action_value = self.agent.get_state_action_value
+        return Action(int(self.agent.get_action_values(state).argmax()))
+
+    def select_actions(self, states: state_batch_type) -> action_batch_type:
+        """Select the action in many states with the epsilon greedy strategy.
 
-        def key(action: Action) -> float:
-            return state_action_value(state, action)
+        Args:
+            states (state_batch_type): the states to select the actions for.
 
-        return max(Action, key=key)
+        Returns:
+            action_batch_type: the value of the action to select in each state.
+        """
+        actions = self.agent.get_state_action_values(states).argmax(1)
+        explore = np.random.random(len(actions)) < self.exploration_ratio
+        actions[explore] = np.random.randint(
+            len(Action), size=int(explore.sum())
+        )
+        return actions
 
     def record_transition(self, *args: Any) -> None:
         """Record that a transition has taken place.
@@ -2,7 +2,11 @@ from typing import Any, Tuple
 
 import numpy as np
 
-from src.model.agents.base_agent import BaseAgent
+from src.model.agents.base_agent import (
+    BaseAgent,
+    action_batch_type,
+    state_batch_type,
+)
 from src.model.agents.q_learning.exploration_strategies.base_strategy import (
     BaseExplorationStrategy,
 )
@@ -61,14 +65,12 @@ class MFBPIStrategy(BaseExplorationStrategy):
 
         self._state_visits = np.zeros(self.state_count)
 
-        # Initialize a visits matrix for each ensemble member
+        # Initialize the visit counts for each ensemble member, only the
+        # total visits of each state action are used so the next state is
+        # not counted
         self._ensemble_state_action_visits = np.zeros(
-            (
-                self.ensemble_size,
-                self.state_count,
-                self.action_count,
-                self.state_count,
-            )
+            (self.ensemble_size, self.state_count, self.action_count),
+            dtype=np.int64,
         )
         # Initialize policy matrix
         self._policy = np.ones(shape=(self.state_count, self.action_count)) / (
@@ -83,6 +85,11 @@ class MFBPIStrategy(BaseExplorationStrategy):
         self._q_table = tables[0]
         self._m_table = tables[1]
 
+        # the ensemble's values of each state action in order, only the
+        # updated state action is sorted again so quantiles need no sorting
+        self._sorted_q_table = np.sort(self._q_table, axis=0)
+        self._sorted_m_table = np.sort(self._m_table, axis=0)
+
     def q_m_initial_value(self) -> Tuple[Q_table_type, Q_table_type]:
         """Get the initial values for the Q and M table.
 
@@ -153,6 +160,31 @@ class MFBPIStrategy(BaseExplorationStrategy):
         action_value = np.random.choice(self.action_count, p=omega)
         return Action(action_value)
 
+    def select_actions(self, states: state_batch_type) -> action_batch_type:
+        """Select the action for this agent to explore in many states.
+
+        Args:
+            states (state_batch_type): the states the agents actions will act
+                upon.
+
+        Returns:
+            action_batch_type: the value of the action chosen in each state.
+        """
+        forced_exploration_probability = np.maximum(
+            self.float_min,
+            (1 / np.maximum(1, self._state_visits[states]))
+            ** self.exploration_parameter,
+        )[:, np.newaxis]
+        omega = (1 - forced_exploration_probability) * self._policy[
+            states
+        ] + forced_exploration_probability / self.action_count
+
+        # sample each row by where a uniform value falls in its distribution
+        cumulative = omega.cumsum(1)
+        sample = np.random.random((len(states), 1)) * cumulative[:, -1:]
+        actions = (cumulative <= sample).sum(1)
+        return np.minimum(actions, self.action_count - 1)
+
     def record_transition(self, experience: TransitionInformation) -> None:
         """Update the exploration strategy's policy with the information.
 
@@ -180,14 +212,10 @@ class MFBPIStrategy(BaseExplorationStrategy):
         )
 
         # Update visit counts
-        self._ensemble_state_action_visits[
-            indexes, state, action, new_state
-        ] += 1
-        current_visit_count = (
-            self._ensemble_state_action_visits[  # noqa: WPS204
-                indexes, state, action
-            ].sum(-1)
-        )
+        self._ensemble_state_action_visits[indexes, state, action] += 1
+        current_visit_count = self._ensemble_state_action_visits[
+            indexes, state, action
+        ]
         # visit count horizon exploration vs exploration
         visit_count_horizon = 1 / (1 - self.discount_factor)
         # learning rate for Q-values
@@ -221,6 +249,13 @@ class MFBPIStrategy(BaseExplorationStrategy):
             delta**self.error_sensitivity
         )
 
+        self._sorted_q_table[:, state, action] = np.sort(
+            self._q_table[:, state, action]
+        )
+        self._sorted_m_table[:, state, action] = np.sort(
+            self._m_table[:, state, action]
+        )
+
         # Update the ensemble head
         self._head = np.random.choice(self.ensemble_size)
 
@@ -232,6 +267,12 @@ class MFBPIStrategy(BaseExplorationStrategy):
 
         which are used to weight different actions in the policy based on their
         estimated value and uncertainty.
+
+        unlike the tables this can not be updated for the recorded state alone.
+        a new quantile is sampled at each step, which changes the values of
+        every state, and the weights of the optimal actions depend on the
+        smallest gap, the largest uncertainty and the total weight of all
+        states. so each step reads the whole table once.
         """
         if self.ensemble_size == 1:
             # If there's only one ensemble member, use its Q and M values
@@ -241,22 +282,20 @@ class MFBPIStrategy(BaseExplorationStrategy):
             # If there are multiple ensemble members, sample a random value from
             # the uniform distribution
             table_quantile = np.random.uniform()
-            q_values = np.quantile(self._q_table, table_quantile, axis=0)
-            m_values = np.quantile(self._m_table, table_quantile, axis=0)
+            q_values = self.__ensemble_quantile(
+                self._sorted_q_table, table_quantile
+            )
+            m_values = self.__ensemble_quantile(
+                self._sorted_m_table, table_quantile
+            )
 
         # Compute the greedy policy
         greedy_policy = q_values.argmax(1)
 
         # Identify the suboptimal actions
-        subopt_action_indexes = np.array(
-            [
-                [
-                    greedy_policy[state] != action
-                    for action in range(self.action_count)
-                ]
-                for state in range(self.state_count)
-            ]
-        ).astype(np.bool_)
+        subopt_action_indexes = (
+            np.arange(self.action_count) != greedy_policy[:, np.newaxis]
+        )
 
         # Compute Delta
         delta = np.clip(
@@ -298,3 +337,26 @@ class MFBPIStrategy(BaseExplorationStrategy):
         # Compute omega and update policy
         omega = h_sa / h_sa.sum()
         self._policy = omega / omega.sum(-1, keepdims=True)
+
+    def __ensemble_quantile(
+        self, sorted_table: Q_table_type, table_quantile: float
+    ) -> Q_table_type:
+        """Find a quantile of the ensemble's values of every state action.
+
+        matches `np.quantile` with linear interpolation, but reads the two
+        nearest values from the sorted table rather than sorting.
+
+        Args:
+            sorted_table (Q_table_type): the ensemble's values of each state
+                action in order.
+            table_quantile (float): the quantile to find, between 0 and 1.
+
+        Returns:
+            Q_table_type: the quantile of each state action.
+        """
+        position = table_quantile * (self.ensemble_size - 1)
+        lower = int(position)
+        upper = min(lower + 1, self.ensemble_size - 1)
+        fraction = position - lower
+        lower_values = sorted_table[lower]
+        return lower_values + fraction * (sorted_table[upper] - lower_values)
@@ -1,12 +1,16 @@
-from collections import defaultdict
-from math import log, sqrt
+from math import log
 
 import numpy as np
 
-from src.model.agents.base_agent import BaseAgent
+from src.model.agents.base_agent import (
+    BaseAgent,
+    action_batch_type,
+    state_batch_type,
+)
 from src.model.agents.q_learning.exploration_strategies.base_strategy import (
     BaseExplorationStrategy,
 )
+from src.model.agents.q_learning.state_action_table import StateActionTable
 from src.model.dynamics.actions import Action
 from src.model.hyperparameters.base_parameter_strategy import HyperParameter
 from src.model.transition_information import TransitionInformation
@@ -33,8 +37,8 @@ class UpperConfidenceBoundStrategy(BaseExplorationStrategy):
         """
         super().__init__(agent)
 
-        self.state_action_count: defaultdict[int, int] = defaultdict(
-            lambda: self.initial_action_count
+        self.state_action_count = StateActionTable(
+            agent.max_state_count, self.initial_action_count
         )
         self.time_steps = 1
         self.exploration_bias = self.agent.hyper_parameters.get_value(
@@ -53,22 +57,26 @@ class UpperConfidenceBoundStrategy(BaseExplorationStrategy):
         Returns:
             Action: the action the agent should select.
         """
-        get_state_action_value = self.agent.get_state_action_value
-        exploration_bias = self.exploration_bias
-        state_action_count = self.state_action_count
-        epsilon = self.epsilon
-        log_time = log(self.time_steps)
-        state_index = state * self.number_of_actions
-
-        def ucb(action: Action) -> float:
-            q_value = get_state_action_value(state, action)
-            action_count = (
-                state_action_count[state_index + action.value] + epsilon
-            )
-            confidence_bound = sqrt(log_time / action_count)
-            return q_value + confidence_bound * exploration_bias
-
-        return max(Action, key=ucb)
+        q_values = self.agent.get_action_values(state)
+        action_count = self.state_action_count.row(state) + self.epsilon
+        confidence_bound = np.sqrt(log(self.time_steps) / action_count)
+        ucb = q_values + confidence_bound * self.exploration_bias
+        return Action(int(ucb.argmax()))
+
+    def select_actions(self, states: state_batch_type) -> action_batch_type:
+        """Select the action in many states with the upper confidence bound.
+
+        Args:
+            states (state_batch_type): the states to select the actions for.
+
+        Returns:
+            action_batch_type: the value of the action to select in each state.
+        """
+        q_values = self.agent.get_state_action_values(states)
+        action_count = self.state_action_count.rows(states) + self.epsilon
+        confidence_bound = np.sqrt(log(self.time_steps) / action_count)
+        ucb = q_values + confidence_bound * self.exploration_bias
+        return ucb.argmax(1)
 
     def record_transition(self, transition: TransitionInformation) -> None:
         """Use transition information to update internal statics.
@@ -78,10 +86,7 @@ class UpperConfidenceBoundStrategy(BaseExplorationStrategy):
                 information.
 
         """
-        key = (
-            transition.previous_state * self.number_of_actions
-            + transition.previous_action.value
-        )
-        count = self.state_action_count
-        count[key] = count[key] + 1
+        self.state_action_count.row(transition.previous_state)[
+            transition.previous_action
+        ] += 1
         self.time_steps += 1
@@ -0,0 +1,126 @@
+import numpy as np
+
+from src.model.agents.q_learning.state_action_table import state_action_array
+from src.model.agents.value_iteration.dynamics_distribution import (
+    numpy_float,
+    numpy_int,
+)
+from src.model.lazy_jit import lazy_jit
+from src.model.transition_information import TransitionInformation
+
+
+class ReplayBuffer(object):
+    """Fixed capacity ring of the most recent transitions.
+
+    Each field of the transitions is stored in its own array so the whole
+    buffer can be replayed by a compiled kernel.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Initialise an empty replay buffer.
+
+        Args:
+            capacity (int): the maximum number of transitions to retain.
+        """
+        self.capacity = capacity
+        self.previous_states: numpy_int = np.zeros(capacity, dtype=np.int64)
+        self.previous_actions: numpy_int = np.zeros(capacity, dtype=np.int64)
+        self.new_states: numpy_int = np.zeros(capacity, dtype=np.int64)
+        self.rewards: numpy_float = np.zeros(capacity, dtype=np.float64)
+        # the index the next transition will be written to
+        self.head = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        """Get the number of transitions in the buffer.
+
+        Returns:
+            int: the number of stored transitions.
+        """
+        return self.size
+
+    def push(self, transition: TransitionInformation) -> None:
+        """Add a transition, evicting the oldest one if the buffer is full.
+
+        Args:
+            transition (TransitionInformation): the transition to store.
+        """
+        capacity = self.capacity
+        if capacity == 0:
+            return
+        head = self.head
+        self.previous_states[head] = transition.previous_state
+        self.previous_actions[head] = transition.previous_action
+        self.new_states[head] = transition.new_state
+        self.rewards[head] = transition.reward
+        self.head = (head + 1) % capacity
+        self.size = min(self.size + 1, capacity)
+
+    def replay(
+        self,
+        table: state_action_array,
+        learning_rate: float,
+        discount_rate: float,
+    ) -> None:
+        """Apply the Q-learning update for every stored transition.
+
+        Transitions are replayed from newest to oldest, each update sees the
+        effect of the ones before it.
+
+        Args:
+            table (state_action_array): the value table to update in place.
+            learning_rate (float): the amount to move towards each observation.
+            discount_rate (float): the rate to discount future rewards.
+        """
+        if self.size == 0:
+            return
+        replay_transitions(
+            table,
+            self.previous_states,
+            self.previous_actions,
+            self.new_states,
+            self.rewards,
+            self.head,
+            self.size,
+            learning_rate,
+            discount_rate,
+        )
+
+
+@lazy_jit(nopython=True, cache=True)
+def replay_transitions(  # noqa: WPS211
+    table: state_action_array,
+    previous_states: numpy_int,
+    previous_actions: numpy_int,
+    new_states: numpy_int,
+    rewards: numpy_float,
+    head: int,
+    size: int,
+    learning_rate: float,
+    discount_rate: float,
+) -> None:
+    """Replay the transitions of a ring buffer newest first.
+
+    Args:
+        table (state_action_array): the value table to update in place.
+        previous_states (numpy_int): the state each transition started in.
+        previous_actions (numpy_int): the action taken in each transition.
+        new_states (numpy_int): the state each transition ended in.
+        rewards (numpy_float): the reward received in each transition.
+        head (int): the index after the newest transition.
+        size (int): the number of valid transitions in the buffer.
+        learning_rate (float): the amount to move towards each observation.
+        discount_rate (float): the rate to discount future rewards.
+    """
+    capacity = previous_states.shape[0]
+    for offset in range(1, size + 1):
+        index = (head - offset) % capacity
+        observed_value = (
+            rewards[index] + discount_rate * table[new_states[index]].max()
+        )
+        state = previous_states[index]
+        action = previous_actions[index]
+        existing_value = table[state, action]
+        table[state, action] = existing_value + learning_rate * (
+            observed_value - existing_value
+        )
@@ -0,0 +1,107 @@
+from typing import Any, Sequence
+
+import numpy as np
+
+from src.model.dynamics.actions import Action
+
+state_action_array = np.ndarray[Any, np.dtype[np.float64]]
+
+
+class StateActionTable(object):
+    """Dense table storing a value for every state and action.
+
+    The table is backed by a two dimensional numpy array indexed by state then
+    action. Dynamics that do not provide a useful upper bound on the number of
+    states (`sys.maxsize`) start with a small table that grows geometrically
+    as new states are encountered.
+    """
+
+    action_count = len(Action)
+    initial_capacity = 1024
+    growth_factor = 2
+
+    def __init__(self, max_state_count: int, initial_value: float) -> None:
+        """Initialise the table.
+
+        Args:
+            max_state_count (int): the upper bound on the number of states, the
+                table never grows beyond this size.
+            initial_value (float): the value of every entry before it is
+                updated.
+        """
+        self.max_state_count = max_state_count
+        self.initial_value = initial_value
+        capacity = min(max_state_count, self.initial_capacity)
+        self.values: state_action_array = np.full(
+            (capacity, self.action_count), initial_value, dtype=np.float64
+        )
+
+    @property
+    def capacity(self) -> int:
+        """Get the number of states the table can currently hold.
+
+        Returns:
+            int: the number of allocated state rows.
+        """
+        return self.values.shape[0]
+
+    def ensure_capacity(self, state: int) -> state_action_array:
+        """Make sure the given state has an allocated row in the table.
+
+        Args:
+            state (int): the largest state that must be stored.
+
+        Raises:
+            IndexError: if the state exceeds the maximum number of states.
+
+        Returns:
+            state_action_array: the backing array, this may be a new array if
+            the table had to grow.
+        """
+        values = self.values
+        capacity = values.shape[0]
+        if state < capacity:
+            return values
+
+        if state >= self.max_state_count:
+            raise IndexError(
+                f"state {state} exceeds the maximum of {self.max_state_count}"
+            )
+
+        new_capacity = capacity
+        while new_capacity <= state:
+            new_capacity *= self.growth_factor
+        new_capacity = min(new_capacity, self.max_state_count)
+
+        grown = np.full(
+            (new_capacity, self.action_count),
+            self.initial_value,
+            dtype=np.float64,
+        )
+        grown[:capacity] = values
+        self.values = grown
+        return grown
+
+    def row(self, state: int) -> state_action_array:
+        """Get the action values of a state.
+
+        Args:
+            state (int): the state to access.
+
+        Returns:
+            state_action_array: a view of the row for this state, writes to the
+            view update the table.
+        """
+        return self.ensure_capacity(state)[state]
+
+    def rows(self, states: Sequence[int]) -> state_action_array:
+        """Get the action values of many states.
+
+        Args:
+            states (Sequence[int]): the states to access.
+
+        Returns:
+            state_action_array: a copy of the row of each state.
+        """
+        states = np.asarray(states, dtype=np.int64)
+        return self.ensure_capacity(int(states.max(initial=0)))[states]
@@ -10,7 +10,13 @@ from src.model.hyperparameters.base_parameter_strategy import (
 
 from ...dynamics.actions import Action
 from ...dynamics.base_dynamics import BaseDynamics
-from ..base_agent import BaseAgent
+from ..base_agent import (
+    BaseAgent,
+    action_batch_type,
+    action_values_type,
+    state_batch_type,
+)
+from .distribution_cache import DistributionCache
 from .dynamics_distribution import DynamicsDistribution, distribution_result
 from .types import value_table_type
 
@@ -21,6 +27,10 @@ class ValueIterationAgent(BaseAgent):
     This agent uses that table with the dynamics to pick optimal actions.
     """
 
+    # shares compiled distributions and value tables between processes, none
+    # to always compute them. entry points opt in so tests stay off the disk
+    distribution_cache: Optional[DistributionCache] = None
+
     def __init__(
         self,
         hyper_parameters: BaseHyperParameterStrategy,
@@ -46,6 +56,7 @@ class ValueIterationAgent(BaseAgent):
             HyperParameter.sample_count
         )
         self.value_table: Optional[value_table_type] = None
+        self.action_value_table: Optional[action_values_type] = None
 
         self.dynamics_distribution = DynamicsDistribution(
             sample_count, dynamics
@@ -64,12 +75,63 @@ class ValueIterationAgent(BaseAgent):
         if self.value_table is not None:
             return self.value_table
 
+        cache = self.distribution_cache
+        if cache is None:
+            if not self.dynamics_distribution.has_compiled():
+                self.dynamics_distribution.compile()
+            self.value_table = self.compute_value_table()
+            return self.value_table
+
         if not self.dynamics_distribution.has_compiled():
-            self.dynamics_distribution.compile()
+            cache.compile_distribution(self.dynamics_distribution)
+        self.value_table = cache.get_value_table(
+            self.dynamics_distribution,
+            self.solver_key(),
+            self.compute_value_table,
+        )
+        return self.value_table
 
-        self.value_table = self.compute_value_table()
+    def get_action_value_table(self) -> action_values_type:
+        """Get the expected value of every state and action.
 
-        return self.value_table
+        computed once from the value table, with a row for each state indexed
+        by the action's value.
+
+        Returns:
+            action_values_type: the action value table for this mdp
+        """
+        if self.action_value_table is not None:
+            return self.action_value_table
+
+        value_table = self.get_value_table()
+        (
+            row_pointers,
+            next_state,
+            frequency,
+            expected_reward,
+        ) = self.dynamics_distribution.get_sparse_representation()
+        row_count = len(expected_reward)
+        transition_rows = np.repeat(np.arange(row_count), np.diff(row_pointers))
+        subsequent_values = np.bincount(
+            transition_rows,
+            weights=frequency * value_table[next_state],
+            minlength=row_count,
+        )
+        self.action_value_table = (
+            expected_reward + self.discount_rate * subsequent_values
+        ).reshape(-1, len(Action))
+        return self.action_value_table
+
+    def solver_key(self) -> str:
+        """Describe the solver and every parameter that affects its result.
+
+        Returns:
+            str: the description used to cache the value table.
+        """
+        return (
+            f"{type(self).__name__} discount {self.discount_rate!r} "
+            + f"epsilon {self.stopping_epsilon!r}"
+        )
 
     def compute_value_table(self) -> value_table_type:
         """Compute the optimal value table with value iteration.
@@ -78,7 +140,8 @@ class ValueIterationAgent(BaseAgent):
             value_table_type: the value table for the dynamics
         """
         state_list = self.dynamics_distribution.list_states()
-        value_table = np.random.rand(len(state_list))
+        # state ids can skip unreachable states, so size by the largest id
+        value_table = np.random.rand(state_list.max() + 1)
         stopping_epsilon = self.stopping_epsilon
         maximum_epsilon: float = 1
         while maximum_epsilon > stopping_epsilon:
@@ -143,7 +206,7 @@ class ValueIterationAgent(BaseAgent):
         return expected_value
 
     def get_state_action_value(self, state: int, action: Action) -> float:
-        """Compute the expected action-value of a given state.
+        """Get the expected action-value of a given state.
 
         Args:
             state (int): the state the action is performed in
@@ -152,11 +215,18 @@ class ValueIterationAgent(BaseAgent):
         Returns:
             float: the expected value for this state and action
         """
-        value_table = self.get_value_table()
-        return self.distribution_value(
-            self.dynamics_distribution.observations[state][action.value],
-            value_table,
-        )
+        return float(self.get_action_value_table()[state, action.value])
+
+    def get_action_values(self, state: int) -> action_values_type:
+        """Get the expected value of every action in a state.
+
+        Args:
+            state (int): the state to perform the actions in
+
+        Returns:
+            action_values_type: this state's row of the action value table.
+        """
+        return self.get_action_value_table()[state]
 
     def get_state_value(self, state: int) -> float:
         """Get the agents interpretation of the value of this state.
@@ -172,7 +242,7 @@ class ValueIterationAgent(BaseAgent):
     def evaluate_policy(self, state: int) -> Action:
         """Decide on the action this agent would take in a given state.
 
-        picks the best action based upon the value table.
+        picks the best action based upon the action value table.
 
         Args:
             state (int): the state the agent is performing this action
@@ -181,18 +251,52 @@ class ValueIterationAgent(BaseAgent):
         Returns:
             Action: the action to take in this state
         """
-        best_action = random.choice(list(Action))
-        best_value = self.get_state_action_value(state, best_action)
-        # random default action to help break ties evenly
-        for action in Action:
-            if action is best_action:
-                continue
-            action_value = self.get_state_action_value(state, action)
-            if action_value > best_value:
-                best_value = action_value
-                best_action = action
-
-        return best_action
+        action_values = self.get_action_value_table()[state]
+        best_actions = np.flatnonzero(action_values == action_values.max())
+        # pick between the best actions at random to break ties evenly
+        return Action(int(random.choice(best_actions)))
+
+    def get_state_action_values(
+        self, states: state_batch_type
+    ) -> action_values_type:
+        """Get the expected value of every action in each state.
+
+        Args:
+            states (state_batch_type): the states to perform the actions in.
+
+        Returns:
+            action_values_type: a row of action values for each state.
+        """
+        return self.get_action_value_table()[states]
+
+    def get_state_values(self, states: state_batch_type) -> action_values_type:
+        """Get the agents interpretation of the value of each state.
+
+        Args:
+            states (state_batch_type): the states to evaluate.
+
+        Returns:
+            action_values_type: the value of each state.
+        """
+        return self.get_value_table()[states]
+
+    def evaluate_policy_batch(
+        self, states: state_batch_type
+    ) -> action_batch_type:
+        """Decide on the action this agent would take in each state.
+
+        picks the best action in each state, breaking ties at random.
+
+        Args:
+            states (state_batch_type): the states the agent is acting in.
+
+        Returns:
+            action_batch_type: the value of the action to take in each state.
+        """
+        action_values = self.get_state_action_values(states)
+        best = action_values == action_values.max(1, keepdims=True)
+        # random scores between the best actions pick one of them evenly
+        return (best * np.random.random(best.shape)).argmax(1)
 
     def record_transition(self, *args: Any) -> None:
         """Provide the agent with the information from a transition.
@@ -1,11 +1,16 @@
-import math
-
 import numpy as np
-from numba import jit
 
 from src.model.agents.value_iteration.agent import ValueIterationAgent
+from src.model.dynamics.actions import Action
+from src.model.dynamics.base_dynamics import BaseDynamics
+from src.model.hyperparameters.base_parameter_strategy import (
+    BaseHyperParameterStrategy,
+    HyperParameter,
+)
+from src.model.lazy_jit import lazy_jit
 
 from .dynamics_distribution import numpy_float, numpy_int
+from .sweep_options import ConvergenceCheck, SweepMode
 from .types import value_table_type
 
 
@@ -15,112 +20,213 @@ class ValueIterationAgentOptimised(ValueIterationAgent):
     This agent uses that table with the dynamics to pick optimal actions.
     """
 
+    action_count = len(Action)
+
+    def __init__(
+        self,
+        hyper_parameters: BaseHyperParameterStrategy,
+        dynamics: BaseDynamics,
+    ) -> None:
+        """Initialise the agent.
+
+        Args:
+            hyper_parameters (BaseHyperParameterStrategy): the hyper parameters
+                the agent should use.
+            dynamics (BaseDynamics): the dynamics function used to build the
+                value table and pick optimal actions
+        """
+        super().__init__(hyper_parameters, dynamics)
+        self.sweep_mode = SweepMode(
+            hyper_parameters.get_integer_value(HyperParameter.sweep_mode)
+        )
+        self.convergence_check = ConvergenceCheck(
+            hyper_parameters.get_integer_value(HyperParameter.convergence_check)
+        )
+        self.max_sweeps = hyper_parameters.get_integer_value(
+            HyperParameter.max_sweeps
+        )
+
+    def solver_key(self) -> str:
+        """Describe the solver and every parameter that affects its result.
+
+        Returns:
+            str: the description used to cache the value table.
+        """
+        return (
+            f"{super().solver_key()} {self.sweep_mode.name} "
+            + f"{self.convergence_check.name} sweeps {self.max_sweeps}"
+        )
+
     def compute_value_table(self) -> value_table_type:
         """Compute the optimal value table with value iteration.
 
-        Uses numba to improve performance
+        The transitions are a sparse matrix over state and action rows. Jacobi
+        sweeps are a sparse matrix vector product followed by a maximum over
+        each state's actions. Gauss-Seidel sweeps use numba to update states in
+        place.
 
         Returns:
             value_table_type: the value table for the dynamics
         """
         (
-            lookup_table,
+            row_pointers,
             next_state,
-            expected_reward,
             frequency,
-        ) = self.dynamics_distribution.get_array_representation()
-        return compute_value_table(
-            self.discount_rate,
-            self.stopping_epsilon,
-            lookup_table,
-            next_state,
             expected_reward,
-            frequency,
-        )
+        ) = self.dynamics_distribution.get_sparse_representation()
+        row_count = len(expected_reward)
+        value_table = np.random.rand(row_count // self.action_count)
+        use_span = self.convergence_check is ConvergenceCheck.span
+
+        if self.sweep_mode is SweepMode.gauss_seidel:
+            return gauss_seidel_value_table(
+                value_table,
+                self.discount_rate,
+                self.stopping_epsilon,
+                use_span,
+                self.max_sweeps,
+                row_pointers,
+                next_state,
+                frequency,
+                expected_reward,
+            )
+
+        transition_rows = np.repeat(np.arange(row_count), np.diff(row_pointers))
+        for _ in range(self.max_sweeps):
+            subsequent_values = np.bincount(
+                transition_rows,
+                weights=frequency * value_table[next_state],
+                minlength=row_count,
+            )
+            action_values = expected_reward + (
+                self.discount_rate * subsequent_values
+            )
+            new_values = action_values.reshape(-1, self.action_count).max(1)
+            change = new_values - value_table
+            value_table = new_values
+            if has_converged(
+                change.max(), change.min(), self.stopping_epsilon, use_span
+            ):
+                break
+        return value_table
+
+
+@lazy_jit(nopython=True, cache=True)
+def has_converged(
+    largest_change: float,
+    smallest_change: float,
+    stopping_epsilon: float,
+    use_span: bool,
+) -> bool:
+    """Check weather a sweep's changes are small enough to stop.
 
+    Args:
+        largest_change (float): the largest change in a state's value.
+        smallest_change (float): the smallest change in a state's value.
+        stopping_epsilon (float): The error amount that is acceptable.
+        use_span (bool): compare the span of the changes rather than the
+            largest absolute change.
+
+    Returns:
+        bool: true when value iteration can stop.
+    """
+    if use_span:
+        return largest_change - smallest_change <= stopping_epsilon
+    return max(largest_change, -smallest_change) <= stopping_epsilon
 
-@jit(nopython=True, cache=True, fastmath=True)
-def compute_value_table(  # noqa: WPS211
+
+@lazy_jit(nopython=True, cache=True, fastmath=True)
+def gauss_seidel_value_table(  # noqa: WPS211
+    value_table: value_table_type,
     discount_rate: float,
     stopping_epsilon: float,
-    lookup_table: numpy_int,
+    use_span: bool,
+    max_sweeps: int,
+    row_pointers: numpy_int,
     next_state: numpy_int,
-    expected_reward: numpy_float,
     frequency: numpy_float,
+    expected_reward: numpy_float,
 ) -> value_table_type:
-    """Compute the optimal value table with value iteration.
+    """Compute the optimal value table updating states in place.
 
     Args:
+        value_table (value_table_type): the initial values, updated in place.
         discount_rate (float): The rate to discount future rewards
         stopping_epsilon (float): The error amount that is acceptable.
-        lookup_table (numpy_int): maps state and actions to observed transitions
-        next_state (numpy_int): the following state after some state and action
-        expected_reward (numpy_float): the average reward after completing some
-            action.
-        frequency (numpy_float): The relative frequency of this transition
+        use_span (bool): compare the span of the changes rather than the
+            largest absolute change.
+        max_sweeps (int): the most sweeps to perform.
+        row_pointers (numpy_int): the start of each state and action's
+            transitions.
+        next_state (numpy_int): the following state of each transition.
+        frequency (numpy_float): The relative frequency of each transition
             compared to others under the same initial state and action.
+        expected_reward (numpy_float): the expected reward of each state and
+            action.
 
     Returns:
         value_table_type: the value table for the dynamics
     """
-    number_of_states = lookup_table.shape[0]
-    value_table = np.random.rand(number_of_states)
-    maximum_epsilon: float = 1
-    while maximum_epsilon > stopping_epsilon:
-        maximum_epsilon = 0
+    number_of_states = value_table.shape[0]
+    action_count = (row_pointers.shape[0] - 1) // number_of_states
+    for _ in range(max_sweeps):
+        largest_change = -np.inf
+        smallest_change = np.inf
         for state in range(number_of_states):
-            new_value = compute_updated_value(
-                value_table,
-                state,
-                discount_rate,
-                lookup_table,
-                next_state,
-                expected_reward,
-                frequency,
-            )
-            epsilon = abs(value_table[state] - new_value)
+            new_value = -np.inf
+            for row in range(state * action_count, (state + 1) * action_count):
+                new_value = max(
+                    new_value,
+                    row_value(
+                        row,
+                        value_table,
+                        discount_rate,
+                        row_pointers,
+                        next_state,
+                        frequency,
+                        expected_reward,
+                    ),
+                )
+            change = new_value - value_table[state]
             value_table[state] = new_value
-            maximum_epsilon = max(epsilon, maximum_epsilon)
+            largest_change = max(largest_change, change)
+            smallest_change = min(smallest_change, change)
+        if has_converged(
+            largest_change, smallest_change, stopping_epsilon, use_span
+        ):
+            break
     return value_table
 
 
-@jit(nopython=True, cache=True, fastmath=True)
-def compute_updated_value(  # noqa: WPS211
+@lazy_jit(nopython=True, cache=True, fastmath=True)
+def row_value(  # noqa: WPS211
+    row: int,
     value_table: value_table_type,
-    state: int,
     discount_rate: float,
-    lookup_table: numpy_int,
+    row_pointers: numpy_int,
     next_state: numpy_int,
-    expected_reward: numpy_float,
     frequency: numpy_float,
+    expected_reward: numpy_float,
 ) -> float:
-    """Compute the new value of the state based upon the latest value table.
+    """Compute the expected value of a state and action row.
 
     Args:
+        row (int): the row of the state and action.
         value_table (value_table_type): our current expectation of value in
             future states to base our estimate.
-        state (int): the state to calculate the value for.
         discount_rate (float): The rate to discount future rewards
-        lookup_table (numpy_int): maps state and actions to observed transitions
-        next_state (numpy_int): the following state after some state and action
-        expected_reward (numpy_float): the average reward after completing some
-            action.
-        frequency (numpy_float): The relative frequency of this transition
+        row_pointers (numpy_int): the start of each state and action's
+            transitions.
+        next_state (numpy_int): the following state of each transition.
+        frequency (numpy_float): The relative frequency of each transition
             compared to others under the same initial state and action.
-
+        expected_reward (numpy_float): the expected reward of each state and
+            action.
 
     Returns:
-        float: the new value for this state.
+        float: the expected value of taking this action.
     """
-    state_value = -math.inf
-    for observation_range in lookup_table[state]:
-        start = observation_range[0]
-        end = observation_range[1]
-
-        subsequent_values = discount_rate * value_table[next_state[start:end]]
-        weighted_rewards = frequency[start:end] * (
-            expected_reward[start:end] + subsequent_values
-        )
-
-        state_value = max(state_value, weighted_rewards.mean())
-    return state_value
+    subsequent_value = 0.0
+    for index in range(row_pointers[row], row_pointers[row + 1]):
+        subsequent_value += frequency[index] * value_table[next_state[index]]
+    return expected_reward[row] + discount_rate * subsequent_value
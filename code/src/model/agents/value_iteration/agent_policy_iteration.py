@@ -0,0 +1,126 @@
+import numpy as np
+
+from src.model.lazy_jit import lazy_jit
+
+from .agent_optimised import ValueIterationAgentOptimised, row_value
+from .dynamics_distribution import numpy_float, numpy_int
+from .types import value_table_type
+
+
+class PolicyIterationAgent(ValueIterationAgentOptimised):
+    """Computes the optimal value table with modified policy iteration.
+
+    Each iteration improves the policy greedily then partially evaluates it
+    with a fixed number of sweeps. Evaluating a fixed policy only considers
+    one action per state, so these sweeps are cheap and propagate value much
+    further than a value iteration sweep when the discount rate is high.
+    """
+
+    evaluation_sweeps = 20
+
+    def solver_key(self) -> str:
+        """Describe the solver and every parameter that affects its result.
+
+        Returns:
+            str: the description used to cache the value table.
+        """
+        return f"{super().solver_key()} evaluation {self.evaluation_sweeps}"
+
+    def compute_value_table(self) -> value_table_type:
+        """Compute the optimal value table with modified policy iteration.
+
+        Returns:
+            value_table_type: the value table for the dynamics
+        """
+        (
+            row_pointers,
+            next_state,
+            frequency,
+            expected_reward,
+        ) = self.dynamics_distribution.get_sparse_representation()
+        value_table = np.random.rand(len(expected_reward) // self.action_count)
+        return modified_policy_iteration(
+            value_table,
+            self.discount_rate,
+            self.stopping_epsilon,
+            self.max_sweeps,
+            self.evaluation_sweeps,
+            row_pointers,
+            next_state,
+            frequency,
+            expected_reward,
+        )
+
+
+@lazy_jit(nopython=True, cache=True, fastmath=True)
+def modified_policy_iteration(  # noqa: WPS211, WPS231
+    value_table: value_table_type,
+    discount_rate: float,
+    stopping_epsilon: float,
+    max_iterations: int,
+    evaluation_sweeps: int,
+    row_pointers: numpy_int,
+    next_state: numpy_int,
+    frequency: numpy_float,
+    expected_reward: numpy_float,
+) -> value_table_type:
+    """Alternate greedy policy improvement with partial policy evaluation.
+
+    Args:
+        value_table (value_table_type): the initial values, updated in place.
+        discount_rate (float): The rate to discount future rewards
+        stopping_epsilon (float): The error amount that is acceptable.
+        max_iterations (int): the most improvement steps to perform.
+        evaluation_sweeps (int): the sweeps evaluating each policy.
+        row_pointers (numpy_int): the start of each state and action's
+            transitions.
+        next_state (numpy_int): the following state of each transition.
+        frequency (numpy_float): The relative frequency of each transition
+            compared to others under the same initial state and action.
+        expected_reward (numpy_float): the expected reward of each state and
+            action.
+
+    Returns:
+        value_table_type: the value table for the dynamics
+    """
+    number_of_states = value_table.shape[0]
+    action_count = (row_pointers.shape[0] - 1) // number_of_states
+    # the state and action row chosen by the policy in each state
+    policy_rows = np.zeros(number_of_states, dtype=np.int64)
+    for _ in range(max_iterations):
+        # improvement, the largest change is the bellman error
+        largest_change = 0.0
+        for state in range(number_of_states):
+            best_value = -np.inf
+            for row in range(state * action_count, (state + 1) * action_count):
+                action_value = row_value(
+                    row,
+                    value_table,
+                    discount_rate,
+                    row_pointers,
+                    next_state,
+                    frequency,
+                    expected_reward,
+                )
+                if action_value > best_value:
+                    best_value = action_value
+                    policy_rows[state] = row
+            largest_change = max(
+                largest_change, abs(best_value - value_table[state])
+            )
+            value_table[state] = best_value
+        if largest_change <= stopping_epsilon:
+            break
+
+        for _ in range(evaluation_sweeps):
+            for state in range(number_of_states):
+                value_table[state] = row_value(
+                    policy_rows[state],
+                    value_table,
+                    discount_rate,
+                    row_pointers,
+                    next_state,
+                    frequency,
+                    expected_reward,
+                )
+    return value_table
@@ -0,0 +1,224 @@
+from heapq import heappop, heappush
+from typing import Tuple
+
+import numpy as np
+
+from src.model.lazy_jit import lazy_jit
+
+from .agent_optimised import ValueIterationAgentOptimised, row_value
+from .dynamics_distribution import numpy_float, numpy_int
+from .types import value_table_type
+
+
+class PrioritizedSweepingAgent(ValueIterationAgentOptimised):
+    """Computes the optimal value table with prioritized sweeping.
+
+    Rather than sweeping every state, the state with the largest Bellman
+    error is updated first. Only the predecessors of an updated state can
+    have their error change, so only they are reconsidered. The work is
+    focused where values are still changing.
+    """
+
+    def compute_value_table(self) -> value_table_type:
+        """Compute the optimal value table with prioritized sweeping.
+
+        Returns:
+            value_table_type: the value table for the dynamics
+        """
+        (
+            row_pointers,
+            next_state,
+            frequency,
+            expected_reward,
+        ) = self.dynamics_distribution.get_sparse_representation()
+        state_count = len(expected_reward) // self.action_count
+        value_table = np.random.rand(state_count)
+        predecessor_pointers, predecessors = self.get_predecessors(
+            state_count, row_pointers, next_state
+        )
+        return prioritized_sweeping(
+            value_table,
+            self.discount_rate,
+            self.stopping_epsilon,
+            self.max_sweeps * state_count,
+            row_pointers,
+            next_state,
+            frequency,
+            expected_reward,
+            predecessor_pointers,
+            predecessors,
+        )
+
+    def get_predecessors(
+        self, state_count: int, row_pointers: numpy_int, next_state: numpy_int
+    ) -> Tuple[numpy_int, numpy_int]:
+        """Invert the transitions to find the predecessors of each state.
+
+        Args:
+            state_count (int): the number of states.
+            row_pointers (numpy_int): the start of each state and action's
+                transitions.
+            next_state (numpy_int): the following state of each transition.
+
+        Returns:
+            Tuple[numpy_int, numpy_int]: the predecessors of each state are
+            stored between its pointer and the next state's pointer.
+        """
+        transition_state = np.repeat(
+            np.arange(state_count * self.action_count) // self.action_count,
+            np.diff(row_pointers),
+        )
+        # unique pairs sorted by the next state
+        pairs = np.unique(np.stack((next_state, transition_state), 1), axis=0)
+        predecessor_pointers = np.zeros(state_count + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(pairs[:, 0], minlength=state_count),
+            out=predecessor_pointers[1:],
+        )
+        return predecessor_pointers, pairs[:, 1].copy()
+
+
+@lazy_jit(nopython=True, cache=True, fastmath=True)
+def state_backup(  # noqa: WPS211
+    state: int,
+    value_table: value_table_type,
+    discount_rate: float,
+    row_pointers: numpy_int,
+    next_state: numpy_int,
+    frequency: numpy_float,
+    expected_reward: numpy_float,
+) -> float:
+    """Compute the value of the best action in a state.
+
+    Args:
+        state (int): the state to back up.
+        value_table (value_table_type): our current expectation of value in
+            future states to base our estimate.
+        discount_rate (float): The rate to discount future rewards
+        row_pointers (numpy_int): the start of each state and action's
+            transitions.
+        next_state (numpy_int): the following state of each transition.
+        frequency (numpy_float): The relative frequency of each transition
+            compared to others under the same initial state and action.
+        expected_reward (numpy_float): the expected reward of each state and
+            action.
+
+    Returns:
+        float: the new value of the state.
+    """
+    action_count = (row_pointers.shape[0] - 1) // value_table.shape[0]
+    best_value = -np.inf
+    for row in range(state * action_count, (state + 1) * action_count):
+        best_value = max(
+            best_value,
+            row_value(
+                row,
+                value_table,
+                discount_rate,
+                row_pointers,
+                next_state,
+                frequency,
+                expected_reward,
+            ),
+        )
+    return best_value
+
+
+@lazy_jit(nopython=True, cache=True, fastmath=True)
+def prioritized_sweeping(  # noqa: WPS211, WPS231
+    value_table: value_table_type,
+    discount_rate: float,
+    stopping_epsilon: float,
+    max_updates: int,
+    row_pointers: numpy_int,
+    next_state: numpy_int,
+    frequency: numpy_float,
+    expected_reward: numpy_float,
+    predecessor_pointers: numpy_int,
+    predecessors: numpy_int,
+) -> value_table_type:
+    """Update states in order of their Bellman error until it is small.
+
+    The queue holds stale entries, an entry is skipped unless its priority is
+    still the state's current priority.
+
+    Args:
+        value_table (value_table_type): the initial values, updated in place.
+        discount_rate (float): The rate to discount future rewards
+        stopping_epsilon (float): The error amount that is acceptable.
+        max_updates (int): the most state updates to perform.
+        row_pointers (numpy_int): the start of each state and action's
+            transitions.
+        next_state (numpy_int): the following state of each transition.
+        frequency (numpy_float): The relative frequency of each transition
+            compared to others under the same initial state and action.
+        expected_reward (numpy_float): the expected reward of each state and
+            action.
+        predecessor_pointers (numpy_int): the start of each state's
+            predecessors.
+        predecessors (numpy_int): the states that can transition to each
+            state.
+
+    Returns:
+        value_table_type: the value table for the dynamics
+    """
+    number_of_states = value_table.shape[0]
+    priority = np.zeros(number_of_states, dtype=np.float64)
+    # largest error first, the list is typed by its first entry
+    queue = [(0.0, 0)]
+    queue.pop()
+    for state in range(number_of_states):
+        error = abs(
+            state_backup(
+                state,
+                value_table,
+                discount_rate,
+                row_pointers,
+                next_state,
+                frequency,
+                expected_reward,
+            )
+            - value_table[state]
+        )
+        if error > stopping_epsilon:
+            priority[state] = error
+            heappush(queue, (-error, state))
+
+    updates = 0
+    while queue and updates < max_updates:
+        negative_error, state = heappop(queue)
+        if -negative_error != priority[state]:
+            continue
+        value_table[state] = state_backup(
+            state,
+            value_table,
+            discount_rate,
+            row_pointers,
+            next_state,
+            frequency,
+            expected_reward,
+        )
+        priority[state] = 0
+        updates += 1
+
+        start = predecessor_pointers[state]
+        end = predecessor_pointers[state + 1]
+        for predecessor in predecessors[start:end]:
+            error = abs(
+                state_backup(
+                    predecessor,
+                    value_table,
+                    discount_rate,
+                    row_pointers,
+                    next_state,
+                    frequency,
+                    expected_reward,
+                )
+                - value_table[predecessor]
+            )
+            if error <= stopping_epsilon:
+                priority[predecessor] = 0
+            elif error != priority[predecessor]:
+                priority[predecessor] = error
+                heappush(queue, (-error, predecessor))
+    return value_table
@@ -0,0 +1,213 @@
+from hashlib import sha256
+from os import listdir, makedirs, path, rename, scandir, utime
+from shutil import rmtree
+from tempfile import mkdtemp
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .dynamics_distribution import DynamicsDistribution
+from .types import value_table_type
+
+cached_array = np.ndarray[Any, np.dtype[Any]]
+
+
+class DistributionCache(object):
+    """Caches compiled distributions and value tables on disk.
+
+    Each entry is a directory of `.npy` files named by the hash of everything
+    that determines its contents, such as the dynamics, the sample count and
+    the solver's parameters. Entries are memory mapped read only, so processes
+    using the same entry share its pages rather than recomputing it. Once the
+    cache grows beyond `max_size` bytes the least recently used entries are
+    removed.
+    """
+
+    default_directory = path.join(
+        path.dirname(__file__), "..", "..", "..", "..", ".cache", "dynamics"
+    )
+    max_size = 512 * 1024 * 1024
+    # change when the layout of the arrays changes to ignore old entries
+    version = 1
+    distribution_arrays = (
+        "states",
+        "row_pointers",
+        "next_states",
+        "rewards",
+        "frequencies",
+    )
+    value_table_arrays = ("value_table",)
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        """Initialise the cache, nothing is read until an entry is needed.
+
+        Args:
+            directory (Optional[str]): where the entries are stored. Defaults to
+                `default_directory`.
+        """
+        self.directory = path.abspath(directory or self.default_directory)
+
+    def compile_distribution(self, distribution: DynamicsDistribution) -> None:
+        """Load the distribution's arrays, compiling them if not cached.
+
+        Args:
+            distribution (DynamicsDistribution): the distribution to compile.
+        """
+        key = self.distribution_key(distribution)
+        if key is None:
+            distribution.compile()
+            return
+
+        arrays = self.load(key, self.distribution_arrays)
+        if arrays is None:
+            distribution.compile()
+            compiled_arrays = distribution.get_arrays()
+            self.store(
+                key, dict(zip(self.distribution_arrays, compiled_arrays))
+            )
+            return
+
+        states, row_pointers, next_states, rewards, frequencies = arrays
+        distribution.set_arrays(
+            (states, row_pointers, next_states, rewards, frequencies)
+        )
+
+    def get_value_table(
+        self,
+        distribution: DynamicsDistribution,
+        solver_key: str,
+        compute: Callable[[], value_table_type],
+    ) -> value_table_type:
+        """Load the value table of a distribution, computing it if not cached.
+
+        Args:
+            distribution (DynamicsDistribution): the compiled distribution the
+                value table is for.
+            solver_key (str): describes the solver and its parameters.
+            compute (Callable[[], value_table_type]): computes the value table
+                when it is not cached.
+
+        Returns:
+            value_table_type: the value table, read only when loaded from the
+            cache.
+        """
+        key = self.distribution_key(distribution)
+        if key is None:
+            return compute()
+
+        key = f"{key} {solver_key}"
+        arrays = self.load(key, self.value_table_arrays)
+        if arrays is not None:
+            return arrays[0]
+
+        value_table = compute()
+        self.store(key, dict(zip(self.value_table_arrays, [value_table])))
+        return value_table
+
+    def distribution_key(
+        self, distribution: DynamicsDistribution
+    ) -> Optional[str]:
+        """Describe everything that determines the distribution.
+
+        Args:
+            distribution (DynamicsDistribution): the distribution to describe.
+
+        Returns:
+            Optional[str]: the description, none if the dynamics can not be
+            cached.
+        """
+        dynamics_key = distribution.dynamics.cache_key()
+        if dynamics_key is None:
+            return None
+        return (
+            f"version {self.version} {dynamics_key} "
+            + f"samples {distribution.sample_count}"
+        )
+
+    def entry_path(self, key: str) -> str:
+        """Get the directory of an entry.
+
+        Args:
+            key (str): the description of the entry's contents.
+
+        Returns:
+            str: the path of the entry's directory.
+        """
+        return path.join(self.directory, sha256(key.encode()).hexdigest())
+
+    def load(
+        self, key: str, names: Sequence[str]
+    ) -> Optional[List[cached_array]]:
+        """Memory map the arrays of an entry.
+
+        Args:
+            key (str): the description of the entry's contents.
+            names (Sequence[str]): the names of the arrays to load.
+
+        Returns:
+            Optional[List[cached_array]]: the read only arrays, none when the
+            entry is missing or was removed while loading.
+        """
+        entry = self.entry_path(key)
+        try:
+            arrays = [
+                np.load(path.join(entry, f"{name}.npy"), mmap_mode="r")
+                for name in names
+            ]
+            # the modification time orders entries for eviction
+            utime(entry)
+        except (OSError, ValueError):
+            return None
+        return arrays
+
+    def store(self, key: str, arrays: Dict[str, cached_array]) -> None:
+        """Write a new entry then evict old entries if the cache is too large.
+
+        The arrays are written to a temporary directory which is then renamed,
+        other processes never see a partially written entry.
+
+        Args:
+            key (str): the description of the entry's contents.
+            arrays (Dict[str, cached_array]): the arrays of the entry by name.
+        """
+        makedirs(self.directory, exist_ok=True)
+        temporary = mkdtemp(prefix=".", dir=self.directory)
+        for name, array in arrays.items():
+            np.save(path.join(temporary, f"{name}.npy"), array)
+
+        entry = self.entry_path(key)
+        try:
+            rename(temporary, entry)
+        except OSError:
+            # another process has already stored this entry
+            rmtree(temporary, ignore_errors=True)
+        self.evict(entry)
+
+    def evict(self, keep: str) -> None:
+        """Remove the least recently used entries until the cache fits.
+
+        Args:
+            keep (str): the path of an entry that must not be removed.
+        """
+        entries = []
+        total_size = 0
+        for name in listdir(self.directory):
+            entry = path.join(self.directory, name)
+            # temporary directories are still being written
+            if name.startswith("."):
+                continue
+            try:
+                size = sum(item.stat().st_size for item in scandir(entry))
+                modified = path.getmtime(entry)
+            except OSError:
+                continue
+            total_size += size
+            if entry != keep:
+                entries.append((modified, size, entry))
+
+        for _, size, entry in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            # mapped arrays stay readable after their files are removed
+            rmtree(entry, ignore_errors=True)
+            total_size -= size
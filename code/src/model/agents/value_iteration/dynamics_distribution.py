@@ -1,27 +1,46 @@
-from collections import defaultdict
-from typing import Any, DefaultDict, Dict, Iterable, List, Set, Tuple
+import random
+from collections import defaultdict, deque
+from functools import partial
+from multiprocessing import Pool, current_process
+from multiprocessing.pool import Pool as PoolType
+from typing import DefaultDict, Deque, Dict, List, Optional, Set, Tuple
 
 import numpy as np
 
 from ...dynamics.actions import Action
 from ...dynamics.base_dynamics import BaseDynamics
+from ...state.encoded_state_pool import EncodedStatePool
+from ...state.state_instance import StateInstance
+from .transition_recorder import (
+    TransitionRecorder,
+    recorded_transitions_type,
+)
+from .types import distribution_result, numpy_float, numpy_int
 
-# the new state with its expected reward and frequency for getting there
-distribution_result = Dict[int, Tuple[float, float]]
 observations_type = Dict[int, Dict[int, distribution_result]]
+# the distribution of each action in a state, keyed by the next state itself
+instance_observations_type = Dict[int, Dict[StateInstance, Tuple[float, float]]]
 
-
-numpy_float = np.ndarray[Any, np.dtype[np.float64]]
-numpy_int = np.ndarray[Any, np.dtype[np.int64]]
-
-
+# row pointers, next states, rewards and frequencies
 numpy_distribution_information_type = Tuple[
     numpy_int, numpy_int, numpy_float, numpy_float
 ]
+# row pointers, next states, frequencies and the expected reward of each row
+sparse_distribution_type = Tuple[numpy_int, numpy_int, numpy_float, numpy_float]
 
 
 class DynamicsDistribution(object):
-    """Calculates a dynamics distribution."""
+    """Calculates a dynamics distribution.
+
+    The distribution is stored as a compressed sparse row matrix, row
+    `state * len(Action) + action` holds the observed transitions of that
+    state and action.
+    """
+
+    worker_count = 4
+    # smaller levels are not worth sending to the pool
+    parallel_level_size = 64
+    action_count = len(Action)
 
     def __init__(
         self, per_state_sample_count: int, dynamics: BaseDynamics
@@ -38,8 +57,35 @@ class DynamicsDistribution(object):
         )
         self.dynamics = dynamics
 
-        # state, action, new_state -> reward, freq
-        self.observations: observations_type = {}
+        self.__store(TransitionRecorder())
+
+    @property
+    def observations(self) -> observations_type:
+        """Get the distribution as nested dictionaries.
+
+        state, action, new_state -> reward, freq. this view is only built when
+        it is first needed.
+
+        Returns:
+            observations_type: the observations of each state and action.
+        """
+        if self.observations_view is None:
+            self.observations_view = self.__build_observations_view()
+        return self.observations_view
+
+    @observations.setter
+    def observations(self, observations: observations_type) -> None:
+        """Replace the distribution with the given observations.
+
+        Args:
+            observations (observations_type): the observations of each state
+                and action.
+        """
+        recorder = TransitionRecorder()
+        for state, state_observations in observations.items():
+            recorder.record_state(state, state_observations)
+        self.__store(recorder)
+        self.observations_view = observations
 
     def compute_state_action_distribution(
         self, state: int, action: Action
@@ -54,18 +100,9 @@ class DynamicsDistribution(object):
             distribution_result: the distribution of states and their
             expected immediate rewards.
         """
-        observed_states: DefaultDict[int, List[float]] = defaultdict(list)
-
-        for _ in range(self.sample_count):
-            next_id, reward = self.dynamics.next_state_id(state, action)
-            observed_states[next_id].append(reward)
-
-        reduced_output: distribution_result = {}
-        for new_state, observations in observed_states.items():
-            frequency = len(observations) / self.sample_count
-            average_reward = np.array(observations).mean()
-            reduced_output[new_state] = (average_reward, frequency)
-        return reduced_output
+        return sample_distribution(
+            self.dynamics, self.sample_count, state, action
+        )
 
     def compile(self):
         """Compile the dynamics state distribution for analysis.
@@ -75,29 +112,191 @@ class DynamicsDistribution(object):
         states the distribution would need to be recalculated, and thus the
         value table. The existing value table and distributions could be reused
         but this is not within scope.
+
+        Sampling many times from stochastic dynamics is shared across a pool of
+        processes, otherwise the states are explored serially.
         """
-        frontier: List[int] = [self.dynamics.initial_state_id()]
-        seen_states: Set[int] = set(frontier)
+        recorder = TransitionRecorder()
+        parallel = (
+            self.sample_count > 1
+            and self.worker_count > 1
+            # daemonic processes, such as pool workers, cannot have children
+            and not current_process().daemon
+        )
+        if parallel:
+            self.__compile_parallel(recorder)
+        else:
+            self.__compile_serial(recorder)
+        self.__store(recorder)
 
-        seen_add = seen_states.add  # performance tweak
-        frontier_add = frontier.append
+    def __compile_serial(self, recorder: TransitionRecorder) -> None:
+        """Explore the reachable states breadth first in this process.
 
-        def add_states(states: Iterable[int]):
-            for state in states:
-                if state not in seen_states:
-                    seen_add(state)
-                    frontier_add(state)
+        Args:
+            recorder (TransitionRecorder): records each state's transitions.
+        """
+        frontier: Deque[int] = deque([self.dynamics.initial_state_id()])
+        seen_states: Set[int] = set(frontier)
 
         while frontier:
-            current_state = frontier.pop(0)
-            current_state_observations = {}
-            self.observations[current_state] = current_state_observations
-            for action in Action:
-                distribution = self.compute_state_action_distribution(
-                    current_state, action
+            current_state = frontier.popleft()
+            current_state_observations = sample_state(
+                self.dynamics, self.sample_count, current_state
+            )
+            recorder.record_state(current_state, current_state_observations)
+            for distribution in current_state_observations.values():
+                for state in distribution:
+                    if state not in seen_states:
+                        seen_states.add(state)
+                        frontier.append(state)
+
+    def __compile_parallel(self, recorder: TransitionRecorder) -> None:
+        """Explore the reachable states one level at a time.
+
+        each level of the breadth first search is split between a pool of
+        processes, levels smaller than `parallel_level_size` are sampled in
+        this process.
+
+        each worker has its own copy of the state pool, so unless the ids are
+        encoded the workers sample state instances and the ids are given out
+        by this process's pool.
+
+        Args:
+            recorder (TransitionRecorder): records each state's transitions.
+        """
+        level: List[int] = [self.dynamics.initial_state_id()]
+        seen_states: Set[int] = set(level)
+        state_pool = self.dynamics.state_pool
+        encoded_ids = isinstance(state_pool, EncodedStatePool)
+        sampler = sample_state if encoded_ids else sample_state_instances
+        sample_states = partial(sampler, self.dynamics, self.sample_count)
+
+        # the pool is only started once a level is large enough to need it
+        pool: Optional[PoolType] = None
+        try:
+            while level:
+                tasks = (
+                    level
+                    if encoded_ids
+                    else [
+                        state_pool.get_state_from_id(state) for state in level
+                    ]
                 )
-                current_state_observations[action.value] = distribution
-                add_states(distribution.keys())
+                if len(level) < self.parallel_level_size:
+                    level_observations = map(sample_states, tasks)
+                else:
+                    if pool is None:
+                        pool = Pool(
+                            self.worker_count, initializer=reseed_worker
+                        )
+                    chunk_size = max(len(level) // (self.worker_count * 4), 1)
+                    level_observations = pool.imap(
+                        sample_states, tasks, chunk_size
+                    )
+                if not encoded_ids:
+                    level_observations = map(
+                        self.__assign_ids, level_observations
+                    )
+
+                next_level: List[int] = []
+                for state, state_observations in zip(level, level_observations):
+                    recorder.record_state(state, state_observations)
+                    for distribution in state_observations.values():
+                        for new_state in distribution:
+                            if new_state not in seen_states:
+                                seen_states.add(new_state)
+                                next_level.append(new_state)
+                level = next_level
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+    def __assign_ids(
+        self, state_observations: instance_observations_type
+    ) -> Dict[int, distribution_result]:
+        """Replace the sampled next states with their ids in this process.
+
+        Args:
+            state_observations (instance_observations_type): the distribution
+                of each action, keyed by the next state.
+
+        Returns:
+            Dict[int, distribution_result]: the distribution of each action.
+        """
+        get_state_id = self.dynamics.state_pool.get_state_id
+        return {
+            action: {
+                get_state_id(next_state): observation
+                for next_state, observation in distribution.items()
+            }
+            for action, distribution in state_observations.items()
+        }
+
+    def get_arrays(self) -> recorded_transitions_type:
+        """Get every array that makes up the distribution.
+
+        Returns:
+            recorded_transitions_type: the states in the order they were
+            explored, then the row pointers, next states, rewards and
+            frequencies of the sparse matrix.
+        """
+        return (
+            self.states,
+            self.row_pointers,
+            self.next_states,
+            self.rewards,
+            self.frequencies,
+        )
+
+    def set_arrays(self, arrays: recorded_transitions_type) -> None:
+        """Replace the distribution with previously compiled arrays.
+
+        Args:
+            arrays (recorded_transitions_type): the arrays in the same order as
+                `get_arrays`, these can be read only.
+        """
+        (
+            self.states,
+            self.row_pointers,
+            self.next_states,
+            self.rewards,
+            self.frequencies,
+        ) = arrays
+        self.observations_view: Optional[observations_type] = None
+
+    def __store(self, recorder: TransitionRecorder) -> None:
+        """Store the arrays of the recorded transitions.
+
+        Args:
+            recorder (TransitionRecorder): the recorded transitions.
+        """
+        self.set_arrays(recorder.build())
+
+    def __build_observations_view(self) -> observations_type:
+        """Build the nested dictionaries from the arrays.
+
+        Returns:
+            observations_type: the observations of each state and action.
+        """
+        row_pointers = self.row_pointers.tolist()
+        next_states = self.next_states.tolist()
+        rewards = self.rewards.tolist()
+        frequencies = self.frequencies.tolist()
+
+        observations: observations_type = {}
+        for state in self.states.tolist():
+            state_observations: Dict[int, distribution_result] = {}
+            for action in range(self.action_count):
+                row = state * self.action_count + action
+                start, end = row_pointers[row], row_pointers[row + 1]
+                if start == end:
+                    continue
+                state_observations[action] = {
+                    next_states[index]: (rewards[index], frequencies[index])
+                    for index in range(start, end)
+                }
+            observations[state] = state_observations
+        return observations
 
     def has_compiled(self) -> bool:
         """Check weather the observations have been compiled yet.
@@ -105,7 +304,7 @@ class DynamicsDistribution(object):
         Returns:
             bool: true when the distribution has been compiled.
         """
-        return bool(self.observations)
+        return bool(len(self.states))
 
     def check_compiled(self) -> None:
         """Throw error if not compiled yet.
@@ -123,72 +322,154 @@ class DynamicsDistribution(object):
             int: the number of states
         """
         self.check_compiled()
-        return len(self.observations)
+        return len(self.states)
 
-    def list_states(self) -> np.ndarray[Any, np.dtype[np.integer]]:
+    def list_states(self) -> numpy_int:
         """Get array of all the states.
 
         Returns:
-            np.ndarray[Any, np.dtype[np.integer]]: all possible states as an
-            array.
+            numpy_int: all possible states as an array, in the order they were
+            explored.
         """
-        return np.array(list(self.observations.keys()))
+        return self.states.copy()
 
     def get_array_representation(
         self,
     ) -> numpy_distribution_information_type:
-        """Convert the observations data to an array representation.
-
-        lookup table -> maps a state and action to a range of observations
-
-        the lookup table provides the start and end of a range of observed
-        subsequent states.
+        """Get the compressed sparse row arrays of the distribution.
 
+        row pointers -> the start of each state and action's transitions, one
+        longer than the number of rows
         next state -> the observed next state
-        expected_reward -> the expected reward for transitioning to this state
+        reward -> the expected reward for transitioning to this state
         frequency -> how often under these state and action do we perform this
         transition
 
         Returns:
-            numpy_distribution_information_type: lookup_table, next_state,
-            expected_reward, frequency
-        """
-        # 3d array state action to index the start and end of the observations
-        # states index to ranges in the corresponding arrays
-
-        empty_list_item = [None]
-
-        lookup_table: List[Any] = empty_list_item * len(self.observations)
-
-        next_state: List[Any] = []
-        expected_reward: List[Any] = []
-        frequency: List[Any] = []
-
-        for state, actions in self.observations.items():
-            state_lookup_table: List[Any] = empty_list_item * len(actions)
-            for action, observations in actions.items():
-                start = len(next_state)
-                end = start + len(observations)
-                state_lookup_table[action - 1] = [start, end]
-
-                next_state.extend(empty_list_item * len(observations))
-                expected_reward.extend(empty_list_item * len(observations))
-                frequency.extend(empty_list_item * len(observations))
-
-                for raw_index, observation in enumerate(observations.items()):
-                    (
-                        next_state_observation,
-                        (reward_observation, frequency_observation),
-                    ) = observation
-                    index = start + raw_index
-                    next_state[index] = next_state_observation
-                    expected_reward[index] = reward_observation
-                    frequency[index] = frequency_observation
-            lookup_table[state] = state_lookup_table
+            numpy_distribution_information_type: row_pointers, next_state,
+            reward, frequency
+        """
+        return (
+            self.row_pointers,
+            self.next_states,
+            self.rewards,
+            self.frequencies,
+        )
+
+    def get_sparse_representation(self) -> sparse_distribution_type:
+        """Get the sparse transition matrix with the reward of each row.
 
+        row pointers -> the start of each row's transitions, one longer than
+        the number of rows
+        next state -> the column of each transition
+        frequency -> the value of each transition
+        expected reward -> the frequency weighted reward of each row
+
+        Returns:
+            sparse_distribution_type: row_pointers, next_state, frequency,
+            expected_reward
+        """
+        self.check_compiled()
+        row_count = len(self.row_pointers) - 1
+        transition_rows = np.repeat(
+            np.arange(row_count), np.diff(self.row_pointers)
+        )
+        expected_reward = np.bincount(
+            transition_rows,
+            weights=self.frequencies * self.rewards,
+            minlength=row_count,
+        )
         return (
-            np.array(lookup_table, dtype=np.int64),
-            np.array(next_state, dtype=np.int64),
-            np.array(expected_reward, dtype=np.float64),
-            np.array(frequency, dtype=np.float64),
+            self.row_pointers,
+            self.next_states,
+            self.frequencies,
+            expected_reward,
+        )
+
+
+def sample_distribution(
+    dynamics: BaseDynamics, sample_count: int, state: int, action: Action
+) -> distribution_result:
+    """Sample the subsequent distribution for a given action and state.
+
+    Args:
+        dynamics (BaseDynamics): the dynamics to sample.
+        sample_count (int): the number of samples to take.
+        state (int): the state to to get the distribution for.
+        action (Action): the action to get the distribution for.
+
+    Returns:
+        distribution_result: the distribution of states and their expected
+        immediate rewards.
+    """
+    observed_states: DefaultDict[int, List[float]] = defaultdict(list)
+
+    for _ in range(sample_count):
+        next_id, reward = dynamics.next_state_id(state, action)
+        observed_states[next_id].append(reward)
+
+    reduced_output: distribution_result = {}
+    for new_state, observations in observed_states.items():
+        frequency = len(observations) / sample_count
+        # the lists are short, building an array to average them costs more
+        average_reward = sum(observations) / len(observations)
+        reduced_output[new_state] = (average_reward, frequency)
+    return reduced_output
+
+
+def sample_state(
+    dynamics: BaseDynamics, sample_count: int, state: int
+) -> Dict[int, distribution_result]:
+    """Sample the distribution of every action in a state.
+
+    Args:
+        dynamics (BaseDynamics): the dynamics to sample.
+        sample_count (int): the number of samples to take per action.
+        state (int): the state to to get the distributions for.
+
+    Returns:
+        Dict[int, distribution_result]: the distribution of each action.
+    """
+    return {
+        action.value: sample_distribution(dynamics, sample_count, state, action)
+        for action in Action
+    }
+
+
+def sample_state_instances(
+    dynamics: BaseDynamics, sample_count: int, state: StateInstance
+) -> instance_observations_type:
+    """Sample the distribution of every action in a state without state ids.
+
+    used by workers whose state pool does not share ids with the parent.
+
+    Args:
+        dynamics (BaseDynamics): the dynamics to sample.
+        sample_count (int): the number of samples to take per action.
+        state (StateInstance): the state to to get the distributions for.
+
+    Returns:
+        instance_observations_type: the distribution of each action.
+    """
+    state_observations: instance_observations_type = {}
+    for action in Action:
+        observed_states: DefaultDict[StateInstance, List[float]] = defaultdict(
+            list
         )
+        for _ in range(sample_count):
+            next_state, reward = dynamics.next(state, action)
+            observed_states[next_state].append(reward)
+        state_observations[action.value] = {
+            next_state: (
+                sum(observations) / len(observations),
+                len(observations) / sample_count,
+            )
+            for next_state, observations in observed_states.items()
+        }
+    return state_observations
+
+
+def reseed_worker() -> None:
+    """Reseed a pool worker so workers do not share a random sequence."""
+    random.seed()
+    np.random.seed()
@@ -0,0 +1,20 @@
+from enum import Enum
+
+
+class SweepMode(Enum):
+    """Enumerates the ways a value iteration sweep can update the table."""
+
+    # every state is updated from the previous sweep's values
+    jacobi = 0
+    # states are updated in place, later states see the new values
+    gauss_seidel = 1
+
+
+class ConvergenceCheck(Enum):
+    """Enumerates the tests for when value iteration has converged."""
+
+    # the largest change of any state's value
+    absolute = 0
+    # the difference between the largest and smallest change, sufficient for
+    # the policy to converge while the values may still be offset.
+    span = 1
@@ -0,0 +1,94 @@
+from array import array
+from typing import Dict, Tuple
+
+import numpy as np
+
+from ...dynamics.actions import Action
+from .types import distribution_result, numpy_float, numpy_int
+
+# states, row pointers, next states, rewards and frequencies
+recorded_transitions_type = Tuple[
+    numpy_int, numpy_int, numpy_int, numpy_float, numpy_float
+]
+
+
+class TransitionRecorder(object):
+    """Records sampled transitions straight into arrays.
+
+    States are recorded in the order they are explored, once every state has
+    been recorded the transitions are arranged into a compressed sparse row
+    matrix. Row `state * len(Action) + action` holds the transitions of that
+    state and action.
+    """
+
+    action_count = len(Action)
+    # typed arrays store compact values and append in amortised constant time
+    integer_code = "q"
+    float_code = "d"
+
+    def __init__(self) -> None:
+        """Initialise an empty recorder."""
+        self.states = array(self.integer_code)
+        # the row and length of each recorded state and action
+        self.rows = array(self.integer_code)
+        self.row_lengths = array(self.integer_code)
+        self.next_states = array(self.integer_code)
+        self.rewards = array(self.float_code)
+        self.frequencies = array(self.float_code)
+
+    def record_state(
+        self, state: int, state_observations: Dict[int, distribution_result]
+    ) -> None:
+        """Record the distribution of every action in a state.
+
+        Args:
+            state (int): the state the distributions are from.
+            state_observations (Dict[int, distribution_result]): the
+                distribution of each action, actions that are missing have no
+                transitions.
+        """
+        self.states.append(state)
+        for action, distribution in state_observations.items():
+            self.rows.append(state * self.action_count + action)
+            self.row_lengths.append(len(distribution))
+            for next_state, (reward, frequency) in distribution.items():
+                self.next_states.append(next_state)
+                self.rewards.append(reward)
+                self.frequencies.append(frequency)
+
+    def build(self) -> recorded_transitions_type:
+        """Arrange the recorded transitions by row.
+
+        Returns:
+            recorded_transitions_type: the states in the order they were
+            recorded, then the row pointers, next states, rewards and
+            frequencies of the sparse matrix. States that were not recorded
+            have empty rows.
+        """
+        states = np.array(self.states, dtype=np.int64)
+        rows = np.frombuffer(self.rows, dtype=np.int64)
+        row_lengths = np.frombuffer(self.row_lengths, dtype=np.int64)
+        row_count = (int(states.max(initial=-1)) + 1) * self.action_count
+
+        lengths = np.zeros(row_count + 1, dtype=np.int64)
+        lengths[rows + 1] = row_lengths
+        row_pointers = np.cumsum(lengths)
+
+        # move each recorded row's transitions to where its row starts
+        recorded_starts = np.cumsum(row_lengths) - row_lengths
+        transition_rows = np.repeat(np.arange(len(rows)), row_lengths)
+        destination = row_pointers[rows][transition_rows] + (
+            np.arange(len(transition_rows)) - recorded_starts[transition_rows]
+        )
+
+        next_states = np.empty(len(destination), dtype=np.int64)
+        next_states[destination] = np.frombuffer(
+            self.next_states, dtype=np.int64
+        )
+        rewards = np.empty(len(destination), dtype=np.float64)
+        rewards[destination] = np.frombuffer(self.rewards, dtype=np.float64)
+        frequencies = np.empty(len(destination), dtype=np.float64)
+        frequencies[destination] = np.frombuffer(
+            self.frequencies, dtype=np.float64
+        )
+        return states, row_pointers, next_states, rewards, frequencies
@@ -1,5 +1,11 @@
-from typing import Any
+from typing import Any, Dict, Tuple
 
 import numpy as np
 
 value_table_type = np.ndarray[Any, np.dtype[np.float64]]
+
+numpy_float = np.ndarray[Any, np.dtype[np.float64]]
+numpy_int = np.ndarray[Any, np.dtype[np.int64]]
+
+# the new state with its expected reward and frequency for getting there
+distribution_result = Dict[int, Tuple[float, float]]
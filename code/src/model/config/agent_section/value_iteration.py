@@ -1,3 +1,10 @@
+from schema import Or
+
+from src.model.agents.value_iteration.sweep_options import (
+    ConvergenceCheck,
+    SweepMode,
+)
+
 from ..base_section import BaseConfigSection
 
 
@@ -6,12 +13,18 @@ class ValueIterationConfig(BaseConfigSection):
 
     sample_count_property = "sample_count"
     stopping_epsilon_property = "stopping_epsilon"
+    sweep_mode_property = "sweep_mode"
+    convergence_check_property = "convergence_check"
+    max_sweeps_property = "max_sweeps"
 
     def __init__(self) -> None:
         """Instantiate value iteration section config."""
         data_schema = {
             self.stopping_epsilon_property: float,
             self.sample_count_property: int,
+            self.sweep_mode_property: Or(*SweepMode.__members__),
+            self.convergence_check_property: Or(*ConvergenceCheck.__members__),
+            self.max_sweeps_property: int,
         }
 
         super().__init__("value_iteration", data_schema, [])
@@ -33,3 +46,33 @@ class ValueIterationConfig(BaseConfigSection):
             int: the number of samples to use for distribution analysis.
         """
         return self.configuration[self.sample_count_property]
+
+    @property
+    def sweep_mode(self) -> SweepMode:
+        """Get the sweep mode.
+
+        Returns:
+            SweepMode: how each sweep updates the value table.
+        """
+        return SweepMode[self.configuration[self.sweep_mode_property]]
+
+    @property
+    def convergence_check(self) -> ConvergenceCheck:
+        """Get the convergence check.
+
+        Returns:
+            ConvergenceCheck: the test compared against the stopping epsilon.
+        """
+        return ConvergenceCheck[
+            self.configuration[self.convergence_check_property]
+        ]
+
+    @property
+    def max_sweeps(self) -> int:
+        """Get the maximum number of sweeps.
+
+        Returns:
+            int: the number of sweeps after which value iteration stops even
+            if it has not converged.
+        """
+        return self.configuration[self.max_sweeps_property]
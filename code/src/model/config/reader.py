@@ -1,7 +1,6 @@
 from os import path
 from typing import Any
 
-import toml
 from typing_extensions import Self
 
 from .agent_section.agent_section import AgentConfig
@@ -43,6 +42,8 @@ class ConfigReader(object):
             path.join(path.dirname(__file__), "..", "..", self.config_file_name)
         )
 
+        import toml  # noqa: WPS433
+
         with open(config_file_path, "r") as config_file:
             self.__raw_config = toml.load(config_file)
 
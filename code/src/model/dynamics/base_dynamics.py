@@ -1,4 +1,5 @@
 import sys
+from typing import Optional
 
 from ..config.grid_world_section import GridWorldConfig
 from ..state.state_instance import StateInstance
@@ -42,6 +43,18 @@ class BaseDynamics(object):
             "This method must be overridden by concrete dynamics classes"
         )
 
+    def cache_key(self) -> Optional[str]:
+        """Describe everything that determines the transitions of the dynamics.
+
+        Dynamics with the same description must behave identically, so their
+        compiled distributions can be shared through a cache.
+
+        Returns:
+            Optional[str]: the description, none when the dynamics can not be
+            described and must not be cached.
+        """
+        return None
+
     def state_count_upper_bound(self) -> int:
         """Get an upper bound on the number of states.
 
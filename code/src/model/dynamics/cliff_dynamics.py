@@ -1,9 +1,11 @@
-from typing import Set, Tuple
+from typing import Dict, Optional, Set, Tuple
 
 from src.model.config.grid_world_section import GridWorldConfig
 
 from ..state.cell_entities import CellEntity
+from ..state.encoded_state_pool import EncodedStatePool
 from ..state.state_builder import StateBuilder
+from ..state.state_encoder import StateEncoder
 from ..state.state_instance import StateInstance
 from .actions import Action
 from .base_dynamics import BaseDynamics
@@ -22,6 +24,18 @@ class CliffDynamics(BaseDynamics):
         """
         super().__init__(config)
         self.reset_location = (0, config.height - 1)
+        self.encoder = StateEncoder(
+            self.grid_world,
+            static_entities=self.initial_state().entities,
+        )
+        self.state_pool = EncodedStatePool(self.encoder)
+        self.reset_id = self.encoder.encode(*self.reset_location, 0)
+
+        # the reward for leaving each state that resets the agent
+        self.reset_rewards: Dict[int, float] = {}
+        for (x_pos, y_pos), entity in self.encoder.static_entities.items():
+            reward = -100 if entity is CellEntity.warning else 100
+            self.reset_rewards[self.encoder.encode(x_pos, y_pos, 0)] = reward
 
     def is_stochastic(self) -> bool:
         """Determine weather the dynamics behave stochastically.
@@ -31,6 +45,15 @@ class CliffDynamics(BaseDynamics):
         """
         return False
 
+    def cache_key(self) -> Optional[str]:
+        """Describe everything that determines the transitions of the dynamics.
+
+        Returns:
+            Optional[str]: the grid's size, which determines the cliff and the
+            reset location.
+        """
+        return f"cliff {self.config.width}x{self.config.height}"
+
     def state_count_upper_bound(self) -> int:
         """Get an upper bound on the number of states.
 
@@ -107,3 +130,41 @@ class CliffDynamics(BaseDynamics):
         next_state_builder.set_agent_location(next_agent_location)
 
         return next_state_builder.build(), -1
+
+    def initial_state_id(self) -> int:
+        """Provide the initial state id of this environment.
+
+        Returns:
+            int: the starting state id.
+        """
+        return self.reset_id
+
+    def next_state_id(
+        self, current_state_id: int, action: Action
+    ) -> tuple[int, float]:
+        """Compute the next state and reward directly from the state id.
+
+        Equivalent to `next` without creating any state instances.
+
+        Args:
+            current_state_id (int): the state that the action is
+                performed in
+            action (Action): the action the agent has chosen
+
+        Returns:
+            tuple[int, float]: the resulting state after the action has been
+            performed and the reward from this action
+        """
+        reset_reward = self.reset_rewards.get(current_state_id, None)
+        if reset_reward is not None:
+            return self.reset_id, reset_reward
+
+        encoder = self.encoder
+        x_pos, y_pos, _ = encoder.decode(current_state_id)
+        dir_x, dir_y = self.grid_world.action_direction[action]
+        next_x = x_pos + dir_x
+        next_y = y_pos + dir_y
+        if not (0 <= next_x < encoder.width and 0 <= next_y < encoder.height):
+            return current_state_id, -1
+
+        return encoder.encode(next_x, next_y, 0), -1
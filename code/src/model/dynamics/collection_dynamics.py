@@ -8,7 +8,9 @@ import numpy as np
 from src.model.config.grid_world_section import GridWorldConfig
 
 from ..state.cell_entities import CellEntity
+from ..state.encoded_state_pool import EncodedStatePool
 from ..state.state_builder import StateBuilder
+from ..state.state_encoder import StateEncoder
 from ..state.state_instance import StateInstance
 from .actions import Action
 from .base_dynamics import BaseDynamics
@@ -29,6 +31,13 @@ class CollectionDynamics(BaseDynamics):
         """
         super().__init__(config)
         self.spawn_positions: Optional[spawn_positions_type] = None
+        self.encoder = StateEncoder(
+            self.grid_world, sorted(self.get_spawn_positions())
+        )
+        self.state_pool = EncodedStatePool(self.encoder)
+        self.initial_id = self.encoder.encode(
+            *config.agent_location, self.encoder.full_mask
+        )
 
     def is_stochastic(self) -> bool:
         """Determine weather the dynamics behave stochastically.
@@ -38,6 +47,20 @@ class CollectionDynamics(BaseDynamics):
         """
         return False
 
+    def cache_key(self) -> Optional[str]:
+        """Describe everything that determines the transitions of the dynamics.
+
+        Returns:
+            Optional[str]: the grid's size, the agent's location and the
+            positions of the goals.
+        """
+        config = self.config
+        spawn_positions = sorted(self.get_spawn_positions())
+        return (
+            f"collection {config.width}x{config.height} "
+            + f"agent {config.agent_location} goals {spawn_positions}"
+        )
+
     def state_count_upper_bound(self) -> int:
         """Get an upper bound on the number of states.
 
@@ -46,11 +69,7 @@ class CollectionDynamics(BaseDynamics):
         Returns:
             int: an upper bound on the number of state.
         """
-        return (
-            self.grid_world.width
-            * self.grid_world.height
-            * (2**self.config.entity_count)
-        )
+        return self.encoder.state_count
 
     def get_spawn_positions(self) -> spawn_positions_type:
         """Get the positions where flags can be spawned.
@@ -136,3 +155,56 @@ class CollectionDynamics(BaseDynamics):
         reward = 10 if got_goal else -1
 
         return next_state_builder.build(), reward
+
+    def initial_state_id(self) -> int:
+        """Provide the initial state id of this environment.
+
+        Raises:
+            ValueError: if the config specifies an invalid state. such as the
+                agent location being outside the bounds of the grid.
+
+        Returns:
+            int: the starting state id.
+        """
+        if not self.grid_world.is_in_bounds(self.config.agent_location):
+            raise ValueError("config agent location outside of map bounds")
+        return self.initial_id
+
+    def next_state_id(
+        self, current_state_id: int, action: Action
+    ) -> tuple[int, float]:
+        """Compute the next state and reward directly from the state id.
+
+        Equivalent to `next` without creating any state instances.
+
+        Args:
+            current_state_id (int): the state that the action is
+                performed in
+            action (Action): the action the agent has chosen
+
+        Returns:
+            tuple[int, float]: the resulting state after the action has been
+            performed and the reward from this action
+        """
+        encoder = self.encoder
+        x_pos, y_pos, goal_mask = encoder.decode(current_state_id)
+
+        goal_bit = encoder.goal_bits[y_pos * encoder.width + x_pos]
+        got_goal = bool(goal_mask & goal_bit)
+        if got_goal:
+            goal_mask &= ~goal_bit
+
+            if not goal_mask:
+                # Terminal state all goals have been collected, loop to
+                # beginning to make task continuous
+                return self.initial_state_id(), 10
+
+        dir_x, dir_y = self.grid_world.action_direction[action]
+        next_x = x_pos + dir_x
+        next_y = y_pos + dir_y
+        if not (0 <= next_x < encoder.width and 0 <= next_y < encoder.height):
+            return encoder.encode(x_pos, y_pos, goal_mask), -1
+
+        reward = 10 if got_goal else -1
+
+        return encoder.encode(next_x, next_y, goal_mask), reward
@@ -0,0 +1,186 @@
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ..state.state_instance import StateInstance
+from .actions import Action
+from .base_dynamics import BaseDynamics
+from .shared_transition_tables import SharedTransitionTables
+
+transition_table_type = np.ndarray[Any, np.dtype[np.int64]]
+reward_table_type = np.ndarray[Any, np.dtype[np.float64]]
+
+unknown_state = -1
+
+
+class CompiledDynamics(BaseDynamics):
+    """Deterministic dynamics with every transition precomputed.
+
+    Wraps another dynamics, on the first use the states reachable from the
+    initial state are explored once and each transition is stored in a pair of
+    `(state, action)` arrays. Computing the next state is then two array reads.
+    """
+
+    def __init__(self, dynamics: BaseDynamics) -> None:
+        """Initialise the compiled dynamics.
+
+        Args:
+            dynamics (BaseDynamics): the deterministic dynamics to compile.
+
+        Raises:
+            ValueError: if the dynamics provided are stochastic.
+        """
+        if dynamics.is_stochastic():
+            raise ValueError("only deterministic dynamics can be compiled")
+
+        super().__init__(dynamics.config)
+        self.dynamics = dynamics
+        self.state_pool = dynamics.state_pool
+        self.grid_world = dynamics.grid_world
+
+        self.next_states: transition_table_type = np.empty(
+            (0, len(Action)), dtype=np.int64
+        )
+        self.rewards: reward_table_type = np.empty(
+            (0, len(Action)), dtype=np.float64
+        )
+        self.initial_id = unknown_state
+
+    def is_stochastic(self) -> bool:
+        """Determine weather the dynamics behave stochastically.
+
+        Returns:
+            bool: false, only deterministic dynamics can be compiled
+        """
+        return False
+
+    def cache_key(self) -> Optional[str]:
+        """Describe everything that determines the transitions of the dynamics.
+
+        Returns:
+            Optional[str]: the description of the wrapped dynamics.
+        """
+        return self.dynamics.cache_key()
+
+    def state_count_upper_bound(self) -> int:
+        """Get an upper bound on the number of states.
+
+        Returns:
+            int: the bound of the wrapped dynamics.
+        """
+        return self.dynamics.state_count_upper_bound()
+
+    def initial_state(self) -> StateInstance:
+        """Provide the initial state of this environment.
+
+        Returns:
+            StateInstance: the starting state of the wrapped dynamics.
+        """
+        return self.dynamics.initial_state()
+
+    def next(
+        self, current_state: StateInstance, action: Action
+    ) -> tuple[StateInstance, float]:
+        """Compute the next state and reward with the wrapped dynamics.
+
+        Args:
+            current_state (StateInstance): the state that the action is
+                performed in
+            action (Action): the action the agent has chosen
+
+        Returns:
+            tuple[StateInstance, float]: the resulting state after the action
+            has been performed and the reward from this action
+        """
+        return self.dynamics.next(current_state, action)
+
+    def initial_state_id(self) -> int:
+        """Provide the initial state id of this environment.
+
+        Returns:
+            int: the starting state id.
+        """
+        if self.initial_id == unknown_state:
+            self.compile()
+        return self.initial_id
+
+    def next_state_id(
+        self, current_state_id: int, action: Action
+    ) -> tuple[int, float]:
+        """Look up the next state and reward.
+
+        States that were not reachable when compiling, or any state before the
+        dynamics have been compiled, are passed to the wrapped dynamics.
+
+        Args:
+            current_state_id (int): the state that the action is
+                performed in
+            action (Action): the action the agent has chosen
+
+        Returns:
+            tuple[int, float]: the resulting state after the action has been
+            performed and the reward from this action
+        """
+        next_states = self.next_states
+        if current_state_id < next_states.shape[0]:
+            next_state = next_states[current_state_id, action]
+            if next_state != unknown_state:
+                reward = self.rewards[current_state_id, action]
+                return int(next_state), float(reward)
+        return self.dynamics.next_state_id(current_state_id, action)
+
+    def get_transition_tables(
+        self,
+    ) -> Tuple[transition_table_type, reward_table_type]:
+        """Get the compiled transitions, compiling them if necessary.
+
+        Returns:
+            Tuple[transition_table_type, reward_table_type]: the next state and
+            the reward for each state and action. Unreachable states have a
+            next state of -1.
+        """
+        if self.initial_id == unknown_state:
+            self.compile()
+        return self.next_states, self.rewards
+
+    def compile(self) -> None:
+        """Explore every reachable state and store its transitions.
+
+        if another process has published the tables of equivalent dynamics
+        the shared tables are used instead, these are read only.
+        """
+        published = SharedTransitionTables.lookup(self.cache_key())
+        if published is not None:
+            self.initial_id, self.next_states, self.rewards = published
+            return
+
+        dynamics = self.dynamics
+        initial_id = dynamics.initial_state_id()
+        frontier: Deque[int] = deque([initial_id])
+        seen_states: Set[int] = {initial_id}
+        transitions: Dict[int, List[Tuple[int, float]]] = {}
+
+        while frontier:
+            state = frontier.popleft()
+            state_transitions = [
+                dynamics.next_state_id(state, action) for action in Action
+            ]
+            transitions[state] = state_transitions
+            for next_state, _ in state_transitions:
+                if next_state not in seen_states:
+                    seen_states.add(next_state)
+                    frontier.append(next_state)
+
+        state_count = max(seen_states) + 1
+        next_states = np.full(
+            (state_count, len(Action)), unknown_state, dtype=np.int64
+        )
+        rewards = np.zeros((state_count, len(Action)), dtype=np.float64)
+        for state, state_transitions in transitions.items():
+            next_states[state] = [next_id for next_id, _ in state_transitions]
+            rewards[state] = [reward for _, reward in state_transitions]
+
+        self.next_states = next_states
+        self.rewards = rewards
+        self.initial_id = initial_id
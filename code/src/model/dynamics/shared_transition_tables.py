@@ -0,0 +1,162 @@
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+shared_array_type = np.ndarray[Any, np.dtype[Any]]
+# the initial state id, then the next state and reward of each state and action
+transition_tables_type = Tuple[int, shared_array_type, shared_array_type]
+
+
+@dataclass(frozen=True, slots=True)
+class SharedArray(object):
+    """Describes an array stored in a block of shared memory."""
+
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+    def attach(self) -> Tuple[SharedMemory, shared_array_type]:
+        """Map the array into this process without copying it.
+
+        Returns:
+            Tuple[SharedMemory, shared_array_type]: the block of memory, which
+            must be kept open while the array is used, and the read only array.
+        """
+        memory = SharedMemory(self.name)
+        array: shared_array_type = np.ndarray(
+            self.shape, self.dtype, buffer=memory.buf
+        )
+        array.flags.writeable = False
+        return memory, array
+
+
+@dataclass(frozen=True, slots=True)
+class SharedTransitionHandle(object):
+    """Describes the transition tables of one dynamics in shared memory.
+
+    Handles are small so they are cheap to send to other processes.
+    """
+
+    cache_key: str
+    initial_id: int
+    next_states: SharedArray
+    rewards: SharedArray
+
+
+class SharedTransitionTables(object):
+    """Publishes compiled transition tables to other processes.
+
+    The process that publishes the tables owns the shared memory. Other
+    processes attach to the handles, after which compiled dynamics described
+    by the same key use the shared tables rather than exploring the states
+    themselves.
+    """
+
+    # tables attached in this process by the key of their dynamics
+    attached: Dict[str, transition_tables_type] = {}
+    # attached blocks must stay open as long as their arrays are used
+    attached_memory: List[SharedMemory] = []
+
+    def __init__(self) -> None:
+        """Initialise the publisher without any tables."""
+        self.handles: List[SharedTransitionHandle] = []
+        self.memory: List[SharedMemory] = []
+
+    def publish(
+        self,
+        cache_key: str,
+        initial_id: int,
+        next_states: shared_array_type,
+        rewards: shared_array_type,
+    ) -> SharedTransitionHandle:
+        """Copy a dynamics' transition tables into shared memory.
+
+        Args:
+            cache_key (str): the description of the dynamics.
+            initial_id (int): the initial state id of the dynamics.
+            next_states (shared_array_type): the next state of each state and
+                action.
+            rewards (shared_array_type): the reward of each state and action.
+
+        Returns:
+            SharedTransitionHandle: the handle other processes attach to.
+        """
+        handle = SharedTransitionHandle(
+            cache_key,
+            initial_id,
+            self.__share(next_states),
+            self.__share(rewards),
+        )
+        self.handles.append(handle)
+        return handle
+
+    def close(self) -> None:
+        """Release the shared memory.
+
+        processes that have already attached keep their mapping.
+        """
+        for memory in self.memory:
+            memory.close()
+            memory.unlink()
+        self.memory = []
+        self.handles = []
+
+    @classmethod
+    def attach(cls, handles: Sequence[SharedTransitionHandle]) -> None:
+        """Attach to published tables so that this process can use them.
+
+        Tables that have already been released are skipped, those dynamics
+        are compiled as normal.
+
+        Args:
+            handles (Sequence[SharedTransitionHandle]): the published tables.
+        """
+        for handle in handles:
+            try:
+                next_memory, next_states = handle.next_states.attach()
+                reward_memory, rewards = handle.rewards.attach()
+            except FileNotFoundError:
+                continue
+            cls.attached_memory.extend((next_memory, reward_memory))
+            cls.attached[handle.cache_key] = (
+                handle.initial_id,
+                next_states,
+                rewards,
+            )
+
+    @classmethod
+    def lookup(
+        cls, cache_key: Optional[str]
+    ) -> Optional[transition_tables_type]:
+        """Find the attached tables of a dynamics.
+
+        Args:
+            cache_key (Optional[str]): the description of the dynamics.
+
+        Returns:
+            Optional[transition_tables_type]: the initial state id, next state
+            and reward tables, none if they have not been attached.
+        """
+        if cache_key is None:
+            return None
+        return cls.attached.get(cache_key)
+
+    def __share(self, array: shared_array_type) -> SharedArray:
+        """Copy an array into a new block of shared memory.
+
+        Args:
+            array (shared_array_type): the array to copy.
+
+        Returns:
+            SharedArray: the description of the shared copy.
+        """
+        # blocks can not be empty
+        memory = SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.memory.append(memory)
+        shared: shared_array_type = np.ndarray(
+            array.shape, array.dtype, buffer=memory.buf
+        )
+        shared[...] = array
+        return SharedArray(memory.name, array.shape, array.dtype.str)
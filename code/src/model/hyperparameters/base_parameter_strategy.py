@@ -16,6 +16,9 @@ class HyperParameter(Enum):
     mf_error_sensitivity = 9
     mf_bpi_ensemble_size = 10
     mf_exploration_parameter = 11
+    sweep_mode = 12
+    convergence_check = 13
+    max_sweeps = 14
 
 
 class BaseHyperParameterStrategy(object):
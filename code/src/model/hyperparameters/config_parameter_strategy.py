@@ -47,6 +47,11 @@ class ParameterConfigStrategy(BaseHyperParameterStrategy):
                 value_iteration_config.stopping_epsilon
             ),
             HyperParameter.sample_count: value_iteration_config.sample_count,
+            HyperParameter.sweep_mode: value_iteration_config.sweep_mode.value,
+            HyperParameter.convergence_check: (
+                value_iteration_config.convergence_check.value
+            ),
+            HyperParameter.max_sweeps: value_iteration_config.max_sweeps,
             HyperParameter.mf_error_sensitivity: (
                 q_learning_config.mf_bpi.error_sensitivity
             ),
@@ -1,8 +1,12 @@
-from multiprocessing.managers import ValueProxy
+from typing import List, Optional, Sequence
 
 from src.model.hyperparameters.base_parameter_strategy import (
     BaseHyperParameterStrategy,
 )
+from src.model.hyperparameters.shared_flag import running_flag_type
+from src.model.learning_system.learning_instance.compiled_learning_instance import (  # noqa: E501
+    CompiledLearningInstance,
+)
 from src.model.learning_system.learning_instance.learning_instance import (
     LearningInstance,
 )
@@ -20,13 +24,15 @@ class ParameterEvaluator(object):
 
     runs = 3
     iterations_per_run = 5000
+    # simulations are long enough to benefit from precomputed transitions
+    compile_dynamics = True
 
     @classmethod
     def evaluate_reward(
         cls,
         options: TopEntitiesOptions,
         hyper_parameters: BaseHyperParameterStrategy,
-        running: ValueProxy[bool],
+        running: running_flag_type,
     ) -> float:
         """Evaluate the reward of a given configuration.
 
@@ -37,28 +43,87 @@ class ParameterEvaluator(object):
             options (TopEntitiesOptions): The major non-tunable configuration.
             hyper_parameters (BaseHyperParameterStrategy): the hyper parameters
                 to use.
-            running (ValueProxy[bool]): a value to determine early stopping.
+            running (running_flag_type): a value to determine early stopping.
 
         Returns:
             float: The average total reward for a given configuration.
         """
-        total_reward = float("inf")
+        return cls.evaluate_rewards(options, [hyper_parameters], running)[0]
 
-        for _ in range(cls.runs):
-            if not running.get():
-                return -float("inf")
-            total_reward = min(
-                cls.single_run(options, hyper_parameters).total_reward,
-                total_reward,
+    @classmethod
+    def evaluate_rewards(
+        cls,
+        options: TopEntitiesOptions,
+        hyper_parameters: Sequence[BaseHyperParameterStrategy],
+        running: running_flag_type,
+        iterations: Optional[int] = None,
+    ) -> List[float]:
+        """Evaluate the reward of several configurations.
+
+        when the compiled kernel supports the options every run of every
+        configuration is simulated with a single call to `batch_run`.
+
+        Args:
+            options (TopEntitiesOptions): The major non-tunable configuration.
+            hyper_parameters (Sequence[BaseHyperParameterStrategy]): the hyper
+                parameters of each configuration.
+            running (running_flag_type): a value to determine early stopping.
+            iterations (Optional[int]): the length of each run. Defaults to
+                `iterations_per_run`.
+
+        Returns:
+            List[float]: The worst total reward of each configuration.
+        """
+        if not cls.is_compiled(options):
+            return [
+                cls.__evaluate_sequentially(
+                    options, parameters, running, iterations
+                )
+                for parameters in hyper_parameters
+            ]
+
+        if not running.get():
+            return [-float("inf")] * len(hyper_parameters)
+
+        records = cls.batch_run(
+            options,
+            [
+                parameters
+                for parameters in hyper_parameters
+                for _ in range(cls.runs)
+            ],
+            iterations,
+        )
+        return [
+            min(
+                record.total_reward
+                for record in records[start : start + cls.runs]
             )
+            for start in range(0, len(records), cls.runs)
+        ]
 
-        return total_reward
+    @classmethod
+    def is_compiled(cls, options: TopEntitiesOptions) -> bool:
+        """Determine weather runs of these options use the compiled kernel.
+
+        Args:
+            options (TopEntitiesOptions): the options to check.
+
+        Returns:
+            bool: true if dynamics are compiled and the kernel supports the
+            options.
+        """
+        return cls.compile_dynamics and CompiledLearningInstance.supports(
+            options
+        )
 
     @classmethod
     def single_run(
         cls,
         options: TopEntitiesOptions,
         hyper_parameters: BaseHyperParameterStrategy,
+        iterations: Optional[int] = None,
+        seed: Optional[int] = None,
     ) -> StatisticsRecord:
         """Perform a single simulated run.
 
@@ -66,14 +131,96 @@ class ParameterEvaluator(object):
             options (TopEntitiesOptions): the top options for this run
             hyper_parameters (BaseHyperParameterStrategy): the parameters to
                 use.
+            iterations (Optional[int]): the length of the run. Defaults to
+                `iterations_per_run`.
+            seed (Optional[int]): seed for the compiled simulation's
+                exploration. Defaults to None.
 
         Returns:
             StatisticsRecord: the statistics from this run.
         """
-        entities = EntityFactory.create_entities(options, hyper_parameters)
+        if iterations is None:
+            iterations = cls.iterations_per_run
+        if cls.is_compiled(options):
+            return CompiledLearningInstance(
+                options, hyper_parameters, seed
+            ).run(iterations)
+
+        entities = EntityFactory.create_entities(
+            options, hyper_parameters, cls.compile_dynamics
+        )
 
         learning_instance = LearningInstance(entities)
 
-        for _ in range(cls.iterations_per_run):
+        for _ in range(iterations):
             learning_instance.perform_action()
         return entities.statistics.get_statistics()
+
+    @classmethod
+    def batch_run(
+        cls,
+        options: TopEntitiesOptions,
+        hyper_parameters: Sequence[BaseHyperParameterStrategy],
+        iterations: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> List[StatisticsRecord]:
+        """Perform many independent simulated runs.
+
+        the runs are performed one after another, in the compiled kernel when
+        it supports the options.
+
+        Args:
+            options (TopEntitiesOptions): the top options for every run
+            hyper_parameters (Sequence[BaseHyperParameterStrategy]): the
+                parameters to use in each run.
+            iterations (Optional[int]): the length of each run. Defaults to
+                `iterations_per_run`.
+            seed (Optional[int]): seed for the exploration, each compiled run
+                is seeded with its offset from this seed. Defaults to None.
+
+        Returns:
+            List[StatisticsRecord]: the statistics from each run.
+        """
+        return [
+            cls.single_run(
+                options,
+                parameters,
+                iterations,
+                None if seed is None else seed + run,
+            )
+            for run, parameters in enumerate(hyper_parameters)
+        ]
+
+    @classmethod
+    def __evaluate_sequentially(
+        cls,
+        options: TopEntitiesOptions,
+        hyper_parameters: BaseHyperParameterStrategy,
+        running: running_flag_type,
+        iterations: Optional[int],
+    ) -> float:
+        """Evaluate one configuration with a separate simulation per run.
+
+        Args:
+            options (TopEntitiesOptions): The major non-tunable configuration.
+            hyper_parameters (BaseHyperParameterStrategy): the hyper parameters
+                to use.
+            running (running_flag_type): a value to determine early stopping.
+            iterations (Optional[int]): the length of each run.
+
+        Returns:
+            float: The worst total reward over the runs.
+        """
+        total_reward = float("inf")
+
+        for _ in range(cls.runs):
+            if not running.get():
+                return -float("inf")
+            total_reward = min(
+                cls.single_run(
+                    options, hyper_parameters, iterations
+                ).total_reward,
+                total_reward,
+            )
+
+        return total_reward
@@ -1,9 +1,19 @@
-from multiprocessing import Manager, Process
-from typing import Dict, Optional
+import random
+from multiprocessing import Lock, Process, Queue
+from queue import Empty
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
 
 from src.model.agents.q_learning.exploration_strategies.options import (
     ExplorationStrategyOptions,
 )
+from src.model.dynamics.collection_dynamics import CollectionDynamics
+from src.model.dynamics.compiled_dynamics import CompiledDynamics
+from src.model.dynamics.shared_transition_tables import (
+    SharedTransitionHandle,
+    SharedTransitionTables,
+)
 from src.model.hyperparameters.base_parameter_strategy import HyperParameter
 from src.model.hyperparameters.config_parameter_strategy import (
     ParameterConfigStrategy,
@@ -15,8 +25,25 @@ from src.model.hyperparameters.random_search.random_parameter_strategy import (
 from src.model.hyperparameters.random_search.random_search_data import (
     RandomSearchState,
     SearchArea,
+    SearchUpdate,
+)
+from src.model.hyperparameters.random_search.search_history import (
+    SearchHistory,
+)
+from src.model.hyperparameters.random_search.successive_halving import (
+    SuccessiveHalving,
+)
+from src.model.hyperparameters.random_search.tree_parzen_estimator import (
+    TreeParzenEstimator,
 )
+from src.model.hyperparameters.random_search.tree_parzen_parameter_strategy import (  # noqa: E501
+    TreeParzenParameterStrategy,
+)
+from src.model.hyperparameters.result_store import ResultStore
+from src.model.hyperparameters.shared_flag import SharedFlag
 from src.model.hyperparameters.tuning_information import TuningInformation
+from src.model.lazy_jit import LazyJit
+from src.model.learning_system.top_level_entities.factory import EntityFactory
 from src.model.learning_system.top_level_entities.options import (
     AgentOptions,
     DynamicsOptions,
@@ -25,15 +52,86 @@ from src.model.learning_system.top_level_entities.options import (
 
 
 class RandomSearch(object):
-    """Class for performing a random search."""
+    """Class for performing a random search.
+
+    The search processes send their results over a queue, this process owns
+    the state and records any results waiting in the queue whenever the
+    progress is requested.
+
+    Every search process records its results in a shared history. Each new
+    search proposes configurations from a model fitted to the history so far,
+    so no process waits for the others to finish their searches.
+
+    Results are written to the result store in batches as they are recorded,
+    so a new search continues from the progress of previous sessions.
+    """
 
     worker_count = 4
+    # planning agent used to find the optimal rewards, converges quickest
+    optimal_agent = AgentOptions.policy_iteration
+    # configurations fully evaluated together, the compiled kernel makes this
+    # cheap
+    samples_per_batch = 8
+    # each search starts with `samples_per_batch * halving_rate ** (rungs - 1)`
+    # short runs, promoting the best third to three times longer runs
+    halving_rate = 3
+    halving_rungs = 3
+    # propose configurations from the results so far rather than at random
+    model_based_proposals = True
+    # keeps results between sessions, none to keep them only in memory. set
+    # by the entry points so other uses never touch the stored results
+    result_store: Optional[ResultStore] = None
+    # seeds the proposals of each search process, none for unseeded searches
+    seed: Optional[int] = None
+
+    def __init__(
+        self, search_options: Optional[Sequence[TopEntitiesOptions]] = None
+    ) -> None:
+        """Initialise random search runner.
 
-    def __init__(self) -> None:
-        """Initialise random search runner."""
-        manager = Manager()
+        Args:
+            search_options (Optional[Sequence[TopEntitiesOptions]]): the areas
+                to search. Defaults to q learning on each dynamics with each
+                exploration strategy.
+        """
+        self.search_options = list(search_options or self.default_options())
+
+        initial_params: Dict[HyperParameter, Optional[float]] = {
+            tunable_parameter: None
+            for tunable_parameter in TuningInformation.tunable_parameters()
+        }
 
-        self.search_options = [
+        initial_data = RandomSearchState(
+            None,
+            {
+                options: SearchArea(options, initial_params, None, 0)
+                for options in self.search_options
+            },
+            searching=False,
+        )
+        self.state = initial_data
+        self.state_lock = Lock()
+        # updates sent by the search processes, recorded by this process
+        self.results = Queue()
+
+        self.running = SharedFlag(initial_value=False)
+        # the results of every search process, used to propose configurations
+        self.history = SearchHistory(len(self.search_options))
+
+        if self.result_store is not None:
+            self.__restore_progress(self.result_store)
+
+        # transition tables shared with the search processes while searching
+        self.shared_tables: Optional[SharedTransitionTables] = None
+
+    @classmethod
+    def default_options(cls) -> List[TopEntitiesOptions]:
+        """Get the areas searched by default.
+
+        Returns:
+            List[TopEntitiesOptions]: the default search areas.
+        """
+        return [
             TopEntitiesOptions(
                 AgentOptions.q_learning,
                 DynamicsOptions.cliff,
@@ -56,25 +154,6 @@ class RandomSearch(object):
             ),
         ]
 
-        initial_params: Dict[HyperParameter, Optional[float]] = {
-            tunable_parameter: None
-            for tunable_parameter in TuningInformation.tunable_parameters()
-        }
-
-        initial_data = RandomSearchState(
-            None,
-            {
-                options: SearchArea(options, initial_params, None, 0)
-                for options in self.search_options
-            },
-            searching=False,
-        )
-        self.state = manager.Value(RandomSearchState, initial_data)
-
-        self.state_lock = manager.Lock()
-
-        self.running = manager.Value(bool, value=False)
-
     def get_progress(self) -> RandomSearchState:
         """Get the current state of the search if there is one.
 
@@ -82,7 +161,19 @@ class RandomSearch(object):
             RandomSearchState: the current result of the search.
         """
         with self.state_lock:
-            return self.state.value
+            updates: List[SearchUpdate] = []
+            while True:
+                try:
+                    updates.append(self.results.get_nowait())
+                except Empty:
+                    break
+            for update in updates:
+                self.state = self.state.apply_update(update)
+            if updates and self.result_store is not None:
+                self.result_store.record_updates(
+                    updates, CollectionDynamics.location_seed.value
+                )
+            return self.state
 
     def start_search(self):
         """Start the searching process."""
@@ -90,16 +181,22 @@ class RandomSearch(object):
             if self.running.get():
                 return
             self.running.set(True)
-            self.state.set(self.state.get().set_searching(True))
+            self.state = self.state.set_searching(True)
 
+        # every search process simulates with numba, import it once for all
+        LazyJit.preload()
+        handles = self.__publish_transition_tables()
         optimal_runner = Process(
-            target=self.run_optimal_search, name="optimal rewards search"
+            target=self.run_optimal_search,
+            args=(handles,),
+            name="optimal rewards search",
         )
         optimal_runner.start()
 
         for runner_id in range(self.worker_count):
             search_runner = Process(
                 target=self.run_search_inner,
+                args=(handles, runner_id),
                 name=f"random search runner {runner_id}",
             )
             search_runner.start()
@@ -108,19 +205,28 @@ class RandomSearch(object):
         """Stop the searching process."""
         self.running.set(False)
         with self.state_lock:
-            self.state.set(self.state.get().set_searching(False))
+            self.state = self.state.set_searching(False)
+        if self.shared_tables is not None:
+            self.shared_tables.close()
+            self.shared_tables = None
 
-    def run_optimal_search(self):
+    def run_optimal_search(self, handles: Sequence[SharedTransitionHandle]):
         """Run a search for the optimal reward under the given conditions.
 
-        This is done with value iteration.
+        This is done with a planning agent such as policy iteration.
+
+        Args:
+            handles (Sequence[SharedTransitionHandle]): the transition tables
+                published by the parent process.
         """
+        SharedTransitionTables.attach(handles)
+        self.__seed_process(self.worker_count)
         optimal_rewards: Dict[DynamicsOptions, float] = {}
         for dynamics in DynamicsOptions:
             if not self.running.get():
                 return
             options = TopEntitiesOptions(
-                AgentOptions.value_iteration_optimised,
+                self.optimal_agent,
                 dynamics,
                 ExplorationStrategyOptions.not_applicable,
             )
@@ -131,33 +237,113 @@ class RandomSearch(object):
         if not self.running.get():
             return
 
-        with self.state_lock:
-            state = self.state.get()
-            self.state.set(state.set_optimal_rewards(optimal_rewards))
+        self.results.put(SearchUpdate(optimal_rewards=optimal_rewards))
 
-    def run_search_inner(self):
+    def run_search_inner(
+        self, handles: Sequence[SharedTransitionHandle], runner_id: int = 0
+    ):
         """Run the actual search.
 
         this method is used internally please use `start_search` to actually
         start the search from another class.
+
+        Args:
+            handles (Sequence[SharedTransitionHandle]): the transition tables
+                published by the parent process.
+            runner_id (int): the index of this search process. Defaults to 0.
         """
+        SharedTransitionTables.attach(handles)
+        self.__seed_process(runner_id)
+        # only results sent after the search is stopped can be left unsent
+        self.results.cancel_join_thread()
+        scheduler = SuccessiveHalving(
+            self.samples_per_batch, self.halving_rate, self.halving_rungs
+        )
         while self.running.get():
-            for options in self.search_options:
+            for area, options in enumerate(self.search_options):
                 if not self.running.get():
                     return
-                hyper_parameters = RandomParameterStrategy()
-
-                total_reward = ParameterEvaluator.evaluate_reward(
-                    options, hyper_parameters, self.running
+                results = scheduler.search(
+                    options,
+                    self.running,
+                    lambda count: self.propose_parameters(area, count),
                 )
-
-                if not self.running.get():
+                if results is None:
                     return
+                self.history.record(area, results)
+                self.results.put(SearchUpdate(results))
+
+    def propose_parameters(
+        self, area: int, count: int
+    ) -> List[RandomParameterStrategy]:
+        """Propose configurations to search.
+
+        Args:
+            area (int): the index of the search area.
+            count (int): the number of configurations.
+
+        Returns:
+            List[RandomParameterStrategy]: the configurations.
+        """
+        if not self.model_based_proposals:
+            return SuccessiveHalving.random_proposals(count)
+        estimator = TreeParzenEstimator(
+            *self.history.observations(area), seed=random.getrandbits(32)
+        )
+        return [TreeParzenParameterStrategy(estimator) for _ in range(count)]
+
+    def __publish_transition_tables(self) -> Sequence[SharedTransitionHandle]:
+        """Compile each searched dynamics once and share its tables.
+
+        every search process would otherwise explore the same states and hold
+        its own copy of the tables.
 
-                with self.state_lock:
-                    state = self.state.get()
-                    self.state.set(
-                        state.record_result(
-                            options, hyper_parameters, total_reward
-                        )
+        Returns:
+            Sequence[SharedTransitionHandle]: the handles of the tables.
+        """
+        if self.shared_tables is not None:
+            return self.shared_tables.handles
+
+        self.shared_tables = SharedTransitionTables()
+        for dynamics_option in DynamicsOptions:
+            dynamics = CompiledDynamics(
+                EntityFactory.create_dynamics(
+                    TopEntitiesOptions(
+                        AgentOptions.q_learning,
+                        dynamics_option,
+                        ExplorationStrategyOptions.not_applicable,
                     )
+                )
+            )
+            cache_key = dynamics.cache_key()
+            if cache_key is None:
+                continue
+            next_states, rewards = dynamics.get_transition_tables()
+            self.shared_tables.publish(
+                cache_key, dynamics.initial_state_id(), next_states, rewards
+            )
+        return self.shared_tables.handles
+
+    def __restore_progress(self, result_store: ResultStore) -> None:
+        """Continue from the stored progress of previous searches.
+
+        Args:
+            result_store (ResultStore): the store to restore from.
+        """
+        self.state = result_store.load_search_state(self.state)
+        for area, options in enumerate(self.search_options):
+            self.history.record(
+                area,
+                result_store.recent_results(options, SearchHistory.capacity),
+            )
+
+    def __seed_process(self, offset: int) -> None:
+        """Seed a search process so processes do not share a random sequence.
+
+        Args:
+            offset (int): the offset of this process's seed from `seed`.
+        """
+        if self.seed is None:
+            return
+        random.seed(self.seed + offset)
+        np.random.seed(self.seed + offset)
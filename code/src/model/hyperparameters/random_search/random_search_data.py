@@ -1,5 +1,5 @@
 from dataclasses import dataclass, replace
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 from src.model.hyperparameters.base_parameter_strategy import HyperParameter
 from src.model.hyperparameters.random_search.random_parameter_strategy import (
@@ -21,24 +21,31 @@ class SearchArea(object):
     combinations_tried: int
 
     def record_result(
-        self, hyper_parameters: RandomParameterStrategy, recorded_value: float
+        self,
+        parameters: Dict[HyperParameter, Optional[float]],
+        recorded_value: Optional[float],
     ) -> "SearchArea":
         """Get the new search area state after recording a new value.
 
         Args:
-            hyper_parameters (RandomParameterStrategy): the parameters that
-                were tested.
-            recorded_value (float): the value recorded by these parameters.
+            parameters (Dict[HyperParameter, Optional[float]]): the parameters
+                that were tested.
+            recorded_value (Optional[float]): the value recorded by these
+                parameters, none if they were discarded before being fully
+                evaluated.
 
         Returns:
             SearchArea: the new search area with these changes.
         """
         combinations_tried = self.combinations_tried + 1
 
+        if recorded_value is None:
+            return replace(self, combinations_tried=combinations_tried)
+
         if self.best_value is None or recorded_value > self.best_value:
             return SearchArea(
                 self.options,
-                hyper_parameters.get_parameters(),
+                parameters,
                 recorded_value,
                 combinations_tried,
             )
@@ -51,6 +58,29 @@ class SearchArea(object):
         )
 
 
+@dataclass(frozen=True, slots=True)
+class SearchResult(object):
+    """The value recorded by one combination of parameters.
+
+    the value is none for combinations discarded before being fully evaluated,
+    these only count towards the combinations tried. iterations is the length
+    of the runs that last evaluated the combination.
+    """
+
+    options: TopEntitiesOptions
+    parameters: Dict[HyperParameter, Optional[float]]
+    recorded_value: Optional[float]
+    iterations: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class SearchUpdate(object):
+    """Results sent from a search process to the process owning the state."""
+
+    results: Tuple[SearchResult, ...] = ()
+    optimal_rewards: Optional[Dict[DynamicsOptions, float]] = None
+
+
 @dataclass(frozen=True, slots=True)
 class RandomSearchState(object):
     """Class to contain the state of a random search."""
@@ -76,12 +106,39 @@ class RandomSearchState(object):
         Returns:
             RandomSearchData: the new state after this result.
         """
-        search_areas = self.search_areas.copy()
-        new_search_area = search_areas[options].record_result(
-            hyper_parameters, recorded_value
+        return self.apply_update(
+            SearchUpdate(
+                (
+                    SearchResult(
+                        options,
+                        hyper_parameters.get_parameters(),
+                        recorded_value,
+                    ),
+                )
+            )
         )
-        search_areas[options] = new_search_area
-        return replace(self, search_areas=search_areas)
+
+    def apply_update(self, update: SearchUpdate) -> "RandomSearchState":
+        """Get the new state after recording the results of an update.
+
+        Args:
+            update (SearchUpdate): the results from a search process.
+
+        Returns:
+            RandomSearchState: the new state including these results.
+        """
+        state = self
+        if update.optimal_rewards is not None:
+            state = state.set_optimal_rewards(update.optimal_rewards)
+        if not update.results:
+            return state
+
+        search_areas = state.search_areas.copy()
+        for result in update.results:
+            search_areas[result.options] = search_areas[
+                result.options
+            ].record_result(result.parameters, result.recorded_value)
+        return replace(state, search_areas=search_areas)
 
     def set_searching(self, searching: bool) -> "RandomSearchState":
         """Set the searching property.
@@ -0,0 +1,110 @@
+from ctypes import c_double, c_int64
+from multiprocessing import Lock
+from multiprocessing.sharedctypes import RawArray
+from typing import Any, Sequence, Tuple
+
+import numpy as np
+
+from src.model.hyperparameters.random_search.random_search_data import (
+    SearchResult,
+)
+from src.model.hyperparameters.tuning_information import TuningInformation
+
+history_array = np.ndarray[Any, np.dtype[np.float64]]
+
+
+class SearchHistory(object):
+    """The results of every search process, kept in shared memory.
+
+    Each search area keeps its most recent `capacity` results. A result is
+    stored as the position of each tunable parameter through its range, not a
+    number for parameters that were not used, followed by its reward. The
+    history must be created before the search processes.
+    """
+
+    capacity = 2048
+
+    def __init__(self, area_count: int) -> None:
+        """Initialise an empty history.
+
+        Args:
+            area_count (int): the number of search areas.
+        """
+        self.parameters = list(TuningInformation.tunable_parameters())
+        self.row_width = len(self.parameters) + 1
+        self.rows = RawArray(
+            c_double, area_count * self.capacity * self.row_width
+        )
+        self.counts = RawArray(c_int64, area_count)
+        # held only while copying rows, never across a simulation
+        self.lock = Lock()
+
+    def record(self, area: int, results: Sequence[SearchResult]) -> None:
+        """Record the results of a search.
+
+        results discarded before being fully evaluated are recorded with the
+        lowest possible reward, they were worse than those promoted.
+
+        Args:
+            area (int): the index of the search area.
+            results (Sequence[SearchResult]): the results to record.
+        """
+        new_rows = np.empty((len(results), self.row_width))
+        for row, result in zip(new_rows, results):
+            row[:-1] = self.__positions(result)
+            row[-1] = (
+                -np.inf
+                if result.recorded_value is None
+                else result.recorded_value
+            )
+
+        with self.lock:
+            area_rows = self.__area_rows(area)
+            count = self.counts[area]
+            indices = np.arange(count, count + len(results)) % self.capacity
+            area_rows[indices] = new_rows
+            self.counts[area] = count + len(results)
+
+    def observations(self, area: int) -> Tuple[history_array, history_array]:
+        """Get a copy of the recorded results of a search area.
+
+        Args:
+            area (int): the index of the search area.
+
+        Returns:
+            Tuple[history_array, history_array]: the position of each
+            parameter in each result and the reward of each result.
+        """
+        with self.lock:
+            count = min(self.counts[area], self.capacity)
+            rows = self.__area_rows(area)[:count].copy()
+        return rows[:, :-1], rows[:, -1]
+
+    def __area_rows(self, area: int) -> history_array:
+        """Get the rows of a search area in the shared memory.
+
+        Args:
+            area (int): the index of the search area.
+
+        Returns:
+            history_array: a view of the area's rows.
+        """
+        rows = np.frombuffer(self.rows, dtype=np.float64)
+        return rows.reshape(-1, self.capacity, self.row_width)[area]
+
+    def __positions(self, result: SearchResult) -> history_array:
+        """Find the position of each parameter of a result.
+
+        Args:
+            result (SearchResult): the result to locate.
+
+        Returns:
+            history_array: the position through each parameter's range.
+        """
+        positions = np.full(len(self.parameters), np.nan)
+        for index, parameter in enumerate(self.parameters):
+            parameter_value = result.parameters.get(parameter)
+            if parameter_value is not None:
+                details = TuningInformation.get_parameter_details(parameter)
+                positions[index] = details.normalise_value(parameter_value)
+        return positions
@@ -0,0 +1,134 @@
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from src.model.hyperparameters.parameter_evaluator import ParameterEvaluator
+from src.model.hyperparameters.random_search.random_parameter_strategy import (
+    RandomParameterStrategy,
+)
+from src.model.hyperparameters.random_search.random_search_data import (
+    SearchResult,
+)
+from src.model.hyperparameters.shared_flag import running_flag_type
+from src.model.learning_system.top_level_entities.options import (
+    TopEntitiesOptions,
+)
+
+
+class SuccessiveHalving(object):
+    """Evaluates many configurations cheaply and promotes only the best.
+
+    Every configuration is first evaluated with short runs. After each rung
+    only the best `1 / halving_rate` of the configurations are evaluated again
+    with runs `halving_rate` times longer. The final rung uses the full
+    `ParameterEvaluator.iterations_per_run`, only these rewards are comparable
+    with other searches so only they are recorded as values.
+    """
+
+    @classmethod
+    def random_proposals(cls, count: int) -> List[RandomParameterStrategy]:
+        """Propose configurations uniformly at random.
+
+        Args:
+            count (int): the number of configurations.
+
+        Returns:
+            List[RandomParameterStrategy]: the configurations.
+        """
+        return [RandomParameterStrategy() for _ in range(count)]
+
+    def __init__(
+        self, final_count: int, halving_rate: int, rung_count: int
+    ) -> None:
+        """Initialise the scheduler.
+
+        Args:
+            final_count (int): the configurations fully evaluated per search.
+            halving_rate (int): how many times fewer configurations are
+                promoted to each rung.
+            rung_count (int): the number of rungs, one rung evaluates every
+                configuration fully.
+
+        Raises:
+            ValueError: if the rates or counts are not positive.
+        """
+        if min(final_count, halving_rate, rung_count) < 1:
+            raise ValueError("successive halving counts must be positive")
+        self.final_count = final_count
+        self.halving_rate = halving_rate
+        self.rung_count = rung_count
+
+    def rung_iterations(self) -> List[int]:
+        """Get the length of the runs in each rung.
+
+        Returns:
+            List[int]: the iterations of each run, the last rung is a full
+            length run.
+        """
+        full_length = ParameterEvaluator.iterations_per_run
+        return [
+            max(full_length // self.halving_rate ** (self.rung_count - rung), 1)
+            for rung in range(1, self.rung_count + 1)
+        ]
+
+    def candidate_count(self) -> int:
+        """Get the number of configurations evaluated in the first rung.
+
+        Returns:
+            int: the configurations evaluated per search.
+        """
+        return self.final_count * self.halving_rate ** (self.rung_count - 1)
+
+    def search(
+        self,
+        options: TopEntitiesOptions,
+        running: running_flag_type,
+        propose: Optional[
+            Callable[[int], List[RandomParameterStrategy]]
+        ] = None,
+    ) -> Optional[Tuple[SearchResult, ...]]:
+        """Evaluate new configurations.
+
+        Args:
+            options (TopEntitiesOptions): The major non-tunable configuration.
+            running (running_flag_type): a value to determine early stopping.
+            propose (Optional[Callable[[int], List[RandomParameterStrategy]]]):
+                proposes the given number of configurations. Defaults to
+                random configurations.
+
+        Returns:
+            Optional[Tuple[SearchResult, ...]]: a result for every
+            configuration, none if the search was stopped.
+        """
+        if propose is None:
+            propose = self.random_proposals
+        candidates = propose(self.candidate_count())
+        results: List[SearchResult] = []
+        for rung, iterations in enumerate(self.rung_iterations(), 1):
+            rewards = ParameterEvaluator.evaluate_rewards(
+                options, candidates, running, iterations
+            )
+            if not running.get():
+                return None
+
+            final_rung = rung == self.rung_count
+            promoted_count = 0
+            if not final_rung:
+                promoted_count = max(len(candidates) // self.halving_rate, 1)
+
+            ranking = np.argsort(rewards)[::-1]
+            for index in ranking[promoted_count:]:
+                # only full length rewards are comparable between searches
+                recorded_value = rewards[index] if final_rung else None
+                results.append(
+                    SearchResult(
+                        options,
+                        candidates[index].get_parameters(),
+                        recorded_value,
+                        iterations,
+                    )
+                )
+            candidates = [
+                candidates[index] for index in ranking[:promoted_count]
+            ]
+        return tuple(results)
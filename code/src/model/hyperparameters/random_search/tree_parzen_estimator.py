@@ -0,0 +1,139 @@
+from typing import Any, List, Optional
+
+import numpy as np
+
+unit_array = np.ndarray[Any, np.dtype[np.float64]]
+
+
+class TreeParzenEstimator(object):
+    """A surrogate model of which parameter values give high rewards.
+
+    The evaluated results are split into the best `good_fraction` and the rest,
+    a Parzen estimator is fitted to the positions of each. New positions are
+    drawn from the good estimator, keeping the candidate where the good
+    estimator is most likely relative to the bad estimator. Each parameter is
+    modelled independently through the position through its range, a
+    parameter without enough observations is left to be drawn at random.
+    """
+
+    good_fraction = 0.25
+    # observations of a parameter needed before it is modelled
+    startup_observations = 16
+    candidate_count = 24
+    min_bandwidth = 0.02
+
+    def __init__(
+        self,
+        positions: unit_array,
+        rewards: unit_array,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Fit the estimator to the observed results.
+
+        Args:
+            positions (unit_array): the position of each parameter through its
+                range in each result, not a number if unused.
+            rewards (unit_array): the reward of each result.
+            seed (Optional[int]): the seed of the proposals. Defaults to None.
+        """
+        self.generator = np.random.default_rng(seed)
+        self.good: List[Optional[unit_array]] = []
+        self.bad: List[Optional[unit_array]] = []
+        for dimension in positions.T:
+            used = ~np.isnan(dimension)
+            # discarded results have no reward, they can only be bad
+            evaluated = np.count_nonzero(np.isfinite(rewards[used]))
+            if evaluated < self.startup_observations:
+                self.good.append(None)
+                self.bad.append(None)
+                continue
+            ranking = np.argsort(-rewards[used], kind="stable")
+            ranked = dimension[used][ranking]
+            good_count = max(int(np.ceil(self.good_fraction * evaluated)), 1)
+            self.good.append(ranked[:good_count])
+            self.bad.append(ranked[good_count:])
+
+    def propose(self) -> List[Optional[float]]:
+        """Propose a position for each parameter.
+
+        Returns:
+            List[Optional[float]]: the proposed position through each
+            parameter's range, none for parameters that are not modelled.
+        """
+        return [
+            None if good is None else self.__propose_position(good, bad)
+            for good, bad in zip(self.good, self.bad)
+        ]
+
+    def __propose_position(self, good: unit_array, bad: unit_array) -> float:
+        """Propose a position from the good and bad observations.
+
+        Args:
+            good (unit_array): the positions of the best results.
+            bad (unit_array): the positions of the other results.
+
+        Returns:
+            float: the most promising of the candidate positions.
+        """
+        candidates = self.__sample(good)
+        improvement = self.__log_density(candidates, good) - self.__log_density(
+            candidates, bad
+        )
+        return float(candidates[np.argmax(improvement)])
+
+    def __sample(self, centres: unit_array) -> unit_array:
+        """Draw candidate positions from a Parzen estimator.
+
+        Args:
+            centres (unit_array): the observed positions of the estimator.
+
+        Returns:
+            unit_array: the candidate positions.
+        """
+        bandwidth = self.__bandwidth(centres)
+        # the uniform prior is one more component of the mixture
+        component = self.generator.integers(
+            len(centres) + 1, size=self.candidate_count
+        )
+        from_prior = component == len(centres)
+        noise = self.generator.normal(0, bandwidth, self.candidate_count)
+        candidates = centres[np.minimum(component, len(centres) - 1)] + noise
+        candidates[from_prior] = self.generator.random(
+            np.count_nonzero(from_prior)
+        )
+        return np.clip(candidates, 0, 1)
+
+    def __log_density(
+        self, candidates: unit_array, centres: unit_array
+    ) -> unit_array:
+        """Find the log density of a Parzen estimator at each candidate.
+
+        Args:
+            candidates (unit_array): the positions to evaluate.
+            centres (unit_array): the observed positions of the estimator.
+
+        Returns:
+            unit_array: the log density at each candidate.
+        """
+        if len(centres) == 0:
+            return np.zeros(len(candidates))
+        bandwidth = self.__bandwidth(centres)
+        distances = (candidates[:, np.newaxis] - centres) / bandwidth
+        kernels = np.exp(-0.5 * distances**2) / (
+            bandwidth * np.sqrt(2 * np.pi)
+        )
+        # the uniform prior has a density of one over the unit range
+        density = (kernels.sum(axis=1) + 1) / (len(centres) + 1)
+        return np.log(density)
+
+    def __bandwidth(self, centres: unit_array) -> float:
+        """Choose the width of each kernel with Scott's rule.
+
+        Args:
+            centres (unit_array): the observed positions of the estimator.
+
+        Returns:
+            float: the standard deviation of each kernel.
+        """
+        spread = np.std(centres) if len(centres) > 1 else 1
+        return max(spread * len(centres) ** -0.2, self.min_bandwidth)
@@ -0,0 +1,31 @@
+from src.model.hyperparameters.random_search.random_parameter_strategy import (
+    RandomParameterStrategy,
+)
+from src.model.hyperparameters.random_search.tree_parzen_estimator import (
+    TreeParzenEstimator,
+)
+from src.model.hyperparameters.tuning_information import TuningInformation
+
+
+class TreeParzenParameterStrategy(RandomParameterStrategy):
+    """Provides hyperparameter values proposed by a surrogate model.
+
+    parameters the model can not yet propose are drawn at random on demand.
+    """
+
+    def __init__(self, estimator: TreeParzenEstimator) -> None:
+        """Initialise the parameter manager with proposed values.
+
+        Args:
+            estimator (TreeParzenEstimator): the model to propose values.
+        """
+        super().__init__()
+        for parameter, position in zip(
+            TuningInformation.tunable_parameters(), estimator.propose()
+        ):
+            if position is None:
+                continue
+            details = TuningInformation.get_parameter_details(parameter)
+            self.parameter_values[parameter] = details.interpolate_value(
+                position
+            )
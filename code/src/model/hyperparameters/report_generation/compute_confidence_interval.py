@@ -1,10 +1,11 @@
 from typing import Tuple
 
 import numpy as np
-from numba import jit
 
+from src.model.lazy_jit import lazy_jit
 
-@jit(nopython=True, cache=True, fastmath=True)
+
+@lazy_jit(nopython=True, cache=True, fastmath=True)
 def compute_confidence_interval(
     rewards: np.ndarray, confidence_level: float, confidence_iterations: int
 ) -> Tuple[float, float, float]:
@@ -1,12 +1,18 @@
+from ctypes import c_int64
 from itertools import repeat
 from multiprocessing import Manager, Pool, Process
-from typing import Tuple
+from multiprocessing.pool import Pool as PoolType
+from multiprocessing.sharedctypes import RawArray, RawValue
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 
 from src.model.hyperparameters.base_parameter_strategy import HyperParameter
 from src.model.hyperparameters.parameter_evaluator import ParameterEvaluator
+from src.model.hyperparameters.result_store import ResultStore
+from src.model.hyperparameters.shared_flag import running_flag_type
 from src.model.hyperparameters.tuning_information import TuningInformation
+from src.model.lazy_jit import LazyJit
 
 from .compute_confidence_interval import compute_confidence_interval
 from .report_data import HyperParameterReport, ReportState
@@ -14,22 +20,62 @@ from .tuning_parameter_strategy import ParameterTuningStrategy
 
 
 class HyperParameterReportGenerator(object):
-    """Class for creating hyper parameter tuning reports."""
+    """Class for creating hyper parameter tuning reports.
+
+    The progress of a report is counted in shared memory, each sample has its
+    own counter of completed runs so workers never wait for each other. The
+    counters are combined when the state is requested and compared with the
+    runs scheduled so far, as adaptive sampling decides on more runs as it
+    goes.
+
+    Completed reports are kept in the result store, so they are only simulated
+    once.
+    """
 
     worker_count = 8
     iterations_per_worker = 1000
     samples = 100
+    # the most runs of any sample
     runs = 25
 
+    # only simulate more runs for samples whose reward is still uncertain
+    adaptive_sampling = True
+    initial_runs = 5
+    additional_runs = 5
+    # the target confidence interval width relative to the range of the means
+    target_width_ratio = 0.05
+    # samples near the optimum converge to a narrower width
+    optimum_width_ratio = 0.5
+
+    # seeds every simulation of a report, none for unseeded reports
+    seed: Optional[int] = None
+
+    # keeps reports between sessions, none to keep them only in memory. set
+    # by the entry points so other uses never load stale reports
+    result_store: Optional[ResultStore] = None
+
+    # the completed runs of each sample of the report, set in pool workers
+    sample_progress: Optional[Any] = None
+
     def __init__(self) -> None:
         """Initialise the report generator."""
         manager = Manager()
 
-        self.state = manager.Value(ReportState, ReportState(None, {}, {}))
+        stored_reports: Dict[HyperParameter, HyperParameterReport] = {}
+        if self.result_store is not None:
+            stored_reports = self.result_store.load_reports()
+        self.state = manager.Value(
+            ReportState, ReportState(None, {}, stored_reports)
+        )
         self.state_lock = manager.Lock()
 
         self.running = manager.Value(bool, value=True)
 
+        # the completed runs of each sample of the pending reports
+        self.progress_counters: Dict[HyperParameter, Any] = {}
+        # the runs of the pending reports scheduled so far
+        self.scheduled_runs: Dict[HyperParameter, Any] = {}
+
     def shutdown(self):
         """Abort any existing work, Stop child processes."""
         self.running.set(False)
@@ -41,7 +87,18 @@ class HyperParameterReportGenerator(object):
             ReportState: the current state of the reports.
         """
         with self.state_lock:
-            return self.state.value
+            state = self.state.value
+
+        for parameter, counters in list(self.progress_counters.items()):
+            if parameter not in state.pending_requests:
+                # the report is complete
+                self.progress_counters.pop(parameter)
+                self.scheduled_runs.pop(parameter, None)
+                continue
+            scheduled = self.scheduled_runs[parameter].value
+            progress = sum(counters) / scheduled if scheduled else 0
+            state = state.update_report_progress(parameter, progress)
+        return state
 
     def generate_report(self, parameter: HyperParameter):
         """Generate a report about a given hyper parameter.
@@ -67,14 +124,26 @@ class HyperParameterReportGenerator(object):
                 # skip redundant information
                 return
 
+        samples = TuningInformation.get_parameter_details(
+            parameter
+        ).cap_samples(self.samples)
+        counters = RawArray(c_int64, samples)
+        self.progress_counters[parameter] = counters
+        scheduled_runs = RawValue(c_int64, 0)
+        self.scheduled_runs[parameter] = scheduled_runs
+        # every pool worker simulates with numba, import it once for all
+        LazyJit.preload()
+
         generator = Process(
             target=self.generate_report_worker,
             name=f"report-generator {parameter.name}",
-            args=(parameter,),
+            args=(parameter, counters, scheduled_runs),
         )
         generator.start()
 
-    def generate_report_worker(self, parameter: HyperParameter):
+    def generate_report_worker(
+        self, parameter: HyperParameter, counters: Any, scheduled_runs: Any
+    ):
         """Generate a report for a given parameter.
 
         this is the internal method that does the heavy lifting in a separate
@@ -82,80 +151,221 @@ class HyperParameterReportGenerator(object):
 
         Args:
             parameter (HyperParameter): the parameter to evaluate
+            counters (Any): the shared counters of each sample's completed
+                runs.
+            scheduled_runs (Any): the shared count of runs scheduled so far.
         """
         details = TuningInformation.get_parameter_details(parameter)
-        samples = details.cap_samples(self.samples)
+        samples = len(counters)
         progress_steps = np.linspace(0, 1, samples)
         interpolate = np.vectorize(details.interpolate_value)
         x_axis = interpolate(progress_steps)
-        run_progress = 1 / (samples * self.runs)
 
-        with Pool(processes=self.worker_count) as pool:
-            simulation_results = pool.starmap(
-                self.evaluate_value,
-                zip(repeat(parameter), x_axis, repeat(run_progress)),
-            )
-            if not self.running:
-                return
+        with Pool(
+            processes=self.worker_count,
+            initializer=self.attach_progress,
+            initargs=(counters,),
+        ) as pool:
+            if self.adaptive_sampling:
+                sample_rewards = self.__sample_adaptively(
+                    pool, parameter, x_axis, scheduled_runs
+                )
+            else:
+                scheduled_runs.value = samples * self.runs
+                sample_rewards = pool.starmap(
+                    self.simulate_rewards,
+                    zip(
+                        repeat(parameter),
+                        x_axis,
+                        range(samples),
+                        repeat(self.runs),
+                        repeat(self.running),
+                        map(self.task_seed, range(samples), repeat(0)),
+                    ),
+                )
+        if not self.running.get():
+            return
 
-            lower_bounds, y_axis, upper_bounds = map(
-                list, zip(*simulation_results)
-            )
+        lower_bounds, y_axis, upper_bounds = map(
+            list, zip(*map(self.confidence_interval, sample_rewards))
+        )
 
-            report = HyperParameterReport(
-                parameter, x_axis, lower_bounds, y_axis, upper_bounds
-            )
+        report = HyperParameterReport(
+            parameter, x_axis, lower_bounds, y_axis, upper_bounds
+        )
+        if self.result_store is not None:
+            self.result_store.store_report(report)
 
-            with self.state_lock:
-                state = self.state.get()
-                self.state.set(state.complete_request(report))
+        with self.state_lock:
+            state = self.state.get()
+            self.state.set(state.complete_request(report))
 
     confidence_level = 0.95
     confidence_iterations = 1000
 
-    def evaluate_value(
-        self,
+    @classmethod
+    def attach_progress(cls, counters: Any) -> None:
+        """Give a pool worker access to the report's progress counters.
+
+        the counters can only be shared as the worker is created rather than
+        with each task.
+
+        Args:
+            counters (Any): the shared counters of each sample's completed
+                runs.
+        """
+        cls.sample_progress = counters
+
+    @classmethod
+    def simulate_rewards(
+        cls,
         parameter: HyperParameter,
         parameter_value: float,
-        run_progress_amount: float,
-    ) -> Tuple[float, float, float]:
-        """Evaluate a parameter and value combination.
+        sample: int,
+        run_count: int,
+        running: running_flag_type,
+        seed: Optional[int] = None,
+    ) -> List[float]:
+        """Simulate runs of a parameter and value combination.
+
+        a class method so that each task does not send the generator itself
+        to the pool.
 
         Args:
             parameter (HyperParameter): the parameter to test
             parameter_value (float): the value for this parameter to assume
-            run_progress_amount (float): the amount of progress made in a single
-                run.
+            sample (int): the index of this sample, where its progress is
+                counted.
+            run_count (int): the number of runs to simulate.
+            running (running_flag_type): a value to determine early stopping.
+            seed (Optional[int]): seed for the runs. Defaults to None.
 
         Returns:
-            float: the total reward under these conditions.
+            List[float]: the total reward of each run, empty if shutting down.
         """
         # skip computation if shutting down.
+        if not running.get():
+            return []
         details = TuningInformation.get_parameter_details(parameter)
         hyper_parameters = ParameterTuningStrategy(parameter, parameter_value)
+        records = ParameterEvaluator.batch_run(
+            details.tuning_options, [hyper_parameters] * run_count, seed=seed
+        )
 
-        rewards = []
+        if cls.sample_progress is not None:
+            # each sample is only simulated by one task at a time
+            cls.sample_progress[sample] += len(records)
 
-        for _ in range(self.runs):
-            if not self.running.get():
-                return 0, 0, 0
-            stats = ParameterEvaluator.single_run(
-                details.tuning_options, hyper_parameters
-            )
-            rewards.append(stats.total_reward)
+        return [record.total_reward for record in records]
 
-            with self.state_lock:
-                state = self.state.get()
-                new_progress = (
-                    state.pending_requests.get(parameter, 1)
-                    + run_progress_amount
-                )
-                self.state.set(
-                    state.update_report_progress(parameter, new_progress)
-                )
+    @classmethod
+    def task_seed(cls, sample: int, completed_runs: int) -> Optional[int]:
+        """Get the seed for the next runs of a sample.
 
+        the seed depends only on the sample and its completed runs, so a
+        seeded report does not depend on how its tasks are scheduled.
+
+        Args:
+            sample (int): the index of the sample.
+            completed_runs (int): the runs of the sample already simulated.
+
+        Returns:
+            Optional[int]: the seed, none if reports are unseeded.
+        """
+        if cls.seed is None:
+            return None
+        return cls.seed + sample * cls.runs + completed_runs
+
+    @classmethod
+    def confidence_interval(
+        cls, rewards: Sequence[float]
+    ) -> Tuple[float, float, float]:
+        """Compute the confidence interval of the mean reward.
+
+        Args:
+            rewards (Sequence[float]): the total reward of each run.
+
+        Returns:
+            Tuple[float, float, float]: the lower bound, mean and upper bound.
+        """
         return compute_confidence_interval(
             np.array(rewards, dtype=np.float64),
-            self.confidence_level,
-            self.confidence_iterations,
+            cls.confidence_level,
+            cls.confidence_iterations,
+        )
+
+    @classmethod
+    def select_uncertain_samples(
+        cls, sample_rewards: Sequence[Sequence[float]]
+    ) -> List[int]:
+        """Select the samples that need more runs.
+
+        a sample needs more runs while its confidence interval is wider than
+        the target, a fraction of the range of the mean rewards. Samples whose
+        interval reaches the best sample's interval are close to the optimum,
+        so they must converge further. No sample has more than `runs` runs.
+
+        Args:
+            sample_rewards (Sequence[Sequence[float]]): the rewards of each
+                sample's runs so far.
+
+        Returns:
+            List[int]: the indices of the samples that need more runs.
+        """
+        lower, mean, upper = np.array(
+            [cls.confidence_interval(rewards) for rewards in sample_rewards]
+        ).T
+        target_width = cls.target_width_ratio * (mean.max() - mean.min())
+        near_optimum = upper >= lower[mean.argmax()]
+        target_widths = np.where(
+            near_optimum, target_width * cls.optimum_width_ratio, target_width
         )
+        run_counts = np.array([len(rewards) for rewards in sample_rewards])
+        uncertain = (upper - lower > target_widths) & (run_counts < cls.runs)
+        return np.flatnonzero(uncertain).tolist()
+
+    def __sample_adaptively(
+        self,
+        pool: PoolType,
+        parameter: HyperParameter,
+        x_axis: Sequence[float],
+        scheduled_runs: Any,
+    ) -> List[List[float]]:
+        """Simulate more runs only where the reward is still uncertain.
+
+        every sample starts with `initial_runs` runs, then samples selected by
+        `select_uncertain_samples` get `additional_runs` more each round.
+
+        Args:
+            pool (PoolType): the pool simulating the runs.
+            parameter (HyperParameter): the parameter to test
+            x_axis (Sequence[float]): the value of the parameter at each sample.
+            scheduled_runs (Any): the shared count of runs scheduled so far.
+
+        Returns:
+            List[List[float]]: the rewards of each sample's runs.
+        """
+        sample_rewards: List[List[float]] = [[] for _ in x_axis]
+        pending = list(range(len(x_axis)))
+        run_count = self.initial_runs
+        while pending and self.running.get():
+            tasks = [
+                (
+                    parameter,
+                    x_axis[sample],
+                    sample,
+                    min(run_count, self.runs - len(sample_rewards[sample])),
+                    self.running,
+                    self.task_seed(sample, len(sample_rewards[sample])),
+                )
+                for sample in pending
+            ]
+            scheduled_runs.value += sum(task[3] for task in tasks)
+            new_rewards = pool.starmap(self.simulate_rewards, tasks)
+            if not self.running.get():
+                break
+            for sample, rewards in zip(pending, new_rewards):
+                sample_rewards[sample].extend(rewards)
+            pending = self.select_uncertain_samples(sample_rewards)
+            run_count = self.additional_runs
+        return sample_rewards
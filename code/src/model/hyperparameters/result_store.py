@@ -0,0 +1,421 @@
+import json
+import sqlite3
+from contextlib import closing, contextmanager
+from os import makedirs, path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.model.agents.q_learning.exploration_strategies.options import (
+    ExplorationStrategyOptions,
+)
+from src.model.dynamics.collection_dynamics import CollectionDynamics
+from src.model.hyperparameters.base_parameter_strategy import HyperParameter
+from src.model.hyperparameters.parameter_evaluator import ParameterEvaluator
+from src.model.hyperparameters.random_search.random_search_data import (
+    RandomSearchState,
+    SearchArea,
+    SearchResult,
+    SearchUpdate,
+)
+from src.model.hyperparameters.report_generation.report_data import (
+    HyperParameterReport,
+)
+from src.model.hyperparameters.tuning_information import TuningInformation
+from src.model.learning_system.top_level_entities.factory import EntityFactory
+from src.model.learning_system.top_level_entities.options import (
+    AgentOptions,
+    DynamicsOptions,
+    TopEntitiesOptions,
+)
+
+
+class ResultStore(object):
+    """Keeps search results and reports in a SQLite database.
+
+    Every evaluated combination is appended to the results table, while the
+    search areas table indexes the best combination of each area as results
+    are written. Restoring a search reads only this index. Each operation
+    opens its own connection, so the store can be used from any process.
+
+    Rows are keyed by the environment they were found in, results found on
+    another grid, goal layout or run length are not comparable and are never
+    restored.
+    """
+
+    default_path = path.join(
+        path.dirname(__file__), "..", "..", "..", ".cache", "results.sqlite"
+    )
+    # databases written with another schema are cleared when opened
+    schema_version = 1
+    tables = ("results", "search_areas", "optimal_rewards", "reports")
+    schema = (
+        """
+        CREATE TABLE IF NOT EXISTS results (
+            id INTEGER PRIMARY KEY,
+            environment TEXT NOT NULL,
+            agent INTEGER NOT NULL,
+            dynamics INTEGER NOT NULL,
+            exploration_strategy INTEGER NOT NULL,
+            parameters TEXT NOT NULL,
+            reward REAL,
+            seed INTEGER NOT NULL,
+            iterations INTEGER NOT NULL
+        )
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS results_by_area ON results (
+            environment, agent, dynamics, exploration_strategy, id
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS search_areas (
+            environment TEXT NOT NULL,
+            agent INTEGER NOT NULL,
+            dynamics INTEGER NOT NULL,
+            exploration_strategy INTEGER NOT NULL,
+            best_parameters TEXT,
+            best_value REAL,
+            combinations_tried INTEGER NOT NULL,
+            PRIMARY KEY (environment, agent, dynamics, exploration_strategy)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS optimal_rewards (
+            environment TEXT NOT NULL,
+            dynamics INTEGER NOT NULL,
+            reward REAL NOT NULL,
+            PRIMARY KEY (environment, dynamics)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS reports (
+            environment TEXT NOT NULL,
+            parameter INTEGER NOT NULL,
+            report TEXT NOT NULL,
+            PRIMARY KEY (environment, parameter)
+        )
+        """,
+    )
+
+    # whether a result improves on the best value of its search area
+    improved = (
+        "excluded.best_value > best_value OR "
+        + "(best_value IS NULL AND excluded.best_value IS NOT NULL)"
+    )
+
+    def __init__(self, database_path: Optional[str] = None) -> None:
+        """Initialise the store, the database is created when first used.
+
+        Args:
+            database_path (Optional[str]): where the database is stored.
+                Defaults to `default_path`.
+        """
+        self.database_path = path.abspath(database_path or self.default_path)
+
+    def record_updates(self, updates: Sequence[SearchUpdate], seed: int):
+        """Write the updates of the search processes in one transaction.
+
+        Args:
+            updates (Sequence[SearchUpdate]): the updates to write.
+            seed (int): the seed of the dynamics the results were found with.
+        """
+        environment = self.environment_key()
+        results = [result for update in updates for result in update.results]
+        result_rows = [
+            (
+                environment,
+                *self.__area_key(result.options),
+                self.__encode_parameters(result.parameters),
+                result.recorded_value,
+                seed,
+                result.iterations,
+            )
+            for result in results
+        ]
+        optimal_rows = [
+            (environment, dynamics.value, reward)
+            for update in updates
+            if update.optimal_rewards is not None
+            for dynamics, reward in update.optimal_rewards.items()
+        ]
+        with self.__connect() as connection:
+            connection.executemany(
+                """
+                INSERT INTO results (
+                    environment, agent, dynamics, exploration_strategy,
+                    parameters, reward, seed, iterations
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                result_rows,
+            )
+            # set expressions read the row before the update
+            connection.executemany(
+                f"""
+                INSERT INTO search_areas VALUES (?, ?, ?, ?, ?, ?, 1)
+                ON CONFLICT DO UPDATE SET
+                    combinations_tried = combinations_tried + 1,
+                    best_parameters = CASE WHEN {self.improved}
+                        THEN excluded.best_parameters ELSE best_parameters END,
+                    best_value = CASE WHEN {self.improved}
+                        THEN excluded.best_value ELSE best_value END
+                """,
+                [
+                    (
+                        *area_columns,
+                        None if reward is None else parameters,
+                        reward,
+                    )
+                    for *area_columns, parameters, reward, _, _ in result_rows
+                ],
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO optimal_rewards VALUES (?, ?, ?)",
+                optimal_rows,
+            )
+
+    def load_search_state(self, state: RandomSearchState) -> RandomSearchState:
+        """Restore the stored progress of a search.
+
+        Args:
+            state (RandomSearchState): the state of a new search.
+
+        Returns:
+            RandomSearchState: the state including the stored progress of each
+            of its search areas.
+        """
+        environment = self.environment_key()
+        with self.__connect() as connection:
+            area_rows = connection.execute(
+                """
+                SELECT
+                    agent, dynamics, exploration_strategy, best_parameters,
+                    best_value, combinations_tried
+                FROM search_areas WHERE environment = ?
+                """,
+                (environment,),
+            ).fetchall()
+            optimal_rows = connection.execute(
+                "SELECT dynamics, reward FROM optimal_rewards "
+                + "WHERE environment = ?",
+                (environment,),
+            ).fetchall()
+
+        search_areas = state.search_areas.copy()
+        for *area_key, best_parameters, best_value, tried in area_rows:
+            options = self.__area_options(area_key)
+            if options not in search_areas:
+                continue
+            if best_parameters is None:
+                best_parameters = search_areas[options].best_parameters
+            else:
+                best_parameters = self.__decode_parameters(best_parameters)
+            search_areas[options] = SearchArea(
+                options, best_parameters, best_value, tried
+            )
+
+        optimal_rewards = state.optimal_rewards
+        if optimal_rows:
+            optimal_rewards = {
+                DynamicsOptions(dynamics): reward
+                for dynamics, reward in optimal_rows
+            }
+        return RandomSearchState(
+            optimal_rewards, search_areas, searching=state.searching
+        )
+
+    def recent_results(
+        self, options: TopEntitiesOptions, limit: int
+    ) -> List[SearchResult]:
+        """Read the most recent results of a search area.
+
+        Args:
+            options (TopEntitiesOptions): the search area.
+            limit (int): the most results to read.
+
+        Returns:
+            List[SearchResult]: the results, oldest first.
+        """
+        with self.__connect() as connection:
+            rows = connection.execute(
+                """
+                SELECT parameters, reward, iterations FROM results
+                WHERE environment = ? AND agent = ? AND dynamics = ?
+                    AND exploration_strategy = ?
+                ORDER BY id DESC LIMIT ?
+                """,
+                (self.environment_key(), *self.__area_key(options), limit),
+            ).fetchall()
+        return [
+            SearchResult(
+                options, self.__decode_parameters(parameters), reward, steps
+            )
+            for parameters, reward, steps in reversed(rows)
+        ]
+
+    def store_report(self, report: HyperParameterReport) -> None:
+        """Write a completed report, replacing any older report.
+
+        Args:
+            report (HyperParameterReport): the report to write.
+        """
+        encoded_report = json.dumps(
+            {
+                "x_axis": list(map(float, report.x_axis)),
+                "lower_confidence_bound": list(
+                    map(float, report.lower_confidence_bound)
+                ),
+                "y_axis": list(map(float, report.y_axis)),
+                "upper_confidence_bound": list(
+                    map(float, report.upper_confidence_bound)
+                ),
+            }
+        )
+        with self.__connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO reports VALUES (?, ?, ?)",
+                (
+                    self.environment_key(),
+                    report.parameter.value,
+                    encoded_report,
+                ),
+            )
+
+    def load_reports(self) -> Dict[HyperParameter, HyperParameterReport]:
+        """Read every stored report.
+
+        Returns:
+            Dict[HyperParameter, HyperParameterReport]: the report of each
+            parameter.
+        """
+        with self.__connect() as connection:
+            rows = connection.execute(
+                "SELECT parameter, report FROM reports WHERE environment = ?",
+                (self.environment_key(),),
+            ).fetchall()
+        reports: Dict[HyperParameter, HyperParameterReport] = {}
+        for parameter_value, encoded_report in rows:
+            parameter = HyperParameter(parameter_value)
+            reports[parameter] = HyperParameterReport(
+                parameter, **json.loads(encoded_report)
+            )
+        return reports
+
+    def environment_key(self) -> str:
+        """Describe the environment results are currently found in.
+
+        read on every operation, as the entry points may change the seed or the
+        run length after creating the store.
+
+        Returns:
+            str: the description of each dynamics, which includes the grid's
+            size and the goal layout, the seed of the goal layout and the
+            length of each run.
+        """
+        dynamics_keys = [
+            EntityFactory.create_dynamics(
+                TopEntitiesOptions(
+                    AgentOptions.q_learning,
+                    dynamics,
+                    ExplorationStrategyOptions.not_applicable,
+                )
+            ).cache_key()
+            for dynamics in DynamicsOptions
+        ]
+        return json.dumps(
+            {
+                "dynamics": dynamics_keys,
+                "location_seed": CollectionDynamics.location_seed.value,
+                "iterations_per_run": ParameterEvaluator.iterations_per_run,
+            }
+        )
+
+    @contextmanager
+    def __connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection, committing its transaction on success.
+
+        Yields:
+            Iterator[sqlite3.Connection]: the open connection.
+        """
+        makedirs(path.dirname(self.database_path), exist_ok=True)
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            with connection:
+                version = connection.execute("PRAGMA user_version").fetchone()
+                if version[0] != self.schema_version:
+                    # older rows can not be attributed to an environment
+                    for table in self.tables:
+                        connection.execute(f"DROP TABLE IF EXISTS {table}")
+                    connection.execute(
+                        f"PRAGMA user_version = {self.schema_version}"
+                    )
+                for statement in self.schema:
+                    connection.execute(statement)
+                yield connection
+
+    def __area_key(self, options: TopEntitiesOptions) -> Tuple[int, int, int]:
+        """Get the columns identifying a search area.
+
+        Args:
+            options (TopEntitiesOptions): the search area.
+
+        Returns:
+            Tuple[int, int, int]: the agent, dynamics and exploration strategy.
+        """
+        return (
+            options.agent.value,
+            options.dynamics.value,
+            options.exploration_strategy.value,
+        )
+
+    def __area_options(self, area_key: Sequence[int]) -> TopEntitiesOptions:
+        """Get the search area identified by its columns.
+
+        Args:
+            area_key (Sequence[int]): the agent, dynamics and exploration
+                strategy.
+
+        Returns:
+            TopEntitiesOptions: the search area.
+        """
+        agent, dynamics, exploration_strategy = area_key
+        return TopEntitiesOptions(
+            AgentOptions(agent),
+            DynamicsOptions(dynamics),
+            ExplorationStrategyOptions(exploration_strategy),
+        )
+
+    def __encode_parameters(
+        self, parameters: Dict[HyperParameter, Optional[float]]
+    ) -> str:
+        """Encode the used parameters by name.
+
+        Args:
+            parameters (Dict[HyperParameter, Optional[float]]): the parameters.
+
+        Returns:
+            str: the encoded parameters.
+        """
+        return json.dumps(
+            {
+                parameter.name: parameter_value
+                for parameter, parameter_value in parameters.items()
+                if parameter_value is not None
+            }
+        )
+
+    def __decode_parameters(
+        self, encoded_parameters: str
+    ) -> Dict[HyperParameter, Optional[float]]:
+        """Decode parameters, unused tunable parameters are none.
+
+        Args:
+            encoded_parameters (str): the encoded parameters.
+
+        Returns:
+            Dict[HyperParameter, Optional[float]]: the parameters.
+        """
+        parameters: Dict[HyperParameter, Optional[float]] = {
+            parameter: None
+            for parameter in TuningInformation.tunable_parameters()
+        }
+        for name, parameter_value in json.loads(encoded_parameters).items():
+            parameters[HyperParameter[name]] = parameter_value
+        return parameters
@@ -0,0 +1,41 @@
+from ctypes import c_bool
+from multiprocessing import Value
+from multiprocessing.managers import ValueProxy
+from typing import Union
+
+
+class SharedFlag(object):
+    """A boolean shared with child processes through shared memory.
+
+    reading or writing a single byte is atomic, so unlike a manager's value
+    no lock or round trip to the manager process is needed. The flag must be
+    shared with processes as they are created rather than pickled later.
+    """
+
+    def __init__(self, initial_value: bool) -> None:
+        """Initialise the flag.
+
+        Args:
+            initial_value (bool): the value of the flag.
+        """
+        self.flag = Value(c_bool, initial_value, lock=False)
+
+    def get(self) -> bool:
+        """Get the value of the flag.
+
+        Returns:
+            bool: the value of the flag.
+        """
+        return self.flag.value
+
+    def set(self, new_value: bool) -> None:
+        """Set the value of the flag.
+
+        Args:
+            new_value (bool): the new value of the flag.
+        """
+        self.flag.value = new_value
+
+
+# a manager's value or a shared flag, both can stop a long evaluation early
+running_flag_type = Union[ValueProxy[bool], SharedFlag]
@@ -78,6 +78,20 @@ class HyperParameterDescription(object):
             return interpolated_value
         return round(interpolated_value)
 
+    def normalise_value(self, parameter_value: float) -> float:
+        """Find how far through the range a value is.
+
+        the inverse of `interpolate_value`.
+
+        Args:
+            parameter_value (float): a value in the range.
+
+        Returns:
+            float: the factor of the way through the range.
+        """
+        interval = self.max_value - self.min_value
+        return (parameter_value - self.min_value) / interval
+
 
 class TuningInformation(object):
     """Class for containing the meta information about tuning parameters."""
@@ -0,0 +1,82 @@
+from functools import update_wrapper
+from typing import Any, Callable, Optional
+
+
+class LazyJit(object):
+    """A function compiled with numba when it is first called.
+
+    importing numba takes longer than importing the rest of the model, so it
+    is only imported once a compiled function is needed. Compiled functions
+    called by this function are compiled first, then replace their lazy
+    wrappers in its module so numba can call them directly.
+    """
+
+    def __init__(self, function: Callable, options: dict) -> None:
+        """Wrap a function to compile later.
+
+        Args:
+            function (Callable): the function to compile.
+            options (dict): the options passed to numba's `jit`.
+        """
+        self.function = function
+        self.options = options
+        self.dispatcher: Optional[Callable] = None
+        update_wrapper(self, function)
+
+    def __call__(self, *args: Any) -> Any:
+        """Call the compiled function.
+
+        Args:
+            args (Any): the arguments of the function.
+
+        Returns:
+            Any: the result of the function.
+        """
+        return self.compile()(*args)
+
+    @classmethod
+    def preload(cls) -> None:
+        """Import numba now, before creating processes that will need it.
+
+        forked processes inherit the imported module rather than each
+        importing it again.
+        """
+        import numba  # noqa: F401, WPS433
+
+    def compile(self) -> Callable:
+        """Compile the function, if it is not already compiled.
+
+        Returns:
+            Callable: the compiled function.
+        """
+        if self.dispatcher is not None:
+            return self.dispatcher
+
+        from numba import jit  # noqa: WPS433
+
+        module_globals = self.function.__globals__
+        for name in self.function.__code__.co_names:
+            dependency = module_globals.get(name)
+            if isinstance(dependency, LazyJit):
+                module_globals[name] = dependency.compile()
+
+        self.dispatcher = jit(**self.options)(self.function)
+        if module_globals.get(self.function.__name__) is self:
+            module_globals[self.function.__name__] = self.dispatcher
+        return self.dispatcher
+
+
+def lazy_jit(**options: Any) -> Callable[[Callable], LazyJit]:
+    """Compile a function with numba's `jit` when it is first called.
+
+    Args:
+        options (Any): the options passed to numba's `jit`.
+
+    Returns:
+        Callable[[Callable], LazyJit]: the decorator.
+    """
+
+    def decorator(function: Callable) -> LazyJit:
+        return LazyJit(function, options)
+
+    return decorator
@@ -1,4 +1,4 @@
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from typing_extensions import override
 
@@ -8,18 +8,21 @@ from src.model.learning_system.base_entity_decorator import BaseEntityDecorator
 from src.model.learning_system.top_level_entities.container import (
     EntityContainer,
 )
-from src.model.learning_system.value_standardisation.normaliser import (
-    StateValueNormaliser,
-)
 from src.model.learning_system.value_standardisation.normaliser_factory import (
     NormaliserFactory,
 )
+from src.model.learning_system.value_standardisation.value_range import (
+    ValueType,
+)
 from src.model.state.cell_entities import CellEntity
 from src.model.state.state_instance import StateInstance
 
 from .cell_configuration import CellConfiguration, action_value_description
 from .cell_state_lookup import CellStateLookup
 
+# normalised and raw action values then normalised and raw state value
+cell_values_type = Tuple[List[float], List[float], float, float]
+
 
 class CellConfigurationFactory(BaseEntityDecorator):
     """Factory for creating cell configurations."""
@@ -54,6 +57,9 @@ class CellConfigurationFactory(BaseEntityDecorator):
     ) -> Dict[integer_position, CellConfiguration]:
         """Get a state description for this state ID.
 
+        the values of every cell are gathered from the agent at once, using the
+        states with the agent in each cell.
+
         Args:
             state_id (int): the state to represent in the view
 
@@ -64,61 +70,74 @@ class CellConfigurationFactory(BaseEntityDecorator):
             state_id
         )
         state = self.state_pool.get_state_from_id(state_id)
+        cell_state_ids = self.cell_state_lookup.get_state_ids(state)
+        has_state = cell_state_ids != CellStateLookup.missing_state
+        known_state_ids = cell_state_ids[has_state]
+
+        action_values = self.agent.get_state_action_values(known_state_ids)
+        state_values = self.agent.get_state_values(known_state_ids)
+        cell_values = zip(
+            normaliser.rescale_values(
+                ValueType.state_action_value, action_values
+            ).tolist(),
+            action_values.tolist(),
+            normaliser.rescale_values(
+                ValueType.state_value, state_values
+            ).tolist(),
+            state_values.tolist(),
+        )
         return {
-            cell: self.__cell_configuration(state, normaliser, cell)
-            for cell in self.entities.dynamics.grid_world.list_cells()
+            cell: self.__cell_configuration(
+                state, cell, next(cell_values) if cell_has_state else None
+            )
+            for cell, cell_has_state in zip(
+                self.grid_world.list_cells(), has_state.tolist()
+            )
         }
 
     def __cell_configuration(
         self,
         reference_state: StateInstance,
-        normaliser: StateValueNormaliser,
         cell: Tuple[int, int],
+        cell_values: Optional[cell_values_type],
     ) -> CellConfiguration:
         """Get the configuration of a cell in a given state.
 
         Args:
             reference_state (StateInstance): the state that this cell is
                 compared against.
-            normaliser (StateValueNormaliser): normaliser to get value
             cell (tuple[int, int]): the cell to check.
+            cell_values (Optional[cell_values_type]): the normalised and raw
+                action values then state value of the cell's state, none if
+                the cell has no state.
 
         Returns:
             CellConfiguration: the cell's configuration
         """
-        action_values_normalised: action_value_description = {}
-        action_values_raw: action_value_description = {}
-
-        cell_state = self.cell_state_lookup.get_state(reference_state, cell)
-
-        if cell_state is None:
-            for action in Action:
-                action_values_normalised[action] = None
-                action_values_raw[action] = None
-
+        if cell_values is None:
+            no_values: action_value_description = {
+                action: None for action in Action
+            }
             return CellConfiguration(
-                action_values_normalised,
-                action_values_raw,
+                no_values,
+                dict(no_values),
                 cell,
                 self.__cell_entity(reference_state, cell),
             )
 
-        cell_state_id = self.state_pool.get_state_id(cell_state)
-        for action in Action:
-            action_values_normalised[
-                action
-            ] = normaliser.get_state_action_value_normalised(cell_state, action)
-            action_values_raw[action] = self.agent.get_state_action_value(
-                cell_state_id, action
-            )
-
-        return CellConfiguration(
+        (
             action_values_normalised,
             action_values_raw,
+            cell_value_normalised,
+            cell_value_raw,
+        ) = cell_values
+        return CellConfiguration(
+            dict(zip(Action, action_values_normalised)),
+            dict(zip(Action, action_values_raw)),
             cell,
             self.__cell_entity(reference_state, cell),
-            normaliser.get_state_value_normalised(cell_state),
-            self.agent.get_state_value(cell_state_id),
+            cell_value_normalised,
+            cell_value_raw,
         )
 
     def __cell_entity(
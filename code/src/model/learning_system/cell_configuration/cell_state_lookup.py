@@ -1,14 +1,21 @@
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
 
 from src.model.dynamics.base_dynamics import BaseDynamics
 from src.model.state.state_instance import StateInstance, entities_type
 
 lookup_table_type = Dict[Tuple[int, int, entities_type], StateInstance]
+# the state id with the agent in each cell, in the order of `list_cells`
+cell_state_ids_type = np.ndarray[Any, np.dtype[np.int64]]
 
 
 class CellStateLookup(object):
     """This class represents lookup tables for mapping cells to states."""
 
+    # the id of cells without a state
+    missing_state = -1
+
     def __init__(self, dynamics: BaseDynamics) -> None:
         """Initialise the class.
 
@@ -17,6 +24,7 @@ class CellStateLookup(object):
         """
         self.dynamics = dynamics
         self.cell_lookup_table: Optional[lookup_table_type] = None
+        self.state_id_index: Dict[entities_type, cell_state_ids_type] = {}
 
     def get_state(
         self, reference_state: StateInstance, cell: Tuple[int, int]
@@ -37,6 +45,31 @@ class CellStateLookup(object):
         key = (cell_x, cell_y, reference_state.entities)
         return self.cell_lookup_table.get(key, None)
 
+    def get_state_ids(
+        self, reference_state: StateInstance
+    ) -> cell_state_ids_type:
+        """Get the state with an agent in every cell based on the reference.
+
+        Args:
+            reference_state (StateInstance): the base state to compare with
+
+        Returns:
+            cell_state_ids_type: the id of each cell's state, in the order of
+            `list_cells`, `missing_state` for cells without a state.
+        """
+        if self.cell_lookup_table is None:
+            self.cell_lookup_table = self.build_lookup_table()
+
+        state_ids = self.state_id_index.get(reference_state.entities, None)
+        if state_ids is None:
+            grid_world = self.dynamics.grid_world
+            return np.full(
+                grid_world.width * grid_world.height,
+                self.missing_state,
+                dtype=np.int64,
+            )
+        return state_ids
+
     def build_lookup_table(self) -> lookup_table_type:
         """Populate the lookup table.
 
@@ -44,11 +77,21 @@ class CellStateLookup(object):
             lookup_table_type: the populated lookup table.
         """
         self.cell_lookup_table = {}
-        for state in self.dynamics.state_pool.id_to_state.values():
+        self.state_id_index = {}
+        state_pool = self.dynamics.state_pool
+        grid_world = self.dynamics.grid_world
+        cell_count = grid_world.width * grid_world.height
+        for state_id in state_pool.list_state_ids():
+            state = state_pool.get_state_from_id(state_id)
             location_x, location_y = state.agent_location
             key = (location_x, location_y, state.entities)
             existing = self.cell_lookup_table.get(key, None)
             if existing is None:
                 self.cell_lookup_table[key] = state
+                state_ids = self.state_id_index.setdefault(
+                    state.entities,
+                    np.full(cell_count, self.missing_state, dtype=np.int64),
+                )
+                state_ids[location_y * grid_world.width + location_x] = state_id
 
         return self.cell_lookup_table
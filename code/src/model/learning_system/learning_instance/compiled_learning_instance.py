@@ -0,0 +1,281 @@
+from math import log, sqrt
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.model.agents.q_learning.exploration_strategies.epsilon_greedy_strategy import (  # noqa: E501
+    EpsilonGreedyStrategy,
+)
+from src.model.agents.q_learning.exploration_strategies.options import (
+    ExplorationStrategyOptions,
+)
+from src.model.agents.q_learning.exploration_strategies.upper_confidence_bound import (  # noqa: E501
+    UpperConfidenceBoundStrategy,
+)
+from src.model.agents.q_learning.replay_buffer import replay_transitions
+from src.model.agents.q_learning.state_action_table import state_action_array
+from src.model.agents.value_iteration.dynamics_distribution import (
+    numpy_float,
+    numpy_int,
+)
+from src.model.dynamics.actions import Action
+from src.model.dynamics.compiled_dynamics import (
+    CompiledDynamics,
+    reward_table_type,
+    transition_table_type,
+)
+from src.model.hyperparameters.base_parameter_strategy import (
+    BaseHyperParameterStrategy,
+    HyperParameter,
+)
+from src.model.lazy_jit import lazy_jit
+from src.model.learning_system.top_level_entities.factory import EntityFactory
+from src.model.learning_system.top_level_entities.options import (
+    AgentOptions,
+    TopEntitiesOptions,
+)
+
+from .statistics_record import StatisticsRecord
+
+unseeded = -1
+
+
+class CompiledLearningInstance(object):
+    """Simulates a Q-learning agent entirely within a compiled kernel.
+
+    The agent, its exploration strategy and the compiled dynamics are all
+    represented as arrays, so a whole run is a single call into numba.
+    Behaves like a `LearningInstance` using a `QLearningAgent` with the epsilon
+    greedy or upper confidence bound strategies.
+    """
+
+    supported_strategies = (
+        ExplorationStrategyOptions.epsilon_greedy,
+        ExplorationStrategyOptions.upper_confidence_bound,
+    )
+    action_count = len(Action)
+
+    def __init__(
+        self,
+        options: TopEntitiesOptions,
+        hyper_parameters: BaseHyperParameterStrategy,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Initialise the simulation.
+
+        Args:
+            options (TopEntitiesOptions): the options describing the agent and
+                environment.
+            hyper_parameters (BaseHyperParameterStrategy): the hyper parameters
+                of the agent.
+            seed (Optional[int]): seed for the random exploration.
+
+        Raises:
+            ValueError: if the options are not supported.
+        """
+        if not self.supports(options):
+            raise ValueError(f"compiled simulation does not support {options}")
+
+        self.options = options
+        self.seed = unseeded if seed is None else seed
+        self.dynamics = CompiledDynamics(EntityFactory.create_dynamics(options))
+        self.next_states, self.rewards = self.dynamics.get_transition_tables()
+
+        self.replay_length = hyper_parameters.get_integer_value(
+            HyperParameter.replay_queue_length
+        )
+        self.learning_rate = hyper_parameters.get_value(
+            HyperParameter.learning_rate
+        )
+        self.discount_rate = hyper_parameters.get_value(
+            HyperParameter.discount_rate
+        )
+        self.table: state_action_array = np.full(
+            (self.next_states.shape[0], self.action_count),
+            hyper_parameters.get_value(HyperParameter.initial_optimism),
+            dtype=np.float64,
+        )
+
+        # parameters of the strategy not in use are left at zero
+        self.exploration_ratio = 0.0
+        self.decay_rate = 0.0
+        self.exploration_bias = 0.0
+        match options.exploration_strategy:
+            case ExplorationStrategyOptions.epsilon_greedy:
+                self.exploration_ratio = hyper_parameters.get_value(
+                    HyperParameter.eg_initial_exploration_ratio
+                )
+                self.decay_rate = hyper_parameters.get_value(
+                    HyperParameter.eg_decay_rate
+                )
+            case _:
+                self.exploration_bias = hyper_parameters.get_value(
+                    HyperParameter.ucb_exploration_bias
+                )
+
+    @classmethod
+    def supports(cls, options: TopEntitiesOptions) -> bool:
+        """Determine weather these options can be simulated by the kernel.
+
+        Args:
+            options (TopEntitiesOptions): the options to check.
+
+        Returns:
+            bool: true for Q-learning agents using the epsilon greedy or upper
+            confidence bound strategies.
+        """
+        return (
+            options.agent is AgentOptions.q_learning
+            and options.exploration_strategy in cls.supported_strategies
+        )
+
+    def run(self, iterations: int) -> StatisticsRecord:
+        """Simulate the agent for a number of steps.
+
+        Args:
+            iterations (int): the number of actions the agent performs.
+
+        Returns:
+            StatisticsRecord: the statistics of the run.
+        """
+        use_ucb = (
+            self.options.exploration_strategy
+            is ExplorationStrategyOptions.upper_confidence_bound
+        )
+        reward_history, final_state = simulate_q_learning(
+            self.next_states,
+            self.rewards,
+            self.table,
+            self.dynamics.initial_state_id(),
+            iterations,
+            self.replay_length,
+            self.learning_rate,
+            self.discount_rate,
+            use_ucb,
+            self.exploration_ratio,
+            self.decay_rate,
+            EpsilonGreedyStrategy.min_safe_exploration_ratio,
+            self.exploration_bias,
+            UpperConfidenceBoundStrategy.epsilon,
+            self.seed,
+        )
+        return StatisticsRecord(
+            iterations,
+            reward_history.tolist(),
+            float(reward_history.sum()),
+            int(final_state),
+        )
+
+
+@lazy_jit(nopython=True, cache=True)
+def simulate_q_learning(  # noqa: WPS210, WPS211, WPS231
+    next_states: transition_table_type,
+    rewards: reward_table_type,
+    table: state_action_array,
+    initial_state: int,
+    iterations: int,
+    replay_length: int,
+    learning_rate: float,
+    discount_rate: float,
+    use_ucb: bool,
+    exploration_ratio: float,
+    decay_rate: float,
+    min_exploration_ratio: float,
+    exploration_bias: float,
+    count_epsilon: float,
+    seed: int,
+) -> Tuple[numpy_float, int]:
+    """Simulate a Q-learning agent in compiled dynamics.
+
+    Args:
+        next_states (transition_table_type): the next state of each state and
+            action.
+        rewards (reward_table_type): the reward of each state and action.
+        table (state_action_array): the value table, updated in place.
+        initial_state (int): the state the agent starts in.
+        iterations (int): the number of actions to perform.
+        replay_length (int): the number of transitions to replay.
+        learning_rate (float): the amount to move towards each observation.
+        discount_rate (float): the rate to discount future rewards.
+        use_ucb (bool): use the upper confidence bound strategy rather than
+            epsilon greedy.
+        exploration_ratio (float): the initial epsilon greedy exploration
+            ratio.
+        decay_rate (float): the epsilon greedy decay rate.
+        min_exploration_ratio (float): the smallest exploration ratio.
+        exploration_bias (float): the upper confidence bound exploration bias.
+        count_epsilon (float): added to action counts to avoid dividing by
+            zero.
+        seed (int): seed for the random exploration, negative to leave it
+            unseeded.
+
+    Returns:
+        Tuple[numpy_float, int]: the reward of each step and the final state.
+    """
+    if seed >= 0:
+        np.random.seed(seed)
+
+    action_count = table.shape[1]
+    reward_history = np.empty(iterations, dtype=np.float64)
+    state_action_counts = np.zeros(table.shape, dtype=np.float64)
+    time_steps = 1
+
+    capacity = max(replay_length, 1)
+    replay_states: numpy_int = np.zeros(capacity, dtype=np.int64)
+    replay_actions: numpy_int = np.zeros(capacity, dtype=np.int64)
+    replay_new_states: numpy_int = np.zeros(capacity, dtype=np.int64)
+    replay_rewards: numpy_float = np.zeros(capacity, dtype=np.float64)
+    head = 0
+    size = 0
+
+    state = initial_state
+    for step in range(iterations):
+        action = 0
+        if use_ucb:
+            exploration = log(time_steps)
+            best = -np.inf
+            for candidate in range(action_count):
+                bound = sqrt(
+                    exploration
+                    / (state_action_counts[state, candidate] + count_epsilon)
+                )
+                potential = table[state, candidate] + bound * exploration_bias
+                if potential > best:
+                    best = potential
+                    action = candidate
+            state_action_counts[state, action] += 1
+            time_steps += 1
+        else:
+            if np.random.random() < exploration_ratio:
+                action = np.random.randint(0, action_count)
+            else:
+                action = table[state].argmax()
+            exploration_ratio = max(
+                exploration_ratio * decay_rate, min_exploration_ratio
+            )
+
+        new_state = next_states[state, action]
+        reward = rewards[state, action]
+        reward_history[step] = reward
+
+        if replay_length > 0:
+            replay_states[head] = state
+            replay_actions[head] = action
+            replay_new_states[head] = new_state
+            replay_rewards[head] = reward
+            head = (head + 1) % replay_length
+            size = min(size + 1, replay_length)
+            replay_transitions(
+                table,
+                replay_states,
+                replay_actions,
+                replay_new_states,
+                replay_rewards,
+                head,
+                size,
+                learning_rate,
+                discount_rate,
+            )
+        state = new_state
+
+    return reward_history, state
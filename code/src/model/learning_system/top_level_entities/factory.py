@@ -4,10 +4,17 @@ from src.model.agents.value_iteration.agent import ValueIterationAgent
 from src.model.agents.value_iteration.agent_optimised import (
     ValueIterationAgentOptimised,
 )
+from src.model.agents.value_iteration.agent_policy_iteration import (
+    PolicyIterationAgent,
+)
+from src.model.agents.value_iteration.agent_prioritized_sweeping import (
+    PrioritizedSweepingAgent,
+)
 from src.model.config.reader import ConfigReader
 from src.model.dynamics.base_dynamics import BaseDynamics
 from src.model.dynamics.cliff_dynamics import CliffDynamics
 from src.model.dynamics.collection_dynamics import CollectionDynamics
+from src.model.dynamics.compiled_dynamics import CompiledDynamics
 from src.model.hyperparameters.base_parameter_strategy import (
     BaseHyperParameterStrategy,
 )
@@ -29,6 +36,7 @@ class EntityFactory(object):
         cls,
         options: TopEntitiesOptions,
         hyper_parameters: BaseHyperParameterStrategy,
+        compile_dynamics: bool = False,
     ) -> EntityContainer:
         """Create new entities from the given options.
 
@@ -37,11 +45,16 @@ class EntityFactory(object):
                 entities to create.
             hyper_parameters (BaseHyperParameterStrategy): the parameters for
                 these entities.
+            compile_dynamics (bool): weather to precompute the transitions of
+                the dynamics, worthwhile for long simulations. Defaults to
+                False.
 
         Returns:
             EntityContainer: The new entities.
         """
         dynamics = cls.create_dynamics(options)
+        if compile_dynamics and not dynamics.is_stochastic():
+            dynamics = CompiledDynamics(dynamics)
         agent = cls.create_agent(options, hyper_parameters, dynamics)
         stats = StatisticsRecorder()
         return EntityContainer(agent, dynamics, stats, options)
@@ -75,6 +88,10 @@ class EntityFactory(object):
                 return ValueIterationAgent(hyper_parameters, dynamics)
             case AgentOptions.value_iteration_optimised:
                 return ValueIterationAgentOptimised(hyper_parameters, dynamics)
+            case AgentOptions.policy_iteration:
+                return PolicyIterationAgent(hyper_parameters, dynamics)
+            case AgentOptions.prioritized_sweeping:
+                return PrioritizedSweepingAgent(hyper_parameters, dynamics)
             case AgentOptions.q_learning:
                 return QLearningAgent(
                     hyper_parameters,
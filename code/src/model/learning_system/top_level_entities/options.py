@@ -12,6 +12,8 @@ class AgentOptions(Enum):
     value_iteration_optimised = 1
     value_iteration = 2
     q_learning = 3
+    policy_iteration = 4
+    prioritized_sweeping = 5
 
 
 class DynamicsOptions(Enum):
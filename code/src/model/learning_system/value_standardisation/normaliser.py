@@ -5,7 +5,11 @@ from src.model.dynamics.actions import Action
 from src.model.state.state_instance import StateInstance
 from src.model.state.state_pool import StatePool
 
-from ..value_standardisation.value_range import ValueRange, ValueType
+from ..value_standardisation.value_range import (
+    ValueRange,
+    ValueType,
+    values_type,
+)
 
 action_value_tuple = Tuple[StateInstance, Action]
 
@@ -84,3 +88,17 @@ class StateValueNormaliser(object):
         self.state_value_cache[state] = state_value
 
         return state_value
+
+    def rescale_values(
+        self, value_type: ValueType, absolute_values: values_type
+    ) -> values_type:
+        """Normalise many values the agent has already provided.
+
+        Args:
+            value_type (ValueType): the type of values received.
+            absolute_values (values_type): the values from the agent.
+
+        Returns:
+            values_type: the values normalised.
+        """
+        return self.value_range.rescale_values(value_type, absolute_values)
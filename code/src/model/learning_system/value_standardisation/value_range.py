@@ -1,11 +1,15 @@
 from enum import Enum
-from typing import Optional, Tuple
+from typing import Any, Optional, Tuple
+
+import numpy as np
 
 from src.model.agents.base_agent import BaseAgent
-from src.model.dynamics.actions import Action
 from src.model.state.state_pool import StatePool
 
 
+values_type = np.ndarray[Any, np.dtype[np.float64]]
+
+
 class ValueType(Enum):
     """Enumerates the possible types of values."""
 
@@ -53,6 +57,23 @@ class ValueRange(object):
             return 0.5
         return (absolute_value - min_value) / (max_value - min_value)
 
+    def rescale_values(
+        self, value_type: ValueType, absolute_values: values_type
+    ) -> values_type:
+        """Rescale many values from a value type into the range 0-1.
+
+        Args:
+            value_type (ValueType): the type of values received
+            absolute_values (values_type): the raw values before rescaling
+
+        Returns:
+            values_type: the rescaled values
+        """
+        min_value, max_value = self.__get_value_range(value_type)
+        if min_value == max_value:
+            return np.full_like(absolute_values, 0.5, dtype=np.float64)
+        return (absolute_values - min_value) / (max_value - min_value)
+
     def __get_value_range(self, value_type: ValueType) -> Tuple[float, float]:
         match value_type:
             case ValueType.state_value:
@@ -63,28 +84,31 @@ class ValueRange(object):
     def __get_state_value_range(self) -> Tuple[float, float]:
         if self.state_range is not None:
             return self.state_range
-        maximum_state_value = float("-inf")
-        minimum_state_value = float("inf")
-        for state in self.state_pool.state_to_id.values():
-            state_value = self.agent.get_state_value(state)
-            maximum_state_value = max(maximum_state_value, state_value)
-            minimum_state_value = min(minimum_state_value, state_value)
-
-        self.state_range = (minimum_state_value, maximum_state_value)
+
+        state_values = self.agent.get_state_values(self.__get_state_ids())
+        self.state_range = (
+            float(state_values.min(initial=float("inf"))),
+            float(state_values.max(initial=float("-inf"))),
+        )
         return self.state_range
 
     def __get_state_action_value_range(self) -> Tuple[float, float]:
         if self.action_range is not None:
             return self.action_range
 
-        maximum_action_value = float("-inf")
-        minimum_action_value = float("inf")
+        action_values = self.agent.get_state_action_values(
+            self.__get_state_ids()
+        )
+        self.action_range = (
+            float(action_values.min(initial=float("inf"))),
+            float(action_values.max(initial=float("-inf"))),
+        )
+        return self.action_range
 
-        for state in self.state_pool.state_to_id.values():
-            for action in Action:
-                action_value = self.agent.get_state_action_value(state, action)
-                maximum_action_value = max(maximum_action_value, action_value)
-                minimum_action_value = min(minimum_action_value, action_value)
+    def __get_state_ids(self) -> np.ndarray[Any, np.dtype[np.int64]]:
+        """Get the id of every state in the pool.
 
-        self.action_range = (minimum_action_value, maximum_action_value)
-        return self.action_range
+        Returns:
+            np.ndarray[Any, np.dtype[np.int64]]: the state ids.
+        """
+        return np.fromiter(self.state_pool.list_state_ids(), dtype=np.int64)
@@ -0,0 +1,81 @@
+from typing import Iterable
+
+from typing_extensions import override
+
+from .state_encoder import StateEncoder
+from .state_instance import StateInstance
+from .state_pool import StatePool
+
+
+class EncodedStatePool(StatePool):
+    """State pool where state ids are computed by a state encoder.
+
+    Ids do not depend on the order states are seen in, so dynamics can work
+    with ids directly. State instances are only created when requested and
+    are then kept for reuse.
+    """
+
+    def __init__(self, encoder: StateEncoder) -> None:
+        """Initialise the state pool.
+
+        Args:
+            encoder (StateEncoder): the encoding used to compute the ids.
+        """
+        super().__init__()
+        self.encoder = encoder
+
+    @override
+    def is_existing_state(self, state: StateInstance) -> bool:
+        """Determine weather a state can be represented by this pool.
+
+        Args:
+            state (StateInstance): the state to check
+
+        Returns:
+            bool: true if this state has an id in this pool
+        """
+        if not self.encoder.grid_world.is_in_bounds(state.agent_location):
+            return False
+        state_id = self.encoder.encode_state(state)
+        if not 0 <= state_id < self.encoder.state_count:
+            return False
+        return self.get_state_from_id(state_id) == state
+
+    @override
+    def get_state_id(self, state: StateInstance) -> int:
+        """Get the numeric id for a given state.
+
+        Args:
+            state (StateInstance): the state to get the id for
+
+        Returns:
+            int: the id for this state
+        """
+        return self.encoder.encode_state(state)
+
+    @override
+    def get_state_from_id(self, identifier: int) -> StateInstance:
+        """Get the state object corresponding to the given id.
+
+        Args:
+            identifier (int): the id of the state to get
+
+        Returns:
+            StateInstance: the state that is represented by this id
+        """
+        id_to_state = self.id_to_state
+        if identifier in id_to_state:
+            return id_to_state[identifier]  # noqa: WPS529 get is too slow
+        state = self.encoder.decode_state(identifier)
+        id_to_state[identifier] = state
+        self.state_to_id[state] = identifier
+        return state
+
+    @override
+    def list_state_ids(self) -> Iterable[int]:
+        """List the ids of every state this pool can represent.
+
+        Returns:
+            Iterable[int]: the state ids.
+        """
+        return range(self.encoder.state_count)
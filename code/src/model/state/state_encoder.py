@@ -0,0 +1,130 @@
+from typing import List, Optional, Sequence, Tuple
+
+from immutables import Map
+
+from ..dynamics.grid_world import GridWorld, integer_position
+from .cell_entities import CellEntity
+from .state_builder import StateBuilder
+from .state_instance import StateInstance, entities_type
+
+decoded_state_type = Tuple[int, int, int]
+
+
+class StateEncoder(object):
+    """Encodes grid world states as compact integers.
+
+    A state is described by the agent's location and a bitmask of which goals
+    are still present, goals are indexed against a fixed list of positions.
+    Any other entities are static and shared by every state. The encoding is
+    dense so state ids range from zero to `state_count`.
+    """
+
+    def __init__(
+        self,
+        grid_world: GridWorld,
+        goal_positions: Sequence[integer_position] = (),
+        static_entities: Optional[entities_type] = None,
+        empty_reachable: bool = False,
+    ) -> None:
+        """Initialise the state encoder.
+
+        Args:
+            grid_world (GridWorld): the grid the agent moves within.
+            goal_positions (Sequence[integer_position]): the positions goals can
+                be collected from, each is assigned one bit of the mask.
+            static_entities (Optional[entities_type]): the entities that are
+                present in every state, defaults to none.
+            empty_reachable (bool): weather a state without any goals can be
+                reached, if not these states are left out of the encoding.
+        """
+        self.grid_world = grid_world
+        self.width = grid_world.width
+        self.height = grid_world.height
+        self.cell_count = self.width * self.height
+        self.goal_positions: List[integer_position] = [
+            (int(x_pos), int(y_pos)) for x_pos, y_pos in goal_positions
+        ]
+        self.static_entities = (
+            Map() if static_entities is None else static_entities
+        )
+        self.full_mask = (1 << len(self.goal_positions)) - 1
+        self.mask_offset = (
+            0 if empty_reachable or not self.goal_positions else 1
+        )
+
+        # the bit for the goal at each cell, zero where there is no goal
+        self.goal_bits = [0] * self.cell_count
+        for bit_index, (x_pos, y_pos) in enumerate(self.goal_positions):
+            self.goal_bits[y_pos * self.width + x_pos] = 1 << bit_index
+
+    @property
+    def state_count(self) -> int:
+        """Get the number of states in the encoding.
+
+        Returns:
+            int: one more than the largest possible state id.
+        """
+        return self.cell_count * (self.full_mask + 1 - self.mask_offset)
+
+    def encode(self, x_pos: int, y_pos: int, goal_mask: int) -> int:
+        """Encode a state from its components.
+
+        Args:
+            x_pos (int): the agent's horizontal position.
+            y_pos (int): the agent's vertical position.
+            goal_mask (int): the bitmask of remaining goals.
+
+        Returns:
+            int: the state id.
+        """
+        cell = y_pos * self.width + x_pos
+        return (goal_mask - self.mask_offset) * self.cell_count + cell
+
+    def decode(self, state_id: int) -> decoded_state_type:
+        """Decode a state id into its components.
+
+        Args:
+            state_id (int): the state to decode.
+
+        Returns:
+            decoded_state_type: the agent's x and y position and the bitmask of
+            remaining goals.
+        """
+        mask_index, cell = divmod(state_id, self.cell_count)
+        y_pos, x_pos = divmod(cell, self.width)
+        return x_pos, y_pos, mask_index + self.mask_offset
+
+    def encode_state(self, state: StateInstance) -> int:
+        """Encode a state instance.
+
+        Args:
+            state (StateInstance): the state to encode.
+
+        Returns:
+            int: the state id.
+        """
+        x_pos, y_pos = state.agent_location
+        entities = state.entities
+        goal_mask = 0
+        for bit_index, position in enumerate(self.goal_positions):
+            if position in entities:
+                goal_mask |= 1 << bit_index
+        return self.encode(int(x_pos), int(y_pos), goal_mask)
+
+    def decode_state(self, state_id: int) -> StateInstance:
+        """Create the state instance a state id represents.
+
+        Args:
+            state_id (int): the state to decode.
+
+        Returns:
+            StateInstance: the state with this id.
+        """
+        x_pos, y_pos, goal_mask = self.decode(state_id)
+        builder = StateBuilder(
+            StateInstance((x_pos, y_pos), self.static_entities)
+        )
+        for bit_index, position in enumerate(self.goal_positions):
+            if goal_mask & (1 << bit_index):
+                builder.set_entity(position, CellEntity.goal)
+        return builder.build()
@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, Iterable
 
 from .state_instance import StateInstance
 
@@ -59,3 +59,11 @@ class StatePool(object):
             StateInstance: the state that is registered under this id
         """
         return self.id_to_state[identifier]
+
+    def list_state_ids(self) -> Iterable[int]:
+        """List the ids of every state known to this pool.
+
+        Returns:
+            Iterable[int]: the state ids.
+        """
+        return self.state_to_id.values()
@@ -4,18 +4,6 @@ import cProfile
 import pstats
 from random import seed
 
-from PySide6.QtCore import QTimer
-from PySide6.QtWidgets import QApplication
-
-from src.controller.hyper_parameter_controller.controller import (
-    HyperParameterController,
-)
-from src.controller.learning_system_controller.controller import (
-    LearningSystemController,
-)
-from src.controller.learning_system_controller.user_action_bridge import (
-    UserAction,
-)
 from src.model.agents.q_learning.exploration_strategies.options import (
     ExplorationStrategyOptions,
 )
@@ -36,8 +24,6 @@ from src.model.learning_system.top_level_entities.options import (
     DynamicsOptions,
     TopEntitiesOptions,
 )
-from src.view.display_state_v2.display import DisplayState
-from src.view.view_root_v2 import ReinforcementLearningApp
 
 from .model.learning_system.learning_system import LearningSystem
 
@@ -49,6 +35,11 @@ def one_process_profiling():
 
     The code in this method will be profiled by the application.
     """
+    from PySide6.QtCore import QTimer  # noqa: WPS433
+    from PySide6.QtWidgets import QApplication  # noqa: WPS433
+
+    from src.view.display_state_v2.display import DisplayState  # noqa: WPS433
+
     ls = LearningSystem()
     top_level_options = TopEntitiesOptions(
         AgentOptions.value_iteration_optimised,
@@ -84,6 +75,19 @@ def end_to_end_profiling():
 
     The code in this method will be profiled by the application.
     """
+    from PySide6.QtWidgets import QApplication  # noqa: WPS433
+
+    from src.controller.hyper_parameter_controller.controller import (  # noqa: WPS433, E501
+        HyperParameterController,
+    )
+    from src.controller.learning_system_controller.controller import (  # noqa: WPS433, E501
+        LearningSystemController,
+    )
+    from src.controller.learning_system_controller.user_action_bridge import (  # noqa: WPS433, E501
+        UserAction,
+    )
+    from src.view.view_root_v2 import ReinforcementLearningApp  # noqa: WPS433
+
     with LearningSystemController() as main_controller:
         with HyperParameterController() as report_controller:
             main_controller.user_action_bridge.submit_action(
@@ -118,9 +122,8 @@ def profiled_code():
                 return
 
             with rs.state_lock:
-                state = rs.state.get()
-                rs.state.set(
-                    state.record_result(options, hyper_parameters, total_reward)
+                rs.state = rs.state.record_result(
+                    options, hyper_parameters, total_reward
                 )
 
 
@@ -0,0 +1,296 @@
+from argparse import ArgumentParser, ArgumentTypeError, Namespace
+from time import monotonic, sleep
+from typing import List, Optional, Sequence
+
+from .model.agents.q_learning.exploration_strategies.options import (
+    ExplorationStrategyOptions,
+)
+from .model.agents.value_iteration.agent import ValueIterationAgent
+from .model.agents.value_iteration.distribution_cache import DistributionCache
+from .model.dynamics.collection_dynamics import CollectionDynamics
+from .model.hyperparameters.base_parameter_strategy import HyperParameter
+from .model.hyperparameters.parameter_evaluator import ParameterEvaluator
+from .model.hyperparameters.random_search.random_search import RandomSearch
+from .model.hyperparameters.random_search.random_search_data import (
+    RandomSearchState,
+)
+from .model.hyperparameters.report_generation.report_generator import (
+    HyperParameterReportGenerator,
+)
+from .model.hyperparameters.result_store import ResultStore
+from .model.hyperparameters.tuning_information import TuningInformation
+from .model.learning_system.top_level_entities.options import (
+    AgentOptions,
+    DynamicsOptions,
+    TopEntitiesOptions,
+)
+
+# how often the progress is checked and printed, in seconds
+poll_interval = 2
+# time for the search processes to send their last results after stopping
+shutdown_grace = 1
+
+
+def parse_area(area: str) -> TopEntitiesOptions:
+    """Parse a search area written as `agent:dynamics:exploration_strategy`.
+
+    Args:
+        area (str): the search area, each part is the name of an option.
+
+    Raises:
+        ArgumentTypeError: if the search area is not valid.
+
+    Returns:
+        TopEntitiesOptions: the search area.
+    """
+    try:
+        agent, dynamics, exploration_strategy = area.split(":")
+        return TopEntitiesOptions(
+            AgentOptions[agent],
+            DynamicsOptions[dynamics],
+            ExplorationStrategyOptions[exploration_strategy],
+        )
+    except (KeyError, ValueError):
+        raise ArgumentTypeError(
+            f'"{area}" is not a search area, use agent:dynamics:exploration'
+        )
+
+
+def parse_parameter(parameter: str) -> HyperParameter:
+    """Parse the name of a tunable parameter.
+
+    Args:
+        parameter (str): the name of the parameter.
+
+    Raises:
+        ArgumentTypeError: if the parameter is not tunable.
+
+    Returns:
+        HyperParameter: the parameter.
+    """
+    tunable = {
+        tunable.name for tunable in TuningInformation.tunable_parameters()
+    }
+    if parameter not in tunable:
+        raise ArgumentTypeError(
+            f'"{parameter}" is not tunable, use one of {sorted(tunable)}'
+        )
+    return HyperParameter[parameter]
+
+
+def create_parser() -> ArgumentParser:
+    """Create the parser of the command line arguments.
+
+    Returns:
+        ArgumentParser: the parser.
+    """
+    parser = ArgumentParser(
+        description="search and report on hyper parameters without the GUI."
+    )
+    parser.add_argument(
+        "--workers", type=int, help="the number of worker processes."
+    )
+    parser.add_argument(
+        "--seed", type=int, help="seed the environment and the simulations."
+    )
+    parser.add_argument(
+        "--database",
+        help="where results are written. defaults to "
+        + ResultStore.default_path,
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        help="stop after this many seconds.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", help="search for the best values.")
+    search.add_argument(
+        "--area",
+        type=parse_area,
+        action="append",
+        dest="areas",
+        help="an area to search as agent:dynamics:exploration, repeatable.",
+    )
+    search.add_argument(
+        "--combinations",
+        type=int,
+        help="stop once every area has tried this many combinations, "
+        + "including those of earlier searches.",
+    )
+    search.add_argument(
+        "--iterations",
+        type=int,
+        help="the steps of each fully evaluated run.",
+    )
+
+    report = commands.add_parser("report", help="report on parameters.")
+    report.add_argument(
+        "parameters",
+        type=parse_parameter,
+        nargs="+",
+        help="the parameters to report on.",
+    )
+    report.add_argument(
+        "--samples", type=int, help="the most values of each parameter."
+    )
+    report.add_argument("--runs", type=int, help="the most runs of each value.")
+    return parser
+
+
+def configure(arguments: Namespace) -> None:
+    """Apply the shared arguments before any processes are created.
+
+    Args:
+        arguments (Namespace): the parsed arguments.
+    """
+    ValueIterationAgent.distribution_cache = DistributionCache()
+    result_store = ResultStore(arguments.database)
+    RandomSearch.result_store = result_store
+    HyperParameterReportGenerator.result_store = result_store
+    if arguments.workers is not None:
+        RandomSearch.worker_count = arguments.workers
+        HyperParameterReportGenerator.worker_count = arguments.workers
+    if arguments.seed is not None:
+        CollectionDynamics.location_seed.value = arguments.seed
+        RandomSearch.seed = arguments.seed
+        HyperParameterReportGenerator.seed = arguments.seed
+
+
+def within_budget(start: float, time_budget: Optional[float]) -> bool:
+    """Check if there is time left.
+
+    Args:
+        start (float): when the work started.
+        time_budget (Optional[float]): the seconds available, none if
+            unlimited.
+
+    Returns:
+        bool: whether work can continue.
+    """
+    return time_budget is None or monotonic() - start < time_budget
+
+
+def print_search(state: RandomSearchState) -> None:
+    """Print the best result of each search area.
+
+    Args:
+        state (RandomSearchState): the state of the search.
+    """
+    for options, area in state.search_areas.items():
+        parameters = {
+            parameter.name: parameter_value
+            for parameter, parameter_value in area.best_parameters.items()
+            if parameter_value is not None
+        }
+        print(
+            f"{options.agent.name}:{options.dynamics.name}:"
+            + f"{options.exploration_strategy.name} "
+            + f"tried {area.combinations_tried} best {area.best_value} "
+            + f"with {parameters}",
+            flush=True,
+        )
+
+
+def run_search(
+    areas: Optional[Sequence[TopEntitiesOptions]],
+    combinations: Optional[int],
+    time_budget: Optional[float],
+) -> None:
+    """Search until the budgets are spent.
+
+    Args:
+        areas (Optional[Sequence[TopEntitiesOptions]]): the areas to search.
+        combinations (Optional[int]): the combinations to try in each area.
+        time_budget (Optional[float]): the seconds to search for.
+    """
+    search = RandomSearch(areas)
+    start = monotonic()
+    search.start_search()
+    try:
+        while within_budget(start, time_budget):
+            sleep(poll_interval)
+            state = search.get_progress()
+            print_search(state)
+            tried = [
+                area.combinations_tried for area in state.search_areas.values()
+            ]
+            if combinations is not None and min(tried) >= combinations:
+                break
+    finally:
+        search.stop_search()
+    sleep(shutdown_grace)
+    print_search(search.get_progress())
+
+
+def run_reports(
+    parameters: Sequence[HyperParameter], time_budget: Optional[float]
+) -> None:
+    """Generate reports until they are complete or the budget is spent.
+
+    Args:
+        parameters (Sequence[HyperParameter]): the parameters to report on.
+        time_budget (Optional[float]): the seconds to generate reports for.
+    """
+    generator = HyperParameterReportGenerator()
+    start = monotonic()
+    for parameter in parameters:
+        generator.generate_report(parameter)
+    try:
+        while within_budget(start, time_budget):
+            state = generator.get_state()
+            if not state.pending_requests:
+                break
+            print(
+                ", ".join(
+                    f"{parameter.name} {progress:.0%}"
+                    for parameter, progress in state.pending_requests.items()
+                ),
+                flush=True,
+            )
+            sleep(poll_interval)
+    finally:
+        generator.shutdown()
+
+    reports = generator.get_state().available_reports
+    for parameter in parameters:
+        if parameter not in reports:
+            print(f"{parameter.name} incomplete", flush=True)
+            continue
+        report = reports[parameter]
+        best = max(range(len(report.y_axis)), key=report.y_axis.__getitem__)
+        print(
+            f"{parameter.name} best {report.x_axis[best]} "
+            + f"with mean reward {report.y_axis[best]}",
+            flush=True,
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    """Start a headless search or report.
+
+    The command line entry point for tuning without the GUI.
+
+    Args:
+        argv (Optional[List[str]]): the arguments. Defaults to the command line.
+    """
+    arguments = create_parser().parse_args(argv)
+    configure(arguments)
+    if arguments.command == "search":
+        if arguments.iterations is not None:
+            ParameterEvaluator.iterations_per_run = arguments.iterations
+        run_search(
+            arguments.areas, arguments.combinations, arguments.time_budget
+        )
+        return
+
+    if arguments.samples is not None:
+        HyperParameterReportGenerator.samples = arguments.samples
+    if arguments.runs is not None:
+        HyperParameterReportGenerator.runs = arguments.runs
+    run_reports(arguments.parameters, arguments.time_budget)
+
+
+if __name__ == "__main__":
+    main()
@@ -91,6 +91,8 @@ class OptionDisplayText(object):
         {
             AgentOptions.value_iteration_optimised: "Value Iteration",
             AgentOptions.q_learning: "Q-Learning",
+            AgentOptions.policy_iteration: "Policy Iteration",
+            AgentOptions.prioritized_sweeping: "Prioritized Sweeping",
         }
     )
 
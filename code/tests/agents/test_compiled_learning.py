@@ -0,0 +1,109 @@
+from typing import List
+
+from pytest import mark, raises
+
+from src.model.agents.q_learning.exploration_strategies.options import (
+    ExplorationStrategyOptions,
+)
+from src.model.hyperparameters.base_parameter_strategy import (
+    BaseHyperParameterStrategy,
+    HyperParameter,
+)
+from src.model.hyperparameters.report_generation.tuning_parameter_strategy import (  # noqa: E501
+    ParameterTuningStrategy,
+)
+from src.model.learning_system.learning_instance.compiled_learning_instance import (  # noqa: E501
+    CompiledLearningInstance,
+)
+from src.model.learning_system.learning_instance.learning_instance import (
+    LearningInstance,
+)
+from src.model.learning_system.top_level_entities.factory import EntityFactory
+from src.model.learning_system.top_level_entities.options import (
+    AgentOptions,
+    DynamicsOptions,
+    TopEntitiesOptions,
+)
+
+iterations = 300
+
+
+def sequential_rewards(
+    options: TopEntitiesOptions, hyper_parameters: BaseHyperParameterStrategy
+) -> List[float]:
+    entities = EntityFactory.create_entities(options, hyper_parameters, True)
+    learning_instance = LearningInstance(entities)
+    return [
+        learning_instance.perform_action().reward for _ in range(iterations)
+    ]
+
+
+# exploration ratio zero decays to the minimum, effectively greedy
+deterministic_parameters = (
+    (
+        ExplorationStrategyOptions.upper_confidence_bound,
+        HyperParameter.replay_queue_length,
+        0,
+    ),
+    (
+        ExplorationStrategyOptions.upper_confidence_bound,
+        HyperParameter.replay_queue_length,
+        3,
+    ),
+    (
+        ExplorationStrategyOptions.epsilon_greedy,
+        HyperParameter.eg_initial_exploration_ratio,
+        0,
+    ),
+)
+
+
+@mark.parametrize("dynamics", list(DynamicsOptions))
+@mark.parametrize("strategy, parameter, value", deterministic_parameters)
+def test_matches_sequential(
+    dynamics: DynamicsOptions,
+    strategy: ExplorationStrategyOptions,
+    parameter: HyperParameter,
+    value: float,
+):
+    options = TopEntitiesOptions(AgentOptions.q_learning, dynamics, strategy)
+    hyper_parameters = ParameterTuningStrategy(parameter, value)
+
+    record = CompiledLearningInstance(options, hyper_parameters).run(iterations)
+
+    expected = sequential_rewards(options, hyper_parameters)
+    assert record.time_step == iterations
+    assert record.reward_history == expected
+    assert record.total_reward == sum(expected)
+
+
+def test_seeded_runs_repeat():
+    options = TopEntitiesOptions(
+        AgentOptions.q_learning,
+        DynamicsOptions.cliff,
+        ExplorationStrategyOptions.epsilon_greedy,
+    )
+    hyper_parameters = ParameterTuningStrategy(
+        HyperParameter.eg_initial_exploration_ratio, 1
+    )
+
+    first, second = (
+        CompiledLearningInstance(options, hyper_parameters, seed=1).run(
+            iterations
+        )
+        for _ in range(2)
+    )
+
+    assert first == second
+
+
+def test_rejects_unsupported():
+    options = TopEntitiesOptions(
+        AgentOptions.q_learning,
+        DynamicsOptions.cliff,
+        ExplorationStrategyOptions.mf_bpi,
+    )
+    with raises(ValueError):
+        CompiledLearningInstance(
+            options, ParameterTuningStrategy(HyperParameter.learning_rate, 0.1)
+        )
@@ -0,0 +1,71 @@
+from os import utime
+
+import numpy as np
+from numpy import testing
+
+from src.model.agents.value_iteration.agent_optimised import (
+    ValueIterationAgentOptimised,
+)
+from src.model.agents.value_iteration.distribution_cache import (
+    DistributionCache,
+)
+from src.model.agents.value_iteration.dynamics_distribution import (
+    DynamicsDistribution,
+)
+from src.model.dynamics.collection_dynamics import CollectionDynamics
+from src.model.hyperparameters.config_parameter_strategy import (
+    ParameterConfigStrategy,
+)
+from tests.state_value.mocks import TestAgentConfig
+
+
+def test_cached_distribution(dynamics: CollectionDynamics, tmp_path):
+    cache = DistributionCache(str(tmp_path))
+    compiled = DynamicsDistribution(1, dynamics)
+    cache.compile_distribution(compiled)
+
+    loaded = DynamicsDistribution(1, dynamics)
+    cache.compile_distribution(loaded)
+
+    assert loaded.has_compiled()
+    for expected, actual in zip(compiled.get_arrays(), loaded.get_arrays()):
+        assert isinstance(actual, np.memmap)
+        assert not actual.flags.writeable
+        testing.assert_array_equal(expected, actual)
+    assert loaded.observations == compiled.observations
+
+
+def test_cached_value_table(dynamics: CollectionDynamics, tmp_path, mocker):
+    mocker.patch.object(
+        ValueIterationAgentOptimised,
+        "distribution_cache",
+        DistributionCache(str(tmp_path)),
+    )
+    compute = mocker.spy(ValueIterationAgentOptimised, "compute_value_table")
+    hyper_parameters = ParameterConfigStrategy(TestAgentConfig())
+
+    first = ValueIterationAgentOptimised(hyper_parameters, dynamics)
+    second = ValueIterationAgentOptimised(hyper_parameters, dynamics)
+
+    testing.assert_array_equal(
+        first.get_value_table(), second.get_value_table()
+    )
+    assert compute.call_count == 1
+
+
+def test_eviction(tmp_path):
+    cache = DistributionCache(str(tmp_path))
+    entry_array = np.zeros(1000)
+    # room for two entries including their headers
+    cache.max_size = entry_array.nbytes * 2 + 1024
+
+    for age, key in enumerate(("oldest", "middle", "newest")):
+        cache.store(key, {"array": entry_array})
+        utime(cache.entry_path(key), (age, age))
+    assert cache.load("oldest", ["array"]) is None
+    assert cache.load("middle", ["array"]) is not None
+
+    cache.store("latest", {"array": entry_array})
+    # loading the middle entry made the newest the least recently used
+    assert cache.load("newest", ["array"]) is None
+    assert cache.load("middle", ["array"]) is not None
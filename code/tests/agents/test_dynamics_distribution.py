@@ -1,7 +1,17 @@
+from random import choice
+
+import pytest
+
 from src.model.agents.value_iteration.dynamics_distribution import (
     DynamicsDistribution,
 )
+from src.model.dynamics.actions import Action
+from src.model.dynamics.base_dynamics import BaseDynamics
+from src.model.state.state_builder import StateBuilder
+from src.model.state.state_instance import StateInstance
 from tests.agents.agent_dynamics_mock import VacuumDynamics
+from tests.dynamics.mini_config import MockGridWorldConfig
+from tests.state_value.mocks import SimpleTestDynamics
 
 
 def test_get_numpy_arrays():
@@ -17,24 +27,140 @@ def test_get_numpy_arrays():
     }
 
     (
-        lookup_table,
+        row_pointers,
         next_state,
         expected_reward,
         frequency,
     ) = dd.get_array_representation()
 
-    assert lookup_table[0, 0, 0] == 0
-    assert lookup_table[0, 0, 1] == 2
-    assert lookup_table[0, 1, 0] == 2
-    assert lookup_table[0, 1, 1] == 5
+    action_count = len(Action)
+    assert row_pointers.shape == (3 * action_count + 1,)
+    # state 0 action 1 then state 0 action 2
+    assert row_pointers[1] == 0
+    assert row_pointers[2] == 2
+    assert row_pointers[3] == 5
+
+    state_one_up = action_count + 1
+    start = row_pointers[state_one_up]
+    assert start + 1 == row_pointers[state_one_up + 1]
+    assert next_state[start] == 5
+    assert next_state[row_pointers[state_one_up + 1]] == 6
+
+    assert expected_reward[start] == 5
+    assert expected_reward[row_pointers[state_one_up + 1]] == 6
+
+    assert frequency[start] == 1
+    assert frequency[row_pointers[state_one_up + 1]] == 1
+
+    # the dictionary view is kept as it was provided
+    assert dd.observations[1][2] == {6: (6, 1)}
+
+
+def test_get_sparse_representation():
+    dd = DynamicsDistribution(100, VacuumDynamics())
+    dd.compile()
+    state_count = dd.get_state_count()
+
+    (
+        row_pointers,
+        next_state,
+        frequency,
+        expected_reward,
+    ) = dd.get_sparse_representation()
+
+    assert row_pointers.shape == (state_count * len(Action) + 1,)
+    assert row_pointers[-1] == len(next_state) == len(frequency)
+    for state in range(state_count):
+        for action in Action:
+            row = state * len(Action) + action.value
+            start, end = row_pointers[row], row_pointers[row + 1]
+            distribution = dd.observations[state][action.value]
+            assert list(next_state[start:end]) == list(distribution)
+            assert expected_reward[row] == sum(
+                reward * chance for reward, chance in distribution.values()
+            )
+
+
+def test_lazy_observations():
+    dd = DynamicsDistribution(100, VacuumDynamics())
+    dd.compile()
+
+    assert dd.observations_view is None
+    observations = dd.observations
+    assert list(observations) == list(dd.list_states())
+    for state, actions in observations.items():
+        for action, distribution in actions.items():
+            row = state * len(Action) + action
+            start, end = dd.row_pointers[row], dd.row_pointers[row + 1]
+            assert list(distribution) == list(dd.next_states[start:end])
+
+
+def test_parallel_compile(monkeypatch):
+    serial = DynamicsDistribution(20, SimpleTestDynamics())
+    monkeypatch.setattr(DynamicsDistribution, "worker_count", 1)
+    serial.compile()
+
+    parallel = DynamicsDistribution(20, SimpleTestDynamics())
+    monkeypatch.setattr(DynamicsDistribution, "worker_count", 2)
+    monkeypatch.setattr(DynamicsDistribution, "parallel_level_size", 1)
+    parallel.compile()
+
+    assert parallel.observations.keys() == serial.observations.keys()
+    for actions in parallel.observations.values():
+        assert set(actions) == {action.value for action in Action}
+        for distribution in actions.values():
+            frequencies = [chance for _, chance in distribution.values()]
+            assert sum(frequencies) == pytest.approx(1)
+
+
+class RandomWalkDynamics(BaseDynamics):
+    """Moves in a random direction, states get ids as they are found."""
+
+    def __init__(self) -> None:
+        super().__init__(MockGridWorldConfig())
+
+    def is_stochastic(self) -> bool:
+        return True
+
+    def initial_state(self) -> StateInstance:
+        return StateBuilder().set_agent_location((0, 0)).build()
+
+    def next(
+        self, current_state: StateInstance, action: Action
+    ) -> tuple[StateInstance, float]:
+        next_location = self.grid_world.movement_action(
+            current_state.agent_location, choice(list(Action))
+        )
+        if not self.grid_world.is_in_bounds(next_location):
+            next_location = current_state.agent_location
+        next_state = StateBuilder(current_state).set_agent_location(
+            next_location
+        )
+        return next_state.build(), float(next_location == (2, 2))
+
 
-    assert next_state[lookup_table[1, 0, 0]] == 5
-    assert lookup_table[1, 0, 0] + 1 == lookup_table[1, 0, 1]
-    assert next_state[lookup_table[1, 0, 0]] == 5
-    assert next_state[lookup_table[1, 1, 0]] == 6
+def test_parallel_compile_discovers_states(monkeypatch):
+    serial = DynamicsDistribution(20, RandomWalkDynamics())
+    monkeypatch.setattr(DynamicsDistribution, "worker_count", 1)
+    serial.compile()
 
-    assert expected_reward[lookup_table[1, 0, 0]] == 5
-    assert expected_reward[lookup_table[1, 1, 0]] == 6
+    dynamics = RandomWalkDynamics()
+    parallel = DynamicsDistribution(20, dynamics)
+    monkeypatch.setattr(DynamicsDistribution, "worker_count", 4)
+    monkeypatch.setattr(DynamicsDistribution, "parallel_level_size", 1)
+    parallel.compile()
 
-    assert frequency[lookup_table[1, 0, 0]] == 1
-    assert frequency[lookup_table[1, 1, 0]] == 1
+    assert parallel.get_state_count() == serial.get_state_count()
+    state_pool = dynamics.state_pool
+    for state, actions in parallel.observations.items():
+        location = state_pool.get_state_from_id(state).agent_location
+        for distribution in actions.values():
+            for next_state in distribution:
+                next_location = state_pool.get_state_from_id(
+                    next_state
+                ).agent_location
+                distance = sum(
+                    abs(start - end)
+                    for start, end in zip(location, next_location)
+                )
+                assert distance <= 1
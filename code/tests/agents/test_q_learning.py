@@ -0,0 +1,232 @@
+import sys
+
+import numpy as np
+from pytest import raises
+
+from src.model.agents.q_learning.agent import QLearningAgent
+from src.model.agents.q_learning.exploration_strategies.options import (
+    ExplorationStrategyOptions,
+)
+from src.model.agents.q_learning.replay_buffer import ReplayBuffer
+from src.model.agents.q_learning.state_action_table import StateActionTable
+from src.model.dynamics.actions import Action
+from src.model.hyperparameters.config_parameter_strategy import (
+    ParameterConfigStrategy,
+)
+from src.model.transition_information import TransitionInformation
+from tests.state_value import mocks
+from tests.state_value.mocks import TestAgentConfig
+
+
+def create_agent(
+    strategy: ExplorationStrategyOptions, max_state_count: int = 10
+) -> QLearningAgent:
+    return QLearningAgent(
+        ParameterConfigStrategy(TestAgentConfig()), strategy, max_state_count
+    )
+
+
+def test_table_bounded():
+    table = StateActionTable(10, 3)
+    assert table.capacity == 10
+    assert np.all(table.row(9) == 3)
+
+    with raises(IndexError):
+        table.row(10)
+
+
+def test_table_growth():
+    table = StateActionTable(sys.maxsize, 1)
+    initial_capacity = table.capacity
+    table.row(2)[Action.left] = 5
+
+    table.row(initial_capacity * 3)[Action.up] = 7
+
+    assert table.capacity > initial_capacity * 3
+    assert table.row(2)[Action.left] == 5
+    assert table.row(initial_capacity * 3)[Action.up] == 7
+    assert table.row(initial_capacity * 2)[Action.up] == 1
+
+
+def test_record_transition():
+    agent = create_agent(ExplorationStrategyOptions.epsilon_greedy)
+    config = TestAgentConfig()
+    learning_rate = config.q_learning.learning_rate
+    optimism = config.q_learning.initial_optimism
+
+    agent.record_transition(TransitionInformation(0, Action.right, 1, 2))
+
+    expected = optimism + learning_rate * (
+        2 + config.discount_rate * optimism - optimism
+    )
+    assert agent.get_state_action_value(0, Action.right) == expected
+    assert agent.get_state_action_value(0, Action.left) == optimism
+    assert agent.get_state_value(0) == max(expected, optimism)
+    np.testing.assert_equal(
+        agent.get_action_values(0),
+        [optimism, optimism, optimism, expected],
+    )
+
+
+def test_greedy_selection():
+    agent = create_agent(ExplorationStrategyOptions.upper_confidence_bound)
+    agent.table.row(4)[Action.down] = 100
+
+    assert agent.evaluate_policy(4) is Action.down
+
+
+def test_batched_selection():
+    states = np.array([4, 1, 4, 9])
+    for strategy in (
+        ExplorationStrategyOptions.epsilon_greedy,
+        ExplorationStrategyOptions.upper_confidence_bound,
+        ExplorationStrategyOptions.mf_bpi,
+    ):
+        agent = create_agent(strategy)
+        agent.table.row(4)[Action.down] = 100
+        agent.table.row(1)[Action.left] = 50
+        agent.record_transition(TransitionInformation(9, Action.up, 1, 3))
+
+        values = agent.get_state_action_values(states)
+        assert values.shape == (len(states), len(Action))
+        for row, state in enumerate(states):
+            np.testing.assert_array_equal(
+                values[row], agent.get_action_values(state)
+            )
+            assert agent.get_state_values(states)[row] == (
+                agent.get_state_value(state)
+            )
+
+        actions = agent.evaluate_policy_batch(states)
+        assert actions.shape == states.shape
+        assert np.all((actions >= 0) & (actions < len(Action)))
+
+    greedy = create_agent(ExplorationStrategyOptions.epsilon_greedy)
+    greedy.strategy.exploration_ratio = 0
+    greedy.table.row(4)[Action.down] = 100
+    greedy.table.row(1)[Action.left] = 50
+    assert list(greedy.evaluate_policy_batch(states[:3])) == [
+        Action.down.value,
+        Action.left.value,
+        Action.down.value,
+    ]
+
+
+def reference_replay(table, queue, learning_rate, discount_rate):
+    for obs in queue:
+        observed_value = obs.reward + discount_rate * table[obs.new_state].max()
+        index = (obs.previous_state, obs.previous_action)
+        table[index] += learning_rate * (observed_value - table[index])
+
+
+def test_replay_matches_sequential_order():
+    generator = np.random.default_rng(3)
+    state_count = 6
+    capacity = 4
+    learning_rate = 0.3
+    discount_rate = 0.8
+
+    buffer = ReplayBuffer(capacity)
+    table = np.ones((state_count, len(Action)))
+    expected_table = table.copy()
+    queue = []
+
+    for _ in range(20):
+        transition = TransitionInformation(
+            int(generator.integers(state_count)),
+            Action(int(generator.integers(len(Action)))),
+            int(generator.integers(state_count)),
+            float(generator.normal()),
+        )
+        queue.insert(0, transition)
+        del queue[capacity:]
+        reference_replay(expected_table, queue, learning_rate, discount_rate)
+
+        buffer.push(transition)
+        buffer.replay(table, learning_rate, discount_rate)
+
+    assert len(buffer) == capacity
+    np.testing.assert_allclose(table, expected_table)
+
+
+def test_mf_bpi_counts_visits(mocker):
+    ensemble_size = 5
+    mocker.patch.object(
+        mocks.TestMFBPIConfig,
+        "ensemble_size",
+        new_callable=mocker.PropertyMock,
+        return_value=ensemble_size,
+    )
+    agent = create_agent(ExplorationStrategyOptions.mf_bpi, max_state_count=6)
+    strategy = agent.strategy
+
+    # the next state varies but only the state action is counted
+    for new_state in (1, 2, 1):
+        strategy.record_transition(
+            TransitionInformation(0, Action.right, new_state, 1)
+        )
+    strategy.record_transition(TransitionInformation(2, Action.up, 3, 0))
+
+    visits = strategy._ensemble_state_action_visits  # noqa: WPS437
+    subset_size = int(strategy.ensemble_subset_factor * ensemble_size)
+    assert visits.shape == (ensemble_size, 6, len(Action))
+    right_visits = visits[:, 0, Action.right.value]
+    up_visits = visits[:, 2, Action.up.value]
+    assert right_visits.sum() == 3 * subset_size
+    assert np.all((right_visits >= 0) & (right_visits <= 3))
+    assert up_visits.sum() == subset_size
+    assert np.all((up_visits >= 0) & (up_visits <= 1))
+    assert visits.sum() == 4 * subset_size
+    state_visits = strategy._state_visits  # noqa: WPS437
+    assert list(state_visits) == [3, 0, 1, 0, 0, 0]
+
+    policy = strategy._policy  # noqa: WPS437
+    assert np.all(np.isfinite(policy))
+    assert np.allclose(policy.sum(axis=1), 1)
+
+
+def test_mf_bpi_sorted_ensemble(mocker):
+    mocker.patch.object(
+        mocks.TestMFBPIConfig,
+        "ensemble_size",
+        new_callable=mocker.PropertyMock,
+        return_value=7,
+    )
+    strategy = create_agent(ExplorationStrategyOptions.mf_bpi).strategy
+    for state in range(5):
+        strategy.record_transition(
+            TransitionInformation(state, Action.up, state, state + 1)
+        )
+
+    q_table = strategy._q_table  # noqa: WPS437
+    sorted_q_table = strategy._sorted_q_table  # noqa: WPS437
+    assert np.array_equal(sorted_q_table, np.sort(q_table, axis=0))
+
+    ensemble_quantile = getattr(strategy, "_MFBPIStrategy__ensemble_quantile")
+    for quantile in (0, 0.3, 1):
+        assert np.allclose(
+            ensemble_quantile(sorted_q_table, quantile),
+            np.quantile(q_table, quantile, axis=0),
+        )
+
+
+def test_mf_bpi_step_updates_recorded_state(mocker):
+    mocker.patch.object(
+        mocks.TestMFBPIConfig,
+        "ensemble_size",
+        new_callable=mocker.PropertyMock,
+        return_value=7,
+    )
+    strategy = create_agent(ExplorationStrategyOptions.mf_bpi).strategy
+    table_names = ("_q_table", "_m_table", "_sorted_q_table", "_sorted_m_table")
+    tables_before = [getattr(strategy, name).copy() for name in table_names]
+
+    strategy.record_transition(TransitionInformation(2, Action.left, 3, 1))
+
+    recorded = np.zeros((10, len(Action)), dtype=bool)
+    recorded[2, Action.left.value] = True
+    for name, table_before in zip(table_names, tables_before):
+        changed = np.any(getattr(strategy, name) != table_before, axis=0)
+        assert np.array_equal(changed, recorded)
+    # the policy of every state follows the sampled quantile
+    assert np.allclose(strategy._policy.sum(axis=1), 1)  # noqa: WPS437
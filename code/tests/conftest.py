@@ -0,0 +1,23 @@
+from itertools import cycle
+
+from pytest import fixture
+
+from src.model.dynamics.collection_dynamics import CollectionDynamics
+from src.model.dynamics.grid_world import GridWorld
+from tests.dynamics.mini_config import (
+    MockGridWorldConfig,
+    test_goal_a,
+    test_goal_b,
+)
+
+
+@fixture
+def dynamics(mocker):
+    locations_mock = mocker.patch.object(GridWorld, "random_in_bounds_cell")
+    locations_mock.side_effect = cycle(
+        [
+            test_goal_a,
+            test_goal_b,
+        ]
+    )
+    return CollectionDynamics(MockGridWorldConfig())
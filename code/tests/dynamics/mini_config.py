@@ -1,5 +1,16 @@
 from src.model.config.grid_world_section import GridWorldConfig
 
+"""
+Test Grid Initially:
+
+ x G x
+ x x A
+ G x x
+
+"""
+test_goal_a = (1, 2)
+test_goal_b = (0, 0)
+
 
 class MockGridWorldConfig(GridWorldConfig):
     def __init__(self) -> None:
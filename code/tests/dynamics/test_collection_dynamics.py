@@ -1,35 +1,8 @@
-from itertools import cycle
-
-from pytest import fixture
-
 from src.model.dynamics.actions import Action
 from src.model.dynamics.collection_dynamics import CollectionDynamics
 from src.model.dynamics.grid_world import GridWorld
 
-from .mini_config import MockGridWorldConfig
-
-"""
-Test Grid Initially:
-
- x G x
- x x A
- G x x
-
-"""
-test_goal_a = (1, 2)
-test_goal_b = (0, 0)
-
-
-@fixture
-def dynamics(mocker):
-    locations_mock = mocker.patch.object(GridWorld, "random_in_bounds_cell")
-    locations_mock.side_effect = cycle(
-        [
-            test_goal_a,
-            test_goal_b,
-        ]
-    )
-    return CollectionDynamics(MockGridWorldConfig())
+from .mini_config import MockGridWorldConfig, test_goal_a, test_goal_b
 
 
 def test_fixture(dynamics: CollectionDynamics):
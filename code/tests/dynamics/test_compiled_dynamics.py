@@ -0,0 +1,30 @@
+import numpy as np
+from pytest import raises
+
+from src.model.dynamics.actions import Action
+from src.model.dynamics.collection_dynamics import CollectionDynamics
+from src.model.dynamics.compiled_dynamics import CompiledDynamics
+from tests.state_value.mocks import SimpleTestDynamics
+
+from .test_collection_dynamics import expected_state_count
+
+
+def test_matches_dynamics(dynamics: CollectionDynamics):
+    compiled = CompiledDynamics(dynamics)
+
+    assert compiled.initial_state_id() == dynamics.initial_state_id()
+    next_states, rewards = compiled.get_transition_tables()
+    assert next_states.shape == (expected_state_count(), len(Action))
+    assert np.all(next_states >= 0)
+
+    for state in range(expected_state_count()):
+        for action in Action:
+            expected = dynamics.next_state_id(state, action)
+            assert compiled.next_state_id(state, action) == expected
+            assert next_states[state, action] == expected[0]
+            assert rewards[state, action] == expected[1]
+
+
+def test_rejects_stochastic():
+    with raises(ValueError):
+        CompiledDynamics(SimpleTestDynamics())
@@ -7,7 +7,7 @@ from src.model.agents.value_iteration.dynamics_distribution import (
 )
 from src.model.dynamics.base_dynamics import BaseDynamics
 
-from .test_collection_dynamics import dynamics, expected_state_count
+from .test_collection_dynamics import expected_state_count
 
 
 def test_sequential_integers(dynamics: BaseDynamics):
@@ -0,0 +1,47 @@
+from numpy import testing
+
+from src.model.dynamics.collection_dynamics import CollectionDynamics
+from src.model.dynamics.compiled_dynamics import CompiledDynamics
+from src.model.dynamics.shared_transition_tables import (
+    SharedTransitionTables,
+)
+
+
+def test_attached_tables(dynamics: CollectionDynamics, mocker):
+    mocker.patch.object(SharedTransitionTables, "attached", {})
+    mocker.patch.object(SharedTransitionTables, "attached_memory", [])
+    compiled = CompiledDynamics(dynamics)
+    next_states, rewards = compiled.get_transition_tables()
+
+    publisher = SharedTransitionTables()
+    handle = publisher.publish(
+        dynamics.cache_key(), compiled.initial_state_id(), next_states, rewards
+    )
+    SharedTransitionTables.attach([handle])
+    publisher.close()
+
+    # the compiled tables are not recomputed
+    explore = mocker.patch.object(dynamics, "next_state_id")
+    shared = CompiledDynamics(dynamics)
+    shared_next_states, shared_rewards = shared.get_transition_tables()
+    explore.assert_not_called()
+
+    assert shared.initial_state_id() == compiled.initial_state_id()
+    assert not shared_next_states.flags.writeable
+    testing.assert_array_equal(shared_next_states, next_states)
+    testing.assert_array_equal(shared_rewards, rewards)
+
+
+def test_released_tables_are_skipped(dynamics: CollectionDynamics, mocker):
+    mocker.patch.object(SharedTransitionTables, "attached", {})
+    compiled = CompiledDynamics(dynamics)
+    next_states, rewards = compiled.get_transition_tables()
+
+    publisher = SharedTransitionTables()
+    handle = publisher.publish(
+        dynamics.cache_key(), compiled.initial_state_id(), next_states, rewards
+    )
+    publisher.close()
+    SharedTransitionTables.attach([handle])
+
+    assert SharedTransitionTables.lookup(dynamics.cache_key()) is None
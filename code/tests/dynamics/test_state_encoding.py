@@ -0,0 +1,45 @@
+from src.model.dynamics.actions import Action
+from src.model.dynamics.base_dynamics import BaseDynamics
+from src.model.dynamics.cliff_dynamics import CliffDynamics
+from src.model.dynamics.collection_dynamics import CollectionDynamics
+
+from .mini_config import MockGridWorldConfig
+from .test_collection_dynamics import expected_state_count
+
+
+def assert_consistent_encoding(dynamics: BaseDynamics):
+    state_pool = dynamics.state_pool
+    state_ids = list(state_pool.list_state_ids())
+    assert state_ids == list(range(dynamics.state_count_upper_bound()))
+
+    initial_state = dynamics.initial_state()
+    assert state_pool.get_state_id(initial_state) == dynamics.initial_state_id()
+
+    for state_id in state_ids:
+        state = state_pool.get_state_from_id(state_id)
+        assert state_pool.get_state_id(state) == state_id
+        assert state_pool.is_existing_state(state)
+        for action in Action:
+            next_state, reward = dynamics.next(state, action)
+            next_id, next_id_reward = dynamics.next_state_id(state_id, action)
+            assert state_pool.get_state_id(next_state) == next_id
+            assert reward == next_id_reward
+
+
+def test_collection_encoding(dynamics: CollectionDynamics):
+    assert dynamics.state_count_upper_bound() == expected_state_count()
+    assert_consistent_encoding(dynamics)
+
+
+def test_cliff_encoding():
+    dynamics = CliffDynamics(MockGridWorldConfig())
+    assert dynamics.state_count_upper_bound() == 9
+    assert_consistent_encoding(dynamics)
+
+
+def test_lazy_state_instances(dynamics: CollectionDynamics):
+    state_id = dynamics.initial_state_id()
+    for action in Action:
+        state_id, _ = dynamics.next_state_id(state_id, action)
+
+    assert not dynamics.state_pool.id_to_state
@@ -0,0 +1,62 @@
+from src.model.agents.q_learning.exploration_strategies.options import (
+    ExplorationStrategyOptions,
+)
+from src.model.hyperparameters.base_parameter_strategy import HyperParameter
+from src.model.hyperparameters.random_search.random_search_data import (
+    RandomSearchState,
+    SearchArea,
+    SearchResult,
+    SearchUpdate,
+)
+from src.model.learning_system.top_level_entities.options import (
+    AgentOptions,
+    DynamicsOptions,
+    TopEntitiesOptions,
+)
+
+options = TopEntitiesOptions(
+    AgentOptions.q_learning,
+    DynamicsOptions.cliff,
+    ExplorationStrategyOptions.epsilon_greedy,
+)
+
+
+def initial_state() -> RandomSearchState:
+    return RandomSearchState(
+        None, {options: SearchArea(options, {}, None, 0)}, searching=True
+    )
+
+
+def test_apply_update():
+    worse = {HyperParameter.learning_rate: 0.1}
+    better = {HyperParameter.learning_rate: 0.5}
+    update = SearchUpdate(
+        (
+            SearchResult(options, worse, 10),
+            SearchResult(options, better, 20),
+            SearchResult(options, worse, 15),
+            # discarded before being fully evaluated
+            SearchResult(options, worse, None),
+        )
+    )
+
+    state = initial_state()
+    new_state = state.apply_update(update)
+
+    area = new_state.search_areas[options]
+    assert area.combinations_tried == 4
+    assert area.best_value == 20
+    assert area.best_parameters == better
+    # the previous state is unchanged
+    assert state.search_areas[options].combinations_tried == 0
+
+
+def test_apply_optimal_rewards():
+    optimal_rewards = {DynamicsOptions.cliff: 100.0}
+
+    state = initial_state().apply_update(
+        SearchUpdate(optimal_rewards=optimal_rewards)
+    )
+
+    assert state.optimal_rewards == optimal_rewards
+    assert state.search_areas[options].combinations_tried == 0
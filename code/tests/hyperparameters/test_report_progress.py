@@ -0,0 +1,83 @@
+from ctypes import c_int64
+from multiprocessing.sharedctypes import RawArray, RawValue
+
+from src.model.hyperparameters.base_parameter_strategy import HyperParameter
+from src.model.hyperparameters.parameter_evaluator import ParameterEvaluator
+from src.model.hyperparameters.report_generation.report_data import (
+    HyperParameterReport,
+    ReportState,
+    incomplete_progress_cap,
+)
+from src.model.hyperparameters.report_generation.report_generator import (
+    HyperParameterReportGenerator,
+)
+from src.model.hyperparameters.shared_flag import SharedFlag
+from src.model.learning_system.learning_instance.statistics_record import (
+    StatisticsRecord,
+)
+
+parameter = HyperParameter.learning_rate
+
+
+def test_progress_from_counters():
+    generator = HyperParameterReportGenerator()
+    generator.state.set(ReportState(parameter, {parameter: 0}, {}))
+    counters = RawArray(c_int64, 4)
+    generator.progress_counters[parameter] = counters
+    scheduled_runs = RawValue(c_int64, 4 * generator.initial_runs)
+    generator.scheduled_runs[parameter] = scheduled_runs
+
+    counters[0] = generator.initial_runs
+    counters[1] = generator.initial_runs
+    assert generator.get_state().pending_requests[parameter] == 0.5
+
+    # progress is measured against the runs scheduled so far
+    scheduled_runs.value += generator.additional_runs
+    counters[2] = generator.initial_runs
+    counters[3] = generator.initial_runs + generator.additional_runs
+    assert (
+        generator.get_state().pending_requests[parameter]
+        == incomplete_progress_cap
+    )
+
+    report = HyperParameterReport(parameter, [], [], [], [])
+    generator.state.set(generator.state.get().complete_request(report))
+    assert parameter in generator.get_state().available_reports
+    assert parameter not in generator.progress_counters
+    assert parameter not in generator.scheduled_runs
+
+
+def test_simulate_rewards_counts_runs(mocker):
+    runs = 3
+    mocker.patch.object(
+        ParameterEvaluator,
+        "batch_run",
+        return_value=[
+            StatisticsRecord(1, [reward], reward, 0) for reward in range(runs)
+        ],
+    )
+    counters = RawArray(c_int64, 3)
+    mocker.patch.object(
+        HyperParameterReportGenerator, "sample_progress", counters
+    )
+
+    rewards = HyperParameterReportGenerator.simulate_rewards(
+        parameter, 0.5, 1, runs, SharedFlag(initial_value=True)
+    )
+
+    assert rewards == list(range(runs))
+    assert list(counters) == [0, runs, 0]
+
+
+def test_select_uncertain_samples(mocker):
+    mocker.patch.object(HyperParameterReportGenerator, "runs", 10)
+    converged_low = [0.0] * 5
+    uncertain_low = [0, 50, 0, 50, 0]
+    converged_best = [100.0] * 5
+    capped = [0, 50] * 5
+
+    selected = HyperParameterReportGenerator.select_uncertain_samples(
+        [converged_low, uncertain_low, converged_best, capped]
+    )
+
+    assert selected == [1]
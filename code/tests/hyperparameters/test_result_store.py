@@ -0,0 +1,130 @@
+import sqlite3
+from contextlib import closing
+
+from src.model.agents.q_learning.exploration_strategies.options import (
+    ExplorationStrategyOptions,
+)
+from src.model.hyperparameters.base_parameter_strategy import HyperParameter
+from src.model.hyperparameters.parameter_evaluator import ParameterEvaluator
+from src.model.hyperparameters.random_search.random_search_data import (
+    RandomSearchState,
+    SearchArea,
+    SearchResult,
+    SearchUpdate,
+)
+from src.model.hyperparameters.report_generation.report_data import (
+    HyperParameterReport,
+)
+from src.model.hyperparameters.result_store import ResultStore
+from src.model.learning_system.top_level_entities.options import (
+    AgentOptions,
+    DynamicsOptions,
+    TopEntitiesOptions,
+)
+
+options = TopEntitiesOptions(
+    AgentOptions.q_learning,
+    DynamicsOptions.cliff,
+    ExplorationStrategyOptions.epsilon_greedy,
+)
+empty_state = RandomSearchState(
+    None, {options: SearchArea(options, {}, None, 0)}, searching=False
+)
+
+
+def test_restores_best_results(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+    worse = {HyperParameter.learning_rate: 0.1}
+    better = {HyperParameter.learning_rate: 0.5}
+
+    store.record_updates(
+        [
+            SearchUpdate((SearchResult(options, worse, None, 10),)),
+            SearchUpdate(
+                (
+                    SearchResult(options, worse, 10, 100),
+                    SearchResult(options, better, 20, 100),
+                ),
+                {DynamicsOptions.cliff: 30},
+            ),
+        ],
+        seed=1,
+    )
+    store.record_updates(
+        [SearchUpdate((SearchResult(options, worse, 15, 100),))], seed=2
+    )
+
+    state = ResultStore(store.database_path).load_search_state(empty_state)
+    area = state.search_areas[options]
+    assert area.best_value == 20
+    assert area.best_parameters[HyperParameter.learning_rate] == 0.5
+    assert area.best_parameters[HyperParameter.discount_rate] is None
+    assert area.combinations_tried == 4
+    assert state.optimal_rewards == {DynamicsOptions.cliff: 30}
+
+    recent = store.recent_results(options, 2)
+    assert [result.recorded_value for result in recent] == [20, 15]
+    assert recent[0].parameters[HyperParameter.learning_rate] == 0.5
+    assert recent[0].iterations == 100
+
+
+def test_new_store_is_empty(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+
+    assert store.load_search_state(empty_state) == empty_state
+    assert store.load_reports() == {}
+
+
+def test_stores_reports(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+    report = HyperParameterReport(
+        HyperParameter.learning_rate, [0, 1], [1, 2], [2, 3], [3, 4]
+    )
+
+    store.store_report(report)
+
+    assert store.load_reports() == {HyperParameter.learning_rate: report}
+
+
+def test_ignores_other_environments(tmp_path, monkeypatch):
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+    parameters = {HyperParameter.learning_rate: 0.5}
+    report = HyperParameterReport(
+        HyperParameter.learning_rate, [0, 1], [1, 2], [2, 3], [3, 4]
+    )
+    store.record_updates(
+        [
+            SearchUpdate(
+                (SearchResult(options, parameters, 20, 100),),
+                {DynamicsOptions.cliff: 30},
+            )
+        ],
+        seed=1,
+    )
+    store.store_report(report)
+
+    # rewards found with longer runs are not comparable
+    monkeypatch.setattr(
+        ParameterEvaluator,
+        "iterations_per_run",
+        ParameterEvaluator.iterations_per_run * 2,
+    )
+    assert store.load_search_state(empty_state) == empty_state
+    assert store.recent_results(options, 1) == []
+    assert store.load_reports() == {}
+
+    monkeypatch.undo()
+    assert store.load_search_state(empty_state).optimal_rewards == {
+        DynamicsOptions.cliff: 30
+    }
+    assert store.load_reports() == {HyperParameter.learning_rate: report}
+
+
+def test_clears_older_schema(tmp_path):
+    database_path = tmp_path / "results.sqlite"
+    with closing(sqlite3.connect(database_path)) as connection:
+        connection.execute("CREATE TABLE reports (parameter, report)")
+        connection.execute("INSERT INTO reports VALUES (1, '{}')")
+        connection.commit()
+
+    assert ResultStore(str(database_path)).load_reports() == {}
@@ -0,0 +1,81 @@
+from pytest import raises
+
+from src.model.agents.q_learning.exploration_strategies.options import (
+    ExplorationStrategyOptions,
+)
+from src.model.hyperparameters.base_parameter_strategy import HyperParameter
+from src.model.hyperparameters.parameter_evaluator import ParameterEvaluator
+from src.model.hyperparameters.random_search.successive_halving import (
+    SuccessiveHalving,
+)
+from src.model.hyperparameters.shared_flag import SharedFlag
+from src.model.learning_system.top_level_entities.options import (
+    AgentOptions,
+    DynamicsOptions,
+    TopEntitiesOptions,
+)
+
+options = TopEntitiesOptions(
+    AgentOptions.q_learning,
+    DynamicsOptions.cliff,
+    ExplorationStrategyOptions.epsilon_greedy,
+)
+
+
+def fake_rewards(options, candidates, running, iterations):
+    # the reward grows with the learning rate and the length of the run
+    return [
+        candidate.get_value(HyperParameter.learning_rate) * iterations
+        for candidate in candidates
+    ]
+
+
+def test_rung_iterations(mocker):
+    mocker.patch.object(ParameterEvaluator, "iterations_per_run", 900)
+
+    assert SuccessiveHalving(2, 3, 3).rung_iterations() == [100, 300, 900]
+    assert SuccessiveHalving(2, 3, 1).rung_iterations() == [900]
+
+
+def test_promotes_best(mocker):
+    evaluate = mocker.patch.object(
+        ParameterEvaluator, "evaluate_rewards", side_effect=fake_rewards
+    )
+
+    results = SuccessiveHalving(2, 3, 3).search(
+        options, SharedFlag(initial_value=True)
+    )
+
+    assert [len(call.args[1]) for call in evaluate.call_args_list] == [
+        18,
+        6,
+        2,
+    ]
+    assert len(results) == 18
+    recorded = [result for result in results if result.recorded_value]
+    assert len(recorded) == 2
+
+    learning_rates = sorted(
+        result.parameters[HyperParameter.learning_rate] for result in results
+    )
+    best_rates = sorted(
+        result.parameters[HyperParameter.learning_rate] for result in recorded
+    )
+    assert best_rates == learning_rates[-2:]
+
+
+def test_stopped_search(mocker):
+    mocker.patch.object(
+        ParameterEvaluator, "evaluate_rewards", side_effect=fake_rewards
+    )
+
+    results = SuccessiveHalving(2, 3, 3).search(
+        options, SharedFlag(initial_value=False)
+    )
+
+    assert results is None
+
+
+def test_invalid_counts():
+    with raises(ValueError):
+        SuccessiveHalving(0, 3, 3)
@@ -0,0 +1,98 @@
+import numpy as np
+
+from src.model.agents.q_learning.exploration_strategies.options import (
+    ExplorationStrategyOptions,
+)
+from src.model.hyperparameters.base_parameter_strategy import HyperParameter
+from src.model.hyperparameters.random_search.random_search_data import (
+    SearchResult,
+)
+from src.model.hyperparameters.random_search.search_history import (
+    SearchHistory,
+)
+from src.model.hyperparameters.random_search.tree_parzen_estimator import (
+    TreeParzenEstimator,
+)
+from src.model.hyperparameters.random_search.tree_parzen_parameter_strategy import (  # noqa: E501
+    TreeParzenParameterStrategy,
+)
+from src.model.hyperparameters.tuning_information import TuningInformation
+from src.model.learning_system.top_level_entities.options import (
+    AgentOptions,
+    DynamicsOptions,
+    TopEntitiesOptions,
+)
+
+options = TopEntitiesOptions(
+    AgentOptions.q_learning,
+    DynamicsOptions.cliff,
+    ExplorationStrategyOptions.epsilon_greedy,
+)
+
+
+def test_proposes_near_best():
+    generator = np.random.default_rng(0)
+    positions = generator.random((200, 2))
+    # only the first parameter matters, best at 0.8
+    rewards = -np.abs(positions[:, 0] - 0.8)
+    positions[:, 1] = np.nan
+
+    estimator = TreeParzenEstimator(positions, rewards, seed=1)
+    proposals = [estimator.propose() for _ in range(50)]
+
+    assert all(proposal[1] is None for proposal in proposals)
+    assert abs(np.median([proposal[0] for proposal in proposals]) - 0.8) < 0.1
+
+
+def test_discarded_results_are_not_modelled():
+    positions = np.random.default_rng(0).random((100, 1))
+    rewards = np.full(100, -np.inf)
+
+    estimator = TreeParzenEstimator(positions, rewards)
+
+    assert estimator.propose() == [None]
+
+
+def test_strategy_uses_proposals():
+    learning_rate = list(TuningInformation.tunable_parameters()).index(
+        HyperParameter.learning_rate
+    )
+    positions = np.full((50, len(TuningInformation.parameter_details)), np.nan)
+    positions[:, learning_rate] = np.linspace(0, 1, 50)
+
+    strategy = TreeParzenParameterStrategy(
+        TreeParzenEstimator(positions, np.linspace(0, 1, 50))
+    )
+
+    parameters = strategy.get_parameters()
+    details = TuningInformation.get_parameter_details(
+        HyperParameter.learning_rate
+    )
+    assert details.min_value <= parameters[HyperParameter.learning_rate]
+    assert parameters[HyperParameter.learning_rate] <= details.max_value
+    assert parameters[HyperParameter.discount_rate] is None
+
+
+def test_history_records_results(mocker):
+    mocker.patch.object(SearchHistory, "capacity", 4)
+    history = SearchHistory(2)
+    details = TuningInformation.get_parameter_details(
+        HyperParameter.learning_rate
+    )
+    results = [
+        SearchResult(
+            options,
+            {HyperParameter.learning_rate: details.interpolate_value(0.5)},
+            recorded_value,
+        )
+        for recorded_value in (1, None, 3, 4, 5)
+    ]
+
+    history.record(1, results)
+
+    positions, rewards = history.observations(1)
+    assert sorted(rewards) == [-np.inf, 3, 4, 5]
+    learning_rate = history.parameters.index(HyperParameter.learning_rate)
+    assert np.allclose(positions[:, learning_rate], 0.5)
+    assert np.isnan(np.delete(positions, learning_rate, axis=1)).all()
+    assert len(history.observations(0)[1]) == 0
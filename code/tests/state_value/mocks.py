@@ -1,4 +1,8 @@
 from src.model.agents.base_agent import BaseAgent
+from src.model.agents.value_iteration.sweep_options import (
+    ConvergenceCheck,
+    SweepMode,
+)
 from src.model.config.agent_section.agent_section import AgentConfig
 from src.model.config.agent_section.epsilon_greedy import (
     EpsilonGreedyStrategyConfig,
@@ -126,7 +130,6 @@ class TestUCBStrategyConfig(UCBStrategyConfig):
 
 
 class TestMFBPIConfig(MFBPIConfig):
-
     @property
     def error_sensitivity(self) -> int:
         return 1
@@ -168,6 +171,18 @@ class TestValueIterationConfig(ValueIterationConfig):
     def sample_count(self) -> int:
         return 100
 
+    @property
+    def sweep_mode(self) -> SweepMode:
+        return SweepMode.gauss_seidel
+
+    @property
+    def convergence_check(self) -> ConvergenceCheck:
+        return ConvergenceCheck.absolute
+
+    @property
+    def max_sweeps(self) -> int:
+        return 10000
+
 
 class TestAgentConfig(AgentConfig):
     def __init__(self) -> None:
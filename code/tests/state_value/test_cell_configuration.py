@@ -0,0 +1,73 @@
+from src.model.agents.q_learning.exploration_strategies.options import (
+    ExplorationStrategyOptions,
+)
+from src.model.dynamics.actions import Action
+from src.model.learning_system.cell_configuration.cell_configuration_factory import (  # noqa: E501
+    CellConfigurationFactory,
+)
+from src.model.learning_system.learning_instance.statistics_recorder import (
+    StatisticsRecorder,
+)
+from src.model.learning_system.top_level_entities.container import (
+    EntityContainer,
+)
+from src.model.learning_system.top_level_entities.options import (
+    AgentOptions,
+    DynamicsOptions,
+    TopEntitiesOptions,
+)
+from src.model.state.cell_entities import CellEntity
+from tests.state_value.mocks import MockAgent, SimpleTestDynamics
+
+
+def create_factory() -> CellConfigurationFactory:
+    return CellConfigurationFactory(
+        EntityContainer(
+            MockAgent(-10, 100, 0, 100),
+            SimpleTestDynamics(),
+            StatisticsRecorder(),
+            TopEntitiesOptions(
+                AgentOptions.q_learning,
+                DynamicsOptions.collection,
+                ExplorationStrategyOptions.epsilon_greedy,
+            ),
+        )
+    )
+
+
+def test_cell_values():
+    cells = create_factory().get_cell_configuration(0)
+
+    left = cells[(0, 0)]
+    assert left.cell_entity is CellEntity.agent
+    assert left.cell_value_raw == -10
+    assert left.cell_value_normalised == 0
+    assert left.action_values_raw == {
+        Action.up: 0,
+        Action.down: 0,
+        Action.left: 100,
+        Action.right: 50,
+    }
+    assert left.action_values_normalised == {
+        Action.up: 0,
+        Action.down: 0,
+        Action.left: 1,
+        Action.right: 0.5,
+    }
+
+    right = cells[(1, 0)]
+    assert right.cell_entity is CellEntity.empty
+    assert right.cell_value_raw == 45
+    assert right.cell_value_normalised == 0.5
+
+
+def test_cells_share_entities():
+    factory = create_factory()
+    dynamics = factory.dynamics
+
+    state_ids = factory.cell_state_lookup.get_state_ids(dynamics.left_entity)
+
+    assert list(state_ids) == [2, 3]
+    cells = factory.get_cell_configuration(3)
+    assert cells[(0, 0)].cell_entity is CellEntity.goal
+    assert cells[(0, 0)].cell_value_normalised == 1
@@ -1,7 +1,19 @@
+from src.model.agents.q_learning.agent import QLearningAgent
+from src.model.agents.q_learning.exploration_strategies.options import (
+    ExplorationStrategyOptions,
+)
 from src.model.dynamics.actions import Action
+from src.model.hyperparameters.config_parameter_strategy import (
+    ParameterConfigStrategy,
+)
 from src.model.learning_system.value_standardisation.normaliser_factory import (
     NormaliserFactory,
 )
+from src.model.learning_system.value_standardisation.value_range import (
+    ValueRange,
+    ValueType,
+)
+from tests.state_value import mocks
 from tests.state_value.mocks import MockAgent, SimpleTestDynamics
 
 
@@ -120,3 +132,21 @@ def test_no_cache():
     normaliser_two = factory.create_normaliser(3)
 
     assert normaliser_two.get_state_value_normalised(dynamics.left) == 0.5
+
+
+def test_value_range_reads_table():
+    dynamics = SimpleTestDynamics()
+    agent = QLearningAgent(
+        ParameterConfigStrategy(mocks.TestAgentConfig()),
+        ExplorationStrategyOptions.epsilon_greedy,
+        4,
+    )
+    agent.table.row(1)[Action.left] = -5
+    agent.table.row(3)[Action.up] = 20
+    value_range = ValueRange(dynamics.state_pool, agent)
+
+    assert value_range.rescale_value(ValueType.state_action_value, -5) == 0
+    assert value_range.rescale_value(ValueType.state_action_value, 20) == 1
+    optimism = agent.get_state_value(0)
+    assert value_range.rescale_value(ValueType.state_value, optimism) == 0
+    assert value_range.rescale_value(ValueType.state_value, 20) == 1
@@ -0,0 +1,39 @@
+import subprocess
+import sys
+
+from src.model.lazy_jit import LazyJit, lazy_jit
+
+
+@lazy_jit(nopython=True)
+def double(number):
+    return number * 2
+
+
+@lazy_jit(nopython=True)
+def quadruple(number):
+    return double(double(number))
+
+
+def test_compiles_dependencies():
+    assert quadruple(3) == 12
+    # the dependency is compiled so numba can call it directly
+    assert not isinstance(globals()["double"], LazyJit)
+    assert not isinstance(globals()["quadruple"], LazyJit)
+
+
+def test_model_imports_without_numba():
+    loaded = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys\n"
+            + "import src.model.hyperparameters.hyper_parameter_system\n"
+            + "import src.model.learning_system.learning_system\n"
+            + "print(*sys.modules)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+
+    assert "numba" not in loaded
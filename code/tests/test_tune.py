@@ -0,0 +1,61 @@
+import subprocess
+import sys
+from argparse import ArgumentTypeError
+
+from pytest import raises
+
+from src.model.agents.q_learning.exploration_strategies.options import (
+    ExplorationStrategyOptions,
+)
+from src.model.hyperparameters.base_parameter_strategy import HyperParameter
+from src.model.learning_system.top_level_entities.options import (
+    AgentOptions,
+    DynamicsOptions,
+    TopEntitiesOptions,
+)
+from src.tune import create_parser, parse_area, parse_parameter
+
+
+def test_parse_area():
+    assert parse_area("q_learning:cliff:epsilon_greedy") == TopEntitiesOptions(
+        AgentOptions.q_learning,
+        DynamicsOptions.cliff,
+        ExplorationStrategyOptions.epsilon_greedy,
+    )
+    with raises(ArgumentTypeError):
+        parse_area("q_learning:cliff")
+    with raises(ArgumentTypeError):
+        parse_area("q_learning:maze:epsilon_greedy")
+
+
+def test_parse_parameter():
+    assert parse_parameter("learning_rate") is HyperParameter.learning_rate
+    with raises(ArgumentTypeError):
+        parse_parameter("sweep_mode")
+
+
+def test_parse_arguments():
+    arguments = create_parser().parse_args(
+        ["--workers", "2", "--seed", "5", "report", "learning_rate"]
+    )
+
+    assert arguments.command == "report"
+    assert arguments.workers == 2
+    assert arguments.seed == 5
+    assert arguments.parameters == [HyperParameter.learning_rate]
+
+
+def test_imports_without_gui():
+    gui_modules = ("PySide6", "matplotlib", "src.view", "src.controller")
+    loaded = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, src.tune; print(*sys.modules)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+
+    assert not [module for module in loaded if module.startswith(gui_modules)]